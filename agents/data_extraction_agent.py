@@ -1,47 +1,95 @@
-from typing import List, Dict
-import re
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 import logging
 
-# Configure logging for the DataExtractionAgent
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+from utils.gazetteer import resolve_location
+from utils.metrics import METRICS
+from utils.skill_matcher import SkillMatcher
+
+# Logging is configured by the entry point (main.py or the demo below), not on import
 logger = logging.getLogger("DataExtractionAgent")
 
+REQUIRED_FIELDS = ['title', 'company', 'location', 'description']
+
+# Comprehensive and categorized list of AI/ML skill keywords
+# Categorization is used by the analysis for category-level roll-ups (see utils/skill_matrix.py)
+SKILL_KEYWORDS = {
+    "programming_languages": ["python", "r", "java", "scala", "c++", "julia"],
+    "ml_frameworks": ["tensorflow", "pytorch", "scikit-learn", "keras", "xgboost", "lightgbm"],
+    "data_processing": ["pandas", "numpy", "spark", "hadoop", "sql", "nosql", "kafka", "dask"],
+    "cloud_platforms": ["aws", "azure", "gcp", "databricks"],
+    "mlops_devops": ["mlops", "docker", "kubernetes", "airflow", "ci/cd", "git", "jenkins"],
+    "ml_concepts": ["machine learning", "deep learning", "neural networks", "computer vision",
+                    "natural language processing", "nlp", "reinforcement learning", "generative ai",
+                    "time series", "predictive modeling"],
+    "databases_warehousing": ["postgresql", "mysql", "mongodb", "redshift", "snowflake", "bigquery"],
+    "visualization": ["tableau", "power bi", "matplotlib", "seaborn", "plotly"],
+    "big_data": ["big data", "data warehousing", "data lakes"],
+    "statistics_math": ["statistics", "linear algebra", "calculus", "optimization"]
+}
+
+# Per-process agent used by the process_batch workers, built once by _init_worker
+_worker_agent = None
+
+
+def _report_extraction(valid: int, skip_reasons: Counter):
+    """Logs a single summary of skip reasons and records the extraction counters."""
+    if skip_reasons:
+        summary = ", ".join(f"{reason}: {count}" for reason, count in skip_reasons.most_common())
+        logger.warning(f"Skipped {sum(skip_reasons.values())} postings ({summary}).")
+    METRICS.count("postings_extracted", valid)
+    for reason, count in skip_reasons.items():
+        METRICS.count("postings_skipped", count, reason=reason)
+
+
+def _init_worker(skill_keywords: Dict[str, List[str]]):
+    """Process pool initializer: builds the worker's agent (and skill matcher) once, with the parent's keywords."""
+    global _worker_agent
+    _worker_agent = DataExtractionAgent(skill_keywords)
+
+
+def _clean_chunk(chunk: List[Dict]) -> Tuple[List[Dict], Counter]:
+    """
+    Process pool task: cleans a chunk of raw postings with the worker's agent.
+
+    Returns:
+        Tuple[List[Dict], Counter]: Cleaned postings of the chunk (in order) and the skip reasons.
+    """
+    return _worker_agent._clean_chunk(chunk)
+
+
 class DataExtractionAgent:
     """
     Agent responsible for parsing raw job postings and extracting structured fields:
     - Job Title
     - Required Skills
     - Company Name
-    - Location
+    - Location (normalized, with country and region)
     - Source
     - Description (full text)
+    - Scrape date
     """
 
-    def __init__(self):
-        # Define a comprehensive and categorized list of AI/ML skill keywords
-        # Categorization helps in potentially more nuanced analysis later
-        self.skill_keywords = {
-            "programming_languages": ["python", "r", "java", "scala", "c++", "julia"],
-            "ml_frameworks": ["tensorflow", "pytorch", "scikit-learn", "keras", "xgboost", "lightgbm"],
-            "data_processing": ["pandas", "numpy", "spark", "hadoop", "sql", "nosql", "kafka", "dask"],
-            "cloud_platforms": ["aws", "azure", "gcp", "databricks"],
-            "mlops_devops": ["mlops", "docker", "kubernetes", "airflow", "ci/cd", "git", "jenkins"],
-            "ml_concepts": ["machine learning", "deep learning", "neural networks", "computer vision",
-                            "natural language processing", "nlp", "reinforcement learning", "generative ai",
-                            "time series", "predictive modeling"],
-            "databases_warehousing": ["postgresql", "mysql", "mongodb", "redshift", "snowflake", "bigquery"],
-            "visualization": ["tableau", "power bi", "matplotlib", "seaborn", "plotly"],
-            "big_data": ["big data", "data warehousing", "data lakes"],
-            "statistics_math": ["statistics", "linear algebra", "calculus", "optimization"]
-        }
+    def __init__(self, skill_keywords: Optional[Dict[str, List[str]]] = None):
+        """
+        Args:
+            skill_keywords (Optional[Dict[str, List[str]]]): Category -> keywords to extract.
+                                                             Defaults to SKILL_KEYWORDS.
+        """
+        # Categorized AI/ML skill keywords (copied so a caller may customise them per agent)
+        self.skill_keywords = {category: list(skills)
+                               for category, skills in (skill_keywords or SKILL_KEYWORDS).items()}
         # Flatten the categorized skills into a single list for regex matching
         self.all_skills = [skill for category_list in self.skill_keywords.values() for skill in category_list]
+        # Compile the keyword matcher once; it is reused for every description
+        self.skill_matcher = SkillMatcher(self.skill_keywords)
         logger.info(f"Initialized DataExtractionAgent with {len(self.all_skills)} skill keywords.")
 
 
     def extract_skills(self, description: str) -> List[str]:
         """
-        Extracts AI/ML-related skills from the job description using robust regex pattern matching.
+        Extracts AI/ML-related skills from the job description using the precompiled skill matcher.
         The matching is case-insensitive and looks for whole words.
 
         Args:
@@ -50,21 +98,19 @@ class DataExtractionAgent:
         Returns:
             List[str]: A sorted list of unique matched skill keywords.
         """
-        if not description:
-            return []
+        return self.skill_matcher.match(description)
 
-        found_skills = set()
-        # Create a single regex pattern for all skills for efficiency
-        # Using '\b' for word boundaries and re.escape for special characters in keywords
-        # Using '|' to combine all keywords into one pattern
-        pattern = r'\b(?:' + '|'.join(re.escape(s) for s in self.all_skills) + r')\b'
-        
-        # Find all matches and add them to the set
-        matches = re.findall(pattern, description, re.IGNORECASE)
-        for match in matches:
-            found_skills.add(match.lower()) # Convert to lowercase for consistency
+    def extract_skills_with_categories(self, description: str) -> List[Tuple[str, str]]:
+        """
+        Same as `extract_skills`, but pairs each skill with its category from `self.skill_keywords`.
+
+        Args:
+            description (str): Raw job description text.
 
-        return sorted(list(found_skills))
+        Returns:
+            List[Tuple[str, str]]: (skill, category) pairs, sorted by skill.
+        """
+        return self.skill_matcher.match_with_categories(description)
 
     def clean_posting(self, raw_posting: Dict) -> Dict:
         """
@@ -76,38 +122,80 @@ class DataExtractionAgent:
         Returns:
             Dict: Cleaned and enriched posting with extracted skills, or an empty dict if critical data is missing.
         """
-        cleaned_post = {}
+        cleaned_post, skip_reason = self._clean_posting(raw_posting)
+        if skip_reason and skip_reason.startswith("missing"):
+            logger.warning(f"Skipping malformed raw posting due to missing essential keys: {raw_posting.keys()}")
+        elif skip_reason:
+            logger.error(f"Error cleaning posting: {raw_posting.get('title', 'N/A')} - {skip_reason}")
+        return cleaned_post
+
+    def _clean_posting(self, raw_posting: Dict) -> Tuple[Dict, Optional[str]]:
+        """
+        Logging-free core of `clean_posting`.
+
+        Returns:
+            Tuple[Dict, Optional[str]]: The cleaned posting (or an empty dict) and the reason it
+                                        was skipped (None if it was not), e.g. "missing description".
+        """
+        if not raw_posting:
+            return {}, "empty posting"
         try:
             # Basic validation for essential fields
-            if not all(key in raw_posting and raw_posting[key] for key in ['title', 'company', 'location', 'description']):
-                logger.warning(f"Skipping malformed raw posting due to missing essential keys: {raw_posting.keys()}")
-                return {}
+            missing = [key for key in REQUIRED_FIELDS if not raw_posting.get(key)]
+            if missing:
+                return {}, f"missing {missing[0]}"
 
             description = raw_posting.get("description", "")
-            
+            # Canonical "City, Country" from the offline gazetteer (memoized lookups);
+            # unknown locations are kept as written
+            place = resolve_location(raw_posting["location"])
+
             cleaned_post = {
                 "title": raw_posting.get("title", "Unknown").strip(),
                 "company": raw_posting.get("company", "Unknown").strip(),
-                "location": raw_posting.get("location", "Unknown").strip(),
+                "location": place.label() if place else raw_posting["location"].strip(),
+                "country": place.country if place else None,
+                "region": place.region if place else None,
                 "source": raw_posting.get("source", "Unknown").strip(),
                 "description": description.strip(), # Keep full description for potential future use
                 "skills": self.extract_skills(description),
+                # Scrape date stamped when scraped; records from older files stay undated (None)
+                # rather than being dated on the day they are processed
+                "scraped_at": raw_posting.get("scraped_at") or None,
             }
-            return cleaned_post
+            return cleaned_post, None
         except Exception as e:
-            logger.error(f"Error cleaning posting: {raw_posting.get('title', 'N/A')} - {e}", exc_info=True)
-            return {}
+            logger.debug(f"Error cleaning posting: {raw_posting.get('title', 'N/A')} - {e}", exc_info=True)
+            return {}, f"error: {type(e).__name__}"
 
-    def process_batch(self, raw_postings: List[Dict]) -> List[Dict]:
+    def _clean_chunk(self, chunk: List[Dict]) -> Tuple[List[Dict], Counter]:
+        """
+        Cleans a list of raw postings, counting skip reasons instead of logging each one.
+        """
+        cleaned_entries = []
+        skip_reasons = Counter()
+        for post in chunk:
+            cleaned_post, skip_reason = self._clean_posting(post)
+            if skip_reason:
+                skip_reasons[skip_reason] += 1
+            else:
+                cleaned_entries.append(cleaned_post)
+        return cleaned_entries, skip_reasons
+
+    def process_batch(self, raw_postings: List[Dict], workers: int = 0, chunk_size: int = 2000) -> List[Dict]:
         """
         Processes a batch of raw job postings and returns a list of cleaned, structured entries.
-        Includes logging for progress and validation.
+        Skipped postings are not logged one by one; a single summary of skip reasons is logged instead.
 
         Args:
             raw_postings (List[Dict]): List of raw job postings.
+            workers (int): Number of worker processes. 0 cleans everything in this process.
+                           Each worker builds its own agent (and skill matcher) once, with this
+                           agent's `skill_keywords`.
+            chunk_size (int): Number of postings sent to a worker per task.
 
         Returns:
-            List[Dict]: A list of cleaned and structured job entries.
+            List[Dict]: A list of cleaned and structured job entries, in input order.
         """
         if not raw_postings:
             logger.info("No raw postings provided for processing.")
@@ -115,22 +203,58 @@ class DataExtractionAgent:
 
         logger.info(f"Processing {len(raw_postings)} raw job postings...")
         
-        cleaned_entries = []
-        for i, post in enumerate(raw_postings):
-            if post: # Ensure the post itself is not empty
-                cleaned_post = self.clean_posting(post)
-                if cleaned_post: # Only add if cleaning was successful and returned a valid dict
-                    cleaned_entries.append(cleaned_post)
-                else:
-                    logger.warning(f"Failed to clean posting at index {i}. It was skipped.")
-            else:
-                logger.warning(f"Empty or None posting found at index {i}. Skipping.")
+        with METRICS.timer("extract_batch"):
+            cleaned_entries, skip_reasons = self._clean_all(raw_postings, workers, chunk_size)
+        _report_extraction(len(cleaned_entries), skip_reasons)
 
         logger.info(f"Data extraction complete. Valid entries extracted: {len(cleaned_entries)} out of {len(raw_postings)}.")
         return cleaned_entries
 
+    def _clean_all(self, raw_postings: List[Dict], workers: int, chunk_size: int) -> Tuple[List[Dict], Counter]:
+        """Cleans the postings inline or in worker processes (see `process_batch`)."""
+        if workers and len(raw_postings) > chunk_size:
+            chunks = [raw_postings[i:i + chunk_size] for i in range(0, len(raw_postings), chunk_size)]
+            cleaned_entries = []
+            skip_reasons = Counter()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self.skill_keywords,)) as pool:
+                # map() yields results in submission order, so the output keeps the input order
+                for chunk_entries, chunk_reasons in pool.map(_clean_chunk, chunks):
+                    cleaned_entries.extend(chunk_entries)
+                    skip_reasons.update(chunk_reasons)
+            return cleaned_entries, skip_reasons
+        return self._clean_chunk(raw_postings)
+
+    def iter_clean(self, raw_postings: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Streaming version of `process_batch`: cleans postings as they arrive and yields the
+        valid ones, so extraction can start before scraping has finished. A skip-reason
+        summary is logged once the input is exhausted.
+
+        Args:
+            raw_postings (Iterable[Dict]): Raw job postings, e.g. a generator fed by the scraper.
+
+        Yields:
+            Dict: Cleaned and structured job entries, in input order.
+        """
+        total = 0
+        valid = 0
+        skip_reasons = Counter()
+        for post in raw_postings:
+            total += 1
+            cleaned_post, skip_reason = self._clean_posting(post)
+            if skip_reason:
+                skip_reasons[skip_reason] += 1
+                continue
+            valid += 1
+            yield cleaned_post
+
+        _report_extraction(valid, skip_reasons)
+        logger.info(f"Data extraction complete. Valid entries extracted: {valid} out of {total}.")
+
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     # Example demonstration of DataExtractionAgent functionality
     dummy_data = [
         {
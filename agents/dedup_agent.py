@@ -0,0 +1,111 @@
+from typing import List, Dict, Iterable, Iterator, Optional
+from collections import Counter
+import logging
+
+from utils.job_scraper import posting_key
+from utils.metrics import METRICS
+from utils.minhash import LSHIndex, MinHasher
+
+logger = logging.getLogger("DeduplicationAgent")
+
+
+class DeduplicationAgent:
+    """
+    Deduplication stage between scraping (WebSearchAgent/JobDetailAgent) and DataExtractionAgent.
+    A posting is dropped when it has already been seen, in this run or in an earlier one:
+    - exactly: same normalized (title, company, location), e.g. a re-scrape on the next day;
+    - approximately: its description's MinHash similarity to a known description reaches
+      `threshold`, e.g. the same role cross-posted on another board with small edits.
+    Known postings are kept in a persistent LSH index, so lookups stay sub-linear in the history.
+    """
+
+    def __init__(self, index_path: Optional[str] = None, threshold: float = 0.9,
+                 num_perm: int = 64, bands: int = 8):
+        """
+        Args:
+            index_path (Optional[str]): JSON Lines file of the persistent index (e.g. "data/dedup_index.jsonl").
+                                        None only deduplicates within this agent's lifetime.
+            threshold (float): Minimum estimated Jaccard similarity of two descriptions' word shingles
+                               for them to count as near-duplicates. Long shared boilerplate (e.g. a
+                               company's "About us") raises the similarity of distinct roles, hence the
+                               high default.
+            num_perm (int): MinHash signature length.
+            bands (int): LSH bands (see `LSHIndex`).
+        """
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm=num_perm)
+        self.index = LSHIndex(index_path, num_perm=num_perm, bands=bands)
+        self.stats = Counter()
+        logger.info(f"DeduplicationAgent initialized with {len(self.index.keys)} known postings.")
+
+    def is_duplicate(self, posting: Dict) -> Optional[str]:
+        """
+        Checks a posting against the index and, if it is new, adds it.
+
+        Returns:
+            Optional[str]: "exact" or "near" for a duplicate, None for a new posting.
+        """
+        key = posting_key(posting)
+        if key is not None and key in self.index.keys:
+            return "exact"
+        description = posting.get("description")
+        signature = self.hasher.signature(description) if description else None
+        if signature is not None and self.index.find_similar(signature, self.threshold) is not None:
+            return "near"
+        self.index.add(key, signature)
+        return None
+
+    def iter_unique(self, postings: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Yields the postings that are not duplicates, in input order. Counts are kept in
+        `self.stats` and summarised in the log once the input is exhausted.
+
+        Args:
+            postings (Iterable[Dict]): Raw postings (with descriptions, for near-duplicate detection).
+
+        Yields:
+            Dict: New postings.
+        """
+        for posting in postings:
+            self.stats["seen"] += 1
+            duplicate = self.is_duplicate(posting)
+            if duplicate:
+                self.stats[duplicate] += 1
+                METRICS.count("postings_skipped", reason=f"{duplicate} duplicate")
+                continue
+            self.stats["unique"] += 1
+            yield posting
+        logger.info(f"Deduplication: {self.stats['unique']} new postings out of {self.stats['seen']} "
+                    f"({self.stats['exact']} exact and {self.stats['near']} near duplicates dropped).")
+
+    def filter(self, postings: List[Dict]) -> List[Dict]:
+        """Batch version of `iter_unique`."""
+        return list(self.iter_unique(postings))
+
+    def save(self):
+        """Persists the postings added to the index (no-op without `index_path`)."""
+        self.index.flush()
+
+
+if __name__ == "__main__":
+    description = ("We are hiring a Machine Learning Engineer to build and deploy deep learning models "
+                   "with PyTorch on AWS. You will work with Docker, Kubernetes and MLOps tooling.")
+    dummy_postings = [
+        {"title": "Machine Learning Engineer", "company": "Innovate AI", "location": "Dubai, UAE",
+         "source": "LinkedIn", "description": description},
+        # Re-scraped the next day: exact duplicate
+        {"title": "Machine Learning Engineer ", "company": "INNOVATE AI", "location": "Dubai, UAE",
+         "source": "LinkedIn", "description": description},
+        # Cross-posted on another board with a slightly different title and an extra sentence
+        {"title": "ML Engineer", "company": "Innovate AI LLC", "location": "Dubai",
+         "source": "Bayt", "description": description + " Apply now."},
+        {"title": "Data Scientist", "company": "Analytics Hub", "location": "Cairo, Egypt",
+         "source": "LinkedIn", "description": "Looking for a Data Scientist skilled in R, SQL and statistics."},
+    ]
+
+    agent = DeduplicationAgent()
+    unique = agent.filter(dummy_postings)
+    print("\n--- Unique Postings ---")
+    for posting in unique:
+        print(f"- {posting['title']} @ {posting['company']} ({posting['source']})")
+    print(dict(agent.stats))
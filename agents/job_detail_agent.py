@@ -0,0 +1,167 @@
+from bs4 import BeautifulSoup, SoupStrainer
+from typing import List, Dict, Iterable, Iterator, Optional
+import asyncio
+import logging
+import re
+
+from agents.web_search_agent import WebSearchAgent
+from utils.metrics import METRICS
+from utils.parser_registry import ParserRegistry
+
+# LinkedIn guest job pages keep the description in one of these containers
+_DESCRIPTION_STRAINER = SoupStrainer('div', class_=re.compile('show-more-less-html__markup|description__text'))
+
+
+def parse_linkedin_job_detail(html_content: str) -> str:
+    """
+    Extracts the job description text from a LinkedIn job detail page.
+
+    Args:
+        html_content (str): Raw HTML content of the job detail page.
+
+    Returns:
+        str: The description as plain text (paragraphs separated by newlines), or "" if not found.
+    """
+    soup = BeautifulSoup(html_content, 'html.parser', parse_only=_DESCRIPTION_STRAINER)
+    container = soup.find('div')
+    if not container:
+        return ""
+    return container.get_text(separator="\n", strip=True)
+
+
+class JobDetailAgent:
+    """
+    Enrichment stage between WebSearchAgent and DataExtractionAgent.
+    Search result cards only carry title, company and location, while
+    DataExtractionAgent needs the full description to extract skills, so this agent
+    fetches each card's job detail page and attaches its description.
+    """
+
+    def __init__(self, search_agent: WebSearchAgent, max_workers: int = 4,
+                 detail_parsers: Optional[ParserRegistry] = None):
+        """
+        Args:
+            search_agent (WebSearchAgent): Agent whose session, response cache, retries
+                                           and per-host rate settings are reused for the fetches.
+            max_workers (int): Maximum number of detail pages fetched at the same time.
+            detail_parsers (Optional[ParserRegistry]): Hostname -> detail page parser (HTML -> description).
+                                                       LinkedIn is registered automatically if absent.
+        """
+        self.search_agent = search_agent
+        self.max_workers = max(1, max_workers)
+        # Copied, so registering the LinkedIn default never changes the caller's registry
+        self.detail_parsers = detail_parsers.copy() if detail_parsers is not None else ParserRegistry()
+        if 'https://www.linkedin.com/' not in self.detail_parsers:
+            self.detail_parsers.register('linkedin.com', parse_linkedin_job_detail)
+        self.logger = logging.getLogger("JobDetailAgent")
+
+    @staticmethod
+    def _job_key(job: Dict) -> Optional[str]:
+        """Returns the deduplication key of a job: its job ID, else its detail URL."""
+        return job.get('job_id') or job.get('url')
+
+    def _drop_duplicates(self, jobs: List[Dict], seen: set) -> List[Dict]:
+        """
+        Returns the jobs whose key is not in `seen` (keeping the first of each key) and adds their keys to it.
+        Jobs without a key are always kept.
+        """
+        unique_jobs = []
+        for job in jobs:
+            key = self._job_key(job)
+            if key is not None:
+                if key in seen:
+                    continue
+                seen.add(key)
+            unique_jobs.append(job)
+        return unique_jobs
+
+    def _fetch_description(self, url: str) -> str:
+        parser = self.detail_parsers.resolve(url)
+        if parser is None:
+            self.logger.debug(f"No detail parser for {url}.")
+            return ""
+        # enrich_async already waited for the host's token
+        html = self.search_agent.fetch_html(url, throttle=False)
+        if not html:
+            return ""
+        with METRICS.timer("parse_detail"):
+            return parser(html)
+
+    def enrich(self, jobs: List[Dict]) -> List[Dict]:
+        """
+        Attaches a `description` to each job by fetching its detail page.
+        Jobs are deduplicated by job ID (or URL) first, so a posting returned by several
+        searches is fetched and emitted once. Jobs that already have a description, or
+        have no detail URL, are passed through unchanged.
+
+        Args:
+            jobs (List[Dict]): Raw job postings from WebSearchAgent.
+
+        Returns:
+            List[Dict]: Deduplicated postings, in input order, with descriptions attached where available.
+        """
+        if not jobs:
+            self.logger.info("No jobs provided for enrichment.")
+            return []
+        return asyncio.run(self.enrich_async(jobs))
+
+    def iter_enriched(self, pages: Iterable[List[Dict]]) -> Iterator[Dict]:
+        """
+        Streaming version of `enrich`: enriches jobs page by page (e.g. from
+        `WebSearchAgent.iter_pages`) and yields them as soon as their page is done.
+        Only the job keys are remembered across pages for deduplication.
+
+        Args:
+            pages (Iterable[List[Dict]]): Batches of raw job postings.
+
+        Yields:
+            Dict: Deduplicated postings with descriptions attached where available.
+        """
+        seen = set()
+        for jobs in pages:
+            unique_jobs = self._drop_duplicates(jobs, seen)
+            if unique_jobs:
+                yield from asyncio.run(self.enrich_async(unique_jobs))
+
+    async def enrich_async(self, jobs: List[Dict]) -> List[Dict]:
+        """
+        Coroutine behind `enrich`. At most `max_workers` detail pages are in flight and
+        every fetch takes a token from the search agent's per-host buckets, which its own
+        search page fetches also use.
+        """
+        unique_jobs = self._drop_duplicates(jobs, set())
+        duplicates = len(jobs) - len(unique_jobs)
+
+        semaphore = asyncio.Semaphore(self.max_workers)
+        limiter = self.search_agent.rate_limiter
+
+        async def enrich_one(job: Dict) -> Dict:
+            url = job.get('url')
+            if job.get('description') or not url:
+                return job
+            with METRICS.timer("rate_limit_wait"):
+                await limiter.acquire(url)
+            async with semaphore:
+                description = await asyncio.to_thread(self._fetch_description, url)
+            return dict(job, description=description) if description else job
+
+        self.logger.info(f"Fetching job details for {len(unique_jobs)} jobs "
+                         f"({duplicates} duplicates dropped, {self.max_workers} workers)...")
+        enriched = await asyncio.gather(*(enrich_one(job) for job in unique_jobs))
+        with_description = sum(1 for job in enriched if job.get('description'))
+        METRICS.count("detail_duplicates_dropped", duplicates)
+        METRICS.count("descriptions_missing", len(enriched) - with_description)
+        self.logger.info(f"Job detail enrichment complete: {with_description} of {len(enriched)} jobs have a description.")
+        return list(enriched)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    search_agent = WebSearchAgent(platforms=["https://www.linkedin.com/jobs/search/?keywords=machine%20learning&location=MENA"],
+                                  delay=3.0)
+    detail_agent = JobDetailAgent(search_agent, max_workers=2)
+    enriched_jobs = detail_agent.enrich(search_agent.scrape_all())
+
+    for job in enriched_jobs[:5]:
+        print(f"{job.get('title')} @ {job.get('company')}: {job.get('description', '')[:100]}...")
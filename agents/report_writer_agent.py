@@ -1,54 +1,88 @@
 from fpdf import FPDF
-import matplotlib.pyplot as plt # Keep this import, fpdf uses it for image dimensions
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 import os
 import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
 
 # Import the visualization function from utils.visualizations
-from utils.visualizations import generate_bar_chart
+from utils.metrics import METRICS
+from utils.visualizations import ChartCache, ChartJob, chart_key, render_charts
+
+DEFAULT_REPORT_TITLE = "Top AI/ML Jobs in MENA – May 2025"
+# Segment whose charts are added to every segment report as a region-wide baseline
+BASELINE_SEGMENT = "all"
+
+# The built-in FPDF fonts are Latin-1 only; common typographic characters are mapped to ASCII
+_PDF_TEXT = str.maketrans({"–": "-", "—": "-", "•": "-", "‘": "'", "’": "'", "“": '"', "”": '"', "…": "..."})
+
+
+def _pdf_text(text: str) -> str:
+    """Makes text printable with the built-in fonts (unsupported characters become '?')."""
+    return text.translate(_PDF_TEXT).encode("latin-1", "replace").decode("latin-1")
 
 
 class ReportWriterAgent:
     """
     Agent responsible for compiling final report using extracted analysis.
     Generates a professional PDF report with charts and insights.
+
+    Each `generate_report` call builds its own FPDF document and writes its charts into a
+    directory named after its report, so one agent can produce several reports at once
+    (e.g. from a thread pool) without the reports sharing pages or chart files.
+    `generate_segment_reports` builds one report per segment (country, role family) in a batch.
     """
 
-    def __init__(self, report_path: str = "reports/top_ai_ml_jobs_mena_may_2025.pdf"):
+    def __init__(self, report_path: str = "reports/top_ai_ml_jobs_mena_may_2025.pdf",
+                 chart_cache: Optional[ChartCache] = None, use_chart_cache: bool = True,
+                 max_workers: Optional[int] = None):
+        """
+        Args:
+            report_path (str): Default output PDF path; charts go to a directory next to it
+                               named after the report (see `chart_dir`).
+            chart_cache (Optional[ChartCache]): Cache of rendered charts. Defaults to a '.chart_cache'
+                                                directory next to the report.
+            use_chart_cache (bool): False always re-renders the charts.
+            max_workers (Optional[int]): Worker processes used to render charts that are not cached.
+        """
         self.report_path = report_path
+        if chart_cache is None and use_chart_cache:
+            chart_cache = ChartCache(os.path.join(os.path.dirname(report_path), ".chart_cache"))
+        self.chart_cache = chart_cache
+        self.max_workers = max_workers
         self.logger = logging.getLogger("ReportWriterAgent")
-        # Ensure logging is configured only once or correctly
-        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        self.pdf = FPDF()
-
-    # We no longer need _generate_bar_chart here, as we're importing it from utils.visualizations
-
-    def _add_title_page(self):
-        self.pdf.add_page()
-        self.pdf.set_font("Arial", 'B', 20)
-        self.pdf.cell(200, 20, txt="Top AI/ML Jobs in MENA – May 2025", ln=True, align='C')
-        self.pdf.ln(10)
-        self.pdf.set_font("Arial", '', 12)
-        self.pdf.multi_cell(0, 10, txt="This report provides an overview of the most in-demand AI/ML job roles, key required skills, and job distribution trends across the MENA region.")
-        self.pdf.ln(10)
-        self.pdf.set_font("Arial", 'I', 10)
-        self.pdf.cell(0, 10, txt=f"Date of Report: {os.getenv('REPORT_DATE', 'May 2025')}", ln=True, align='R')
-
-
-    def _add_section(self, title: str, content: str):
-        self.pdf.add_page() # Add a new page for each major section for better layout
-        self.pdf.set_font("Arial", 'B', 16)
-        self.pdf.ln(10)
-        self.pdf.cell(0, 10, title, ln=True, align='L')
-        self.pdf.ln(5) # Add some space after title
-        self.pdf.set_font("Arial", '', 12)
+
+    @staticmethod
+    def chart_dir(report_path: str) -> str:
+        """Output namespace of a report's charts: 'reports/x.pdf' -> 'reports/x/'."""
+        return os.path.splitext(report_path)[0]
+
+    def _add_title_page(self, pdf: FPDF, title: str = DEFAULT_REPORT_TITLE):
+        pdf.add_page()
+        pdf.set_font("Arial", 'B', 20)
+        pdf.cell(200, 20, txt=_pdf_text(title), ln=True, align='C')
+        pdf.ln(10)
+        pdf.set_font("Arial", '', 12)
+        pdf.multi_cell(0, 10, txt="This report provides an overview of the most in-demand AI/ML job roles, key required skills, and job distribution trends across the MENA region.")
+        pdf.ln(10)
+        pdf.set_font("Arial", 'I', 10)
+        pdf.cell(0, 10, txt=_pdf_text(f"Date of Report: {os.getenv('REPORT_DATE', 'May 2025')}"), ln=True, align='R')
+
+
+    def _add_section(self, pdf: FPDF, title: str, content: str):
+        pdf.add_page() # Add a new page for each major section for better layout
+        pdf.set_font("Arial", 'B', 16)
+        pdf.ln(10)
+        pdf.cell(0, 10, _pdf_text(title), ln=True, align='L')
+        pdf.ln(5) # Add some space after title
+        pdf.set_font("Arial", '', 12)
         # Use write() for simple text and multi_cell for longer, wrapped text
         if content:
-            self.pdf.multi_cell(0, 8, content) # Reduced line height for density
+            pdf.multi_cell(0, 8, _pdf_text(content)) # Reduced line height for density
         else:
-            self.pdf.write(8, "") # Placeholder for empty content section
+            pdf.write(8, "") # Placeholder for empty content section
 
-    def _add_image(self, image_path: str, w: int = 180):
+    def _add_image(self, pdf: FPDF, image_path: str, w: int = 180):
         """
         Adds an image to the PDF, centering it.
         """
@@ -57,72 +91,193 @@ class ReportWriterAgent:
             return
 
         # Calculate x position to center the image
-        page_width = self.pdf.w
+        page_width = pdf.w
         image_x = (page_width - w) / 2
 
-        self.pdf.ln(5)
-        self.pdf.image(image_path, x=image_x, w=w)
-        self.pdf.ln(5) # Space after image
+        pdf.ln(5)
+        pdf.image(image_path, x=image_x, w=w)
+        pdf.ln(5) # Space after image
+
 
+    def _chart_jobs(self, insights: Dict[str, any], chart_dir: str) -> Dict[str, ChartJob]:
+        """Charts of a report (name -> job), titled with the insights' segment if they have one."""
+        suffix = f" – {insights['segment']}" if insights.get("segment") else ""
+        jobs = {
+            "top_titles": ChartJob("bar", {"data": insights.get("top_titles", []), # Provide default empty list if key missing
+                                           "title": f"Top AI/ML Job Titles{suffix}",
+                                           "filename": os.path.join(chart_dir, "top_titles.png"),
+                                           "y_label": "Job Title", "x_label": "Number of Listings"}),
+            "top_skills": ChartJob("bar", {"data": insights.get("top_skills", []),
+                                           "title": f"Top AI/ML Skills{suffix}",
+                                           "filename": os.path.join(chart_dir, "top_skills.png"),
+                                           "y_label": "Skill", "x_label": "Frequency"}),
+        }
+        associations = insights.get("skill_associations")
+        if associations:
+            jobs["skill_categories"] = ChartJob("bar", {"data": associations.get("category_counts", []),
+                                                        "title": f"AI/ML Skill Categories{suffix}",
+                                                        "filename": os.path.join(chart_dir, "skill_categories.png"),
+                                                        "y_label": "Category", "x_label": "Number of Listings"})
+            heatmap = associations.get("heatmap", {})
+            jobs["skill_heatmap"] = ChartJob("heatmap", {"matrix": heatmap.get("matrix", []),
+                                                         "labels": heatmap.get("labels", []),
+                                                         "title": f"Skills Asked For Together{suffix}",
+                                                         "filename": os.path.join(chart_dir, "skill_heatmap.png")})
+        return jobs
 
-    def generate_report(self, insights: Dict[str, any]):
+    def generate_report(self, insights: Dict[str, any], report_path: Optional[str] = None) -> str:
         """
-        Assembles the final PDF report from insights.
+        Assembles the final PDF report from insights. Safe to call from several threads at once
+        as long as the calls write different report paths.
 
         Args:
             insights (Dict[str, any]): Analysis results from TrendAnalysisAgent.
+            report_path (Optional[str]): Output PDF path. Defaults to the agent's `report_path`.
+
+        Returns:
+            str: Path of the written report.
         """
-        self.logger.info("Starting report generation...")
-        
-        # Ensure the reports directory exists
-        output_dir = os.path.dirname(self.report_path)
-        if output_dir and not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-
-        # Define image paths for charts
-        top_titles_chart_path = os.path.join(output_dir, "top_titles.png")
-        top_skills_chart_path = os.path.join(output_dir, "top_skills.png")
-
-        # Generate charts using the imported function from utils.visualizations
-        # Pass the full output path to the visualization function
-        generate_bar_chart(
-            insights.get("top_titles", []), # Provide default empty list if key missing
-            "Top AI/ML Job Titles",
-            top_titles_chart_path,
-            y_label="Job Title", # Specific label for clarity
-            x_label="Number of Listings" # Specific label for clarity
-        )
-        generate_bar_chart(
-            insights.get("top_skills", []),
-            "Top AI/ML Skills",
-            top_skills_chart_path,
-            y_label="Skill", # Specific label for clarity
-            x_label="Frequency" # Specific label for clarity
-        )
+        report_path = report_path or self.report_path
+        self.logger.info(f"Starting report generation for {report_path}...")
 
-        # Build PDF structure
-        self.pdf.add_page() # Start with a fresh page for the title
-        self._add_title_page()
+        # Charts of this report live in their own directory, so concurrent reports never overwrite each other's
+        chart_dir = self.chart_dir(report_path)
+        os.makedirs(chart_dir, exist_ok=True)
 
-        self._add_section("Summary of Key Insights", insights.get("summary", "No summary available."))
-        
-        self._add_section("Top 10 AI/ML Job Titles", "The following chart illustrates the most frequently appearing job titles.")
-        self._add_image(top_titles_chart_path)
+        # Render the charts (in parallel; unchanged charts are copied from the chart cache)
+        jobs = self._chart_jobs(insights, chart_dir)
+        with METRICS.timer("report_charts"):
+            render_charts(list(jobs.values()), cache=self.chart_cache, max_workers=self.max_workers)
+        with METRICS.timer("report_pdf"):
+            return self.write_pdf(insights, {name: job.filename for name, job in jobs.items()}, report_path)
 
-        self._add_section("Top 10 AI/ML Skills", "Below are the essential skills most demanded by employers in the AI/ML sector.")
-        self._add_image(top_skills_chart_path)
+    def write_pdf(self, insights: Dict[str, any], chart_paths: Dict[str, str], report_path: str,
+                  title: str = DEFAULT_REPORT_TITLE) -> str:
+        """
+        Builds the PDF of a report from its insights and already rendered charts.
+
+        Args:
+            insights (Dict[str, any]): Analysis results from TrendAnalysisAgent.
+            chart_paths (Dict[str, str]): "top_titles" and "top_skills" chart images, plus optional
+                                          "baseline_skills" (a region-wide comparison), "skill_categories"
+                                          and "skill_heatmap" charts.
+            report_path (str): Output PDF path.
+            title (str): Title on the first page.
+
+        Returns:
+            str: Path of the written report.
+        """
+        output_dir = os.path.dirname(report_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        # Build PDF structure in a document owned by this call
+        pdf = FPDF()
+        pdf.add_page() # Start with a fresh page for the title
+        self._add_title_page(pdf, title)
+
+        self._add_section(pdf, "Summary of Key Insights", insights.get("summary", "No summary available."))
+
+        self._add_section(pdf, "Top 10 AI/ML Job Titles", "The following chart illustrates the most frequently appearing job titles.")
+        self._add_image(pdf, chart_paths["top_titles"])
+
+        self._add_section(pdf, "Top 10 AI/ML Skills", "Below are the essential skills most demanded by employers in the AI/ML sector.")
+        self._add_image(pdf, chart_paths["top_skills"])
+
+        if chart_paths.get("baseline_skills"):
+            self._add_section(pdf, "Region-wide Baseline", "For comparison, the skills most demanded across all MENA postings.")
+            self._add_image(pdf, chart_paths["baseline_skills"])
+
+        associations = insights.get("skill_associations")
+        if associations:
+            if chart_paths.get("skill_categories"):
+                self._add_section(pdf, "Skill Categories", "Number of listings asking for at least one skill of each category.")
+                self._add_image(pdf, chart_paths["skill_categories"])
+            pairs_text = "\n".join([f"• {a} + {b}: {pair['count']} listings (lift {pair['lift']})"
+                                    for pair in associations.get("top_pairs_by_count", [])
+                                    for a, b in [pair["skills"]]])
+            self._add_section(pdf, "Skills Asked For Together",
+                              pairs_text or "No skill pairs appear together often enough to rank.")
+            if chart_paths.get("skill_heatmap"):
+                self._add_image(pdf, chart_paths["skill_heatmap"])
 
         locations_text = "\n".join([f"• {loc}: {count} listings" for loc, count in insights.get("location_distribution", [])])
         if not locations_text:
             locations_text = "No location distribution data available."
-        self._add_section("Geographical Distribution of Opportunities", locations_text)
+        self._add_section(pdf, "Geographical Distribution of Opportunities", locations_text)
+
+        # Output the PDF (atomically, so readers never see a half-written report)
+        tmp_path = f"{report_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        pdf.output(tmp_path)
+        os.replace(tmp_path, report_path)
+        self.logger.info(f"Report written successfully to {report_path}")
+        return report_path
+
+    def generate_segment_reports(self, segment_insights: Dict[str, Dict[str, any]],
+                                 output_dir: str = os.path.join("reports", "segments"),
+                                 max_workers: Optional[int] = None) -> Dict[str, str]:
+        """
+        Builds one PDF per segment (e.g. the output of `TrendAnalysisAgent.segment_insights`).
 
-        # Output the PDF
-        self.pdf.output(self.report_path)
-        self.logger.info(f"Report written successfully to {self.report_path}")
+        The charts of all reports are collected first and de-duplicated by content hash, so a
+        chart shared by several reports (the region-wide baseline, identical segments) is
+        rendered once into `output_dir/assets/` and referenced by each PDF. The distinct charts
+        are then rendered in one parallel batch (through the chart cache) and the PDFs are
+        built in parallel worker processes.
 
+        Args:
+            segment_insights (Dict[str, Dict[str, any]]): Segment slug -> insights (with "segment" as
+                                                          display name). The BASELINE_SEGMENT entry, if
+                                                          present, supplies the baseline chart of the others.
+            output_dir (str): Directory of the PDFs ('<slug>.pdf') and of the shared chart assets.
+            max_workers (Optional[int]): Worker processes for charts and PDFs. Defaults to the agent's setting.
+
+        Returns:
+            Dict[str, str]: Segment slug -> report path.
+        """
+        max_workers = max_workers or self.max_workers
+        assets_dir = os.path.join(output_dir, "assets")
+        distinct: Dict[str, ChartJob] = {}
+        chart_paths: Dict[str, Dict[str, str]] = {}
+        references = 0
+        for slug, insights in segment_insights.items():
+            chart_paths[slug] = {}
+            for name, job in self._chart_jobs(insights, assets_dir).items():
+                key = chart_key(job)
+                if key not in distinct:
+                    distinct[key] = ChartJob(job.kind, {**job.kwargs,
+                                                        "filename": os.path.join(assets_dir, f"{key[:20]}.png")})
+                chart_paths[slug][name] = distinct[key].filename
+                references += 1
+        if BASELINE_SEGMENT in chart_paths:
+            for slug, paths in chart_paths.items():
+                if slug != BASELINE_SEGMENT:
+                    paths["baseline_skills"] = chart_paths[BASELINE_SEGMENT]["top_skills"]
+                    references += 1
+
+        self.logger.info(f"Building {len(segment_insights)} segment reports: {len(distinct)} distinct charts "
+                         f"for {references} chart references.")
+        render_charts(list(distinct.values()), cache=self.chart_cache, max_workers=max_workers)
+
+        tasks = [(insights, chart_paths[slug], os.path.join(output_dir, f"{slug}.pdf"),
+                  f"Top AI/ML Jobs – {insights.get('segment') or slug}")
+                 for slug, insights in segment_insights.items()]
+        workers = min(len(tasks), max_workers or os.cpu_count() or 1)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                paths = list(executor.map(_write_pdf_task, tasks))
+        else:
+            paths = [self.write_pdf(*task) for task in tasks]
+        self.logger.info(f"{len(paths)} segment reports written to {output_dir}")
+        return dict(zip(segment_insights, paths))
+
+
+def _write_pdf_task(task: Tuple) -> str:
+    # Runs in a worker process: the agent (and its chart cache lock) is not sent between processes
+    return ReportWriterAgent(use_chart_cache=False).write_pdf(*task)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     # Dummy insights example for testing
     dummy_insights = {
         "top_titles": [("Machine Learning Engineer", 22), ("Data Scientist", 18), ("AI Specialist", 15),
@@ -141,4 +296,21 @@ if __name__ == "__main__":
 
     report_agent = ReportWriterAgent()
     report_agent.generate_report(dummy_insights)
-    print("Demo report generated.")
\ No newline at end of file
+    print("Demo report generated.")
+
+    # Several reports from one agent at once: each call has its own PDF and chart directory
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        paths = list(executor.map(
+            lambda i: report_agent.generate_report({**dummy_insights, "top_skills": dummy_insights["top_skills"][i:]},
+                                                   f"reports/demo_report_{i}.pdf"),
+            range(3)))
+    print(f"Concurrent demo reports generated: {paths}")
+
+    # One report per segment, the All-MENA skills chart shared as baseline by all of them
+    segment_reports = report_agent.generate_segment_reports({
+        "all": {**dummy_insights, "segment": "All MENA"},
+        "country-egypt": {**dummy_insights, "segment": "Egypt", "top_titles": dummy_insights["top_titles"][:5]},
+        "role-nlp-llm": {**dummy_insights, "segment": "NLP & LLM", "top_skills": dummy_insights["top_skills"][2:]},
+    })
+    print(f"Segment demo reports generated: {segment_reports}")
\ No newline at end of file
@@ -1,10 +1,21 @@
-from typing import List, Dict, Tuple
-import pandas as pd
+from typing import List, Dict, Iterable, Optional, Tuple
 import logging
 from collections import Counter
+from datetime import date
 
-# Configure logging for the TrendAnalysisAgent
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+from agents.data_extraction_agent import SKILL_KEYWORDS
+from utils.analysis_state import AnalysisState
+from utils.job_store import JobStore
+from utils.metrics import METRICS
+from utils.segments import SEGMENT_KINDS, SegmentedAnalysis
+from utils.skill_matrix import SkillStats
+from utils.sketches import SketchState
+from utils.time_buckets import TimeBuckets
+from utils.title_normalizer import TitleNormalizer
+
+ANALYSIS_ENGINES = ('columnar', 'pandas', 'sketch')
+
+# Logging is configured by the entry point (main.py or the demo below), not on import
 logger = logging.getLogger("TrendAnalysisAgent")
 
 class TrendAnalysisAgent:
@@ -16,9 +27,141 @@ class TrendAnalysisAgent:
     - Overall trend observations and summary
     """
 
-    def __init__(self):
+    def __init__(self, state: Optional[AnalysisState] = None, engine: str = 'columnar',
+                 title_normalizer: Optional[TitleNormalizer] = None, sketch: Optional[SketchState] = None):
+        """
+        Args:
+            state (Optional[AnalysisState]): Maintained counters over the posting history
+                                             (e.g. loaded with `AnalysisState.load`). Defaults to an empty state.
+            engine (str): Backend used by `analyze`: 'columnar' (integer-coded columns counted with NumPy)
+                          or 'pandas' (the original DataFrame + Counter path), which return the same
+                          insights, or 'sketch' (approximate, fixed memory; see `insights_from_sketch`).
+                          With 'sketch', `insights` also reads the maintained `sketch` instead of `state`.
+            title_normalizer (Optional[TitleNormalizer]): If given, titles are counted by their canonical
+                                                          form ("Sr. ML Engineer - Dubai" -> "Machine Learning
+                                                          Engineer") by `analyze`, `update` and `analyze_stream`.
+            sketch (Optional[SketchState]): Approximate sketches of the posting history (e.g. loaded with
+                                            `SketchState.load`), updated next to `state` if given.
+        """
+        if engine not in ANALYSIS_ENGINES:
+            raise ValueError(f"Unknown analysis engine '{engine}'. Expected one of {ANALYSIS_ENGINES}.")
+        self.engine = engine
+        self.state = state if state is not None else AnalysisState()
+        self.title_normalizer = title_normalizer
+        self.sketch = sketch
         logger.info("TrendAnalysisAgent initialized.")
 
+    def _canonical_titles(self, postings: Iterable[Dict]) -> Iterable[Dict]:
+        """
+        Yields the postings with their title replaced by its canonical form (shallow copies;
+        the input postings are not modified). Returns the input unchanged without a normalizer.
+        """
+        if self.title_normalizer is None:
+            return postings
+        normalize = self.title_normalizer.normalize
+        return ({**post, "title": normalize(post.get("title"))} for post in postings)
+
+    def update(self, new_postings: Iterable[Dict]) -> AnalysisState:
+        """
+        Adds new structured postings to the maintained state (and sketches, if any).
+
+        Args:
+            new_postings (Iterable[Dict]): Postings not yet counted in `self.state`.
+
+        Returns:
+            AnalysisState: The updated state.
+        """
+        if self.sketch is None:
+            return self.state.update(self._canonical_titles(new_postings))
+        for post in self._canonical_titles(new_postings):
+            self.state.add(post)
+            self.sketch.add(post)
+        return self.state
+
+    def insights(self) -> Dict[str, any]:
+        """
+        Reads the insights of the maintained state (all postings added so far), or of the
+        maintained sketches with the 'sketch' engine. This is cheap: no posting is re-read or
+        re-counted.
+
+        Returns:
+            Dict[str, any]: Same structure as `analyze`.
+        """
+        if self.engine == 'sketch' and self.sketch is not None:
+            return self.insights_from_sketch(self.sketch)
+        return self.insights_from_state(self.state)
+
+    def insights_from_state(self, state: AnalysisState) -> Dict[str, any]:
+        """
+        Builds the insights dictionary (top titles/skills, locations, summary) from a state.
+        """
+        if not state.posting_count:
+            return self.analyze([])
+        top_titles = state.top_titles(10)
+        top_skills = state.top_skills(10)
+        top_locations = state.location_distribution()
+        return {
+            "top_titles": top_titles,
+            "top_skills": top_skills,
+            "location_distribution": top_locations,
+            "summary": self.generate_summary(top_titles, top_skills, top_locations, state.latest_scraped_at)
+        }
+
+    def insights_from_store(self, store: JobStore, **filters) -> Dict[str, any]:
+        """
+        Builds the insights dictionary with aggregate SQL queries on a JobStore instead of
+        counting postings in Python. Filters narrow the postings analysed, e.g.
+        `insights_from_store(store, location_like="Riyadh", title_like="mlops")`.
+        The store keeps the scraped titles; with a title normalizer their counts are merged
+        by canonical title before the top 10 is taken.
+
+        Args:
+            store (JobStore): Store holding the processed postings.
+            **filters: Any of the JobStore filters (title, title_like, company, location,
+                       location_like, source, since, until, skill).
+
+        Returns:
+            Dict[str, any]: Same structure as `analyze`.
+        """
+        if not store.posting_count(**filters):
+            return self.analyze([])
+        if self.title_normalizer is None:
+            top_titles = store.top_titles(10, **filters)
+        else:
+            title_counts = Counter()
+            for title, count in store.top_titles(None, **filters):
+                title_counts[self.title_normalizer.normalize(title)] += count
+            top_titles = title_counts.most_common(10)
+        top_skills = store.top_skills(10, **filters)
+        top_locations = store.location_distribution(**filters)
+        return {
+            "top_titles": top_titles,
+            "top_skills": top_skills,
+            "location_distribution": top_locations,
+            "summary": self.generate_summary(top_titles, top_skills, top_locations,
+                                             store.latest_scraped_at(**filters))
+        }
+
+    def insights_from_sketch(self, sketch: SketchState) -> Dict[str, any]:
+        """
+        Builds the insights dictionary from approximate sketches. Besides the usual keys it holds
+        "distinct_companies_by_location" (HyperLogLog estimates) and "error_bounds" (see
+        `SketchState.error_bounds`); counts are upper bounds within those bounds.
+        """
+        if not sketch.posting_count:
+            return self.analyze([])
+        top_titles = sketch.top_titles(10)
+        top_skills = sketch.top_skills(10)
+        top_locations = sketch.location_distribution()
+        return {
+            "top_titles": top_titles,
+            "top_skills": top_skills,
+            "location_distribution": top_locations,
+            "distinct_companies_by_location": sketch.distinct_companies_by_location(),
+            "error_bounds": sketch.error_bounds(),
+            "summary": self.generate_summary(top_titles, top_skills, top_locations, sketch.latest_scraped_at)
+        }
+
     def _flatten_skills(self, postings: List[Dict]) -> List[str]:
         """
         Helper function to flatten all skill lists from job postings into a single list.
@@ -58,6 +201,45 @@ class TrendAnalysisAgent:
             }
 
         logger.info(f"Starting trend analysis on {len(postings)} job postings...")
+        METRICS.count("postings_analyzed", len(postings))
+
+        if self.engine == 'sketch':
+            with METRICS.timer("analyze", engine=self.engine):
+                insights = self.insights_from_sketch(SketchState().update(self._canonical_titles(postings)))
+            logger.info("Approximate trend analysis completed successfully.")
+            return insights
+        with METRICS.timer("analyze", engine=self.engine):
+            if self.engine == 'columnar':
+                top_titles, top_skills, top_locations = self._analyze_columnar(postings)
+            else:
+                top_titles, top_skills, top_locations = self._analyze_pandas(list(self._canonical_titles(postings)))
+
+        logger.info("Trend analysis completed successfully.")
+
+        return {
+            "top_titles": top_titles,
+            "top_skills": top_skills,
+            "location_distribution": top_locations,
+            "summary": self.generate_summary(top_titles, top_skills, top_locations,
+                                             max((p["scraped_at"] for p in postings if p.get("scraped_at")),
+                                                 default=None))
+        }
+
+    def _analyze_columnar(self, postings: List[Dict]):
+        """
+        Frequencies via ColumnarAnalysis: only title, location and skills are read,
+        integer-coded, counted with `np.bincount` and ranked with a partial sort.
+        """
+        # Imported on use: pandas/NumPy are only needed when raw postings are analysed
+        from utils.columnar_analysis import ColumnarAnalysis
+        columns = ColumnarAnalysis.from_postings(postings, title_transform=self.title_normalizer)
+        return columns.top_titles(10), columns.top_skills(10), columns.location_distribution()
+
+    def _analyze_pandas(self, postings: List[Dict]):
+        """
+        Frequencies via a full DataFrame of the postings (original implementation).
+        """
+        import pandas as pd
 
         # Convert list of dicts to a pandas DataFrame for efficient analysis
         df = pd.DataFrame(postings)
@@ -79,19 +261,126 @@ class TrendAnalysisAgent:
         top_skills = skill_freq.most_common(10)
         # For locations, typically all unique locations are relevant, but can be limited if too many
         top_locations = location_freq.most_common() # Get all locations and their counts
+        return top_titles, top_skills, top_locations
 
-        logger.info("Trend analysis completed successfully.")
+    def analyze_stream(self, postings: Iterable[Dict]) -> Dict[str, any]:
+        """
+        Single-pass version of `analyze` for postings that arrive as a stream (e.g. a generator
+        fed by the extraction stage). Counts are updated as postings arrive and no posting is
+        kept in memory, so the stream can be consumed while upstream stages are still running.
+        Produces the same insights as `analyze` on the same postings. The run's counts are
+        also merged into `self.state` (and added to `self.sketch`, if any).
+
+        Args:
+            postings (Iterable[Dict]): Structured job entries.
+
+        Returns:
+            Dict[str, any]: Insights over the streamed postings only, same structure as `analyze`.
+        """
+        run_state = AnalysisState()
+        for post in self._canonical_titles(postings):
+            run_state.add(post)
+            if self.sketch is not None:
+                self.sketch.add(post)
+        self.state.merge(run_state)
+        METRICS.count("postings_analyzed", run_state.posting_count)
+        if run_state.posting_count:
+            logger.info(f"Streaming trend analysis completed on {run_state.posting_count} job postings.")
+        return self.insights_from_state(run_state)
+
+    def location_distribution(self, postings: Iterable[Dict], level: str = "country") -> List[Tuple[str, int]]:
+        """
+        Job distribution at another gazetteer level than the normalized city-level `location`.
+
+        Args:
+            postings (Iterable[Dict]): Structured job entries (with 'country'/'region' from DataExtractionAgent).
+            level (str): "city", "country" or "region". Postings outside the gazetteer count under
+                         their raw location.
+
+        Returns:
+            List[Tuple[str, int]]: (place, count) pairs, most frequent first.
+        """
+        if level not in ("city", "country", "region"):
+            raise ValueError("level must be 'city', 'country' or 'region'.")
+        field = "location" if level == "city" else level
+        return Counter(post.get(field) or post.get("location") for post in postings
+                       if post.get(field) or post.get("location")).most_common()
 
+    def segment_insights(self, postings: Iterable[Dict], kinds: Iterable[str] = SEGMENT_KINDS,
+                         min_postings: int = 5) -> Dict[str, Dict[str, any]]:
+        """
+        Insights of every segment of the postings (all postings, each country, each role family),
+        computed in a single pass over the postings (see `SegmentedAnalysis`).
+
+        Args:
+            postings (Iterable[Dict]): Structured job entries, e.g. the processed history.
+            kinds (Iterable[str]): Segment kinds besides "all": "country" and/or "role".
+            min_postings (int): Segments with fewer postings are left out.
+
+        Returns:
+            Dict[str, Dict[str, any]]: Segment slug ('all', 'country-egypt', 'role-nlp-llm', ...) ->
+                                       insights (same structure as `analyze`) plus "segment" (display
+                                       name), "segment_kind" and "posting_count".
+        """
+        segmented = SegmentedAnalysis(kinds, title_transform=self.title_normalizer).update(postings)
+        results = {}
+        for segment in segmented.segments(min_postings):
+            state = segmented.states[segment]
+            results[segment.slug] = {**self.insights_from_state(state), "segment": segment.name,
+                                     "segment_kind": segment.kind, "posting_count": state.posting_count}
+        logger.info(f"Segment insights computed for {len(results)} segments of "
+                    f"{segmented.overall.posting_count} postings in one pass.")
+        return results
+
+    def skill_associations(self, stats: SkillStats, top: int = 10, min_count: int = 2,
+                           heatmap_skills: int = 15) -> Dict[str, any]:
+        """
+        Which skills are asked for together, read from the persisted co-occurrence counts
+        (see `SkillStats`) rather than recomputed from raw postings.
+
+        Args:
+            stats (SkillStats): Skill co-occurrence matrix and category counts of the history.
+            top (int): Number of skill pairs to rank.
+            min_count (int): Minimum number of postings for a pair to be ranked.
+            heatmap_skills (int): Number of most frequent skills kept for the co-occurrence heatmap.
+
+        Returns:
+            Dict[str, any]: "category_counts" ((category, postings) pairs), "top_pairs_by_count",
+                            "top_pairs_by_lift", and the "heatmap" labels and matrix.
+        """
+        labels, matrix = stats.heatmap_data(heatmap_skills)
         return {
-            "top_titles": top_titles,
-            "top_skills": top_skills,
-            "location_distribution": top_locations,
-            "summary": self.generate_summary(top_titles, top_skills, top_locations)
+            "category_counts": stats.category_distribution(),
+            "top_pairs_by_count": stats.top_pairs(top, min_count, by="count"),
+            "top_pairs_by_lift": stats.top_pairs(top, min_count, by="lift"),
+            "heatmap": {"labels": labels, "matrix": matrix},
+        }
+
+    def trend_insights(self, buckets: TimeBuckets, periods: int = 1, granularity: str = "week",
+                       top: int = 5) -> Dict[str, List[Dict]]:
+        """
+        Fastest growing skills, titles and locations over the latest window (week over week by
+        default), read from the time-bucketed pre-aggregations rather than from raw postings.
+
+        Args:
+            buckets (TimeBuckets): Daily/weekly aggregates of the posting history.
+            periods (int): Window length in buckets (e.g. 4 weeks against the 4 weeks before).
+            granularity (str): "day" or "week".
+            top (int): Entries per dimension.
+
+        Returns:
+            Dict[str, List[Dict]]: "growing_skills", "growing_titles" and "growing_locations",
+                                   each a list of `TimeBuckets.growth` entries.
+        """
+        return {
+            f"growing_{dimension}s": buckets.growth(dimension, periods=periods, granularity=granularity, top=top)
+            for dimension in ("skill", "title", "location")
         }
 
     def generate_summary(self, top_titles: List[Tuple[str, int]],
                          top_skills: List[Tuple[str, int]],
-                         location_distribution: List[Tuple[str, int]]) -> str:
+                         location_distribution: List[Tuple[str, int]],
+                         as_of: Optional[str] = None) -> str:
         """
         Creates a natural language summary of the analysis for reporting purposes.
         Provides a more detailed and dynamic summary based on available data.
@@ -100,6 +389,7 @@ class TrendAnalysisAgent:
             top_titles (List[Tuple[str, int]]): Ranked list of top job titles.
             top_skills (List[Tuple[str, int]]): Ranked list of top skill keywords.
             location_distribution (List[Tuple[str, int]]): Distribution of jobs by location.
+            as_of (Optional[str]): ISO date of the most recent scrape in the data. Defaults to today.
 
         Returns:
             str: A human-readable summary of the AI/ML job market trends.
@@ -108,8 +398,9 @@ class TrendAnalysisAgent:
 
         if top_titles:
             most_common_title = top_titles[0][0]
+            as_of_date = date.fromisoformat(str(as_of)[:10]) if as_of else date.today()
             summary_parts.append(
-                f"As of May 2025, the most in-demand AI/ML job title in the MENA region is \"{most_common_title}\"."
+                f"As of {as_of_date:%B %Y}, the most in-demand AI/ML job title in the MENA region is \"{most_common_title}\"."
             )
         else:
             summary_parts.append("Job title demand trends could not be determined due to insufficient data.")
@@ -143,6 +434,7 @@ class TrendAnalysisAgent:
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     # Example demonstration of TrendAnalysisAgent functionality
     dummy_structured_jobs = [
         {"title": "ML Engineer", "skills": ["python", "tensorflow", "aws"], "location": "Dubai"},
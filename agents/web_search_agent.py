@@ -1,9 +1,99 @@
 import requests
-from bs4 import BeautifulSoup
-from typing import List, Dict
+from bs4 import BeautifulSoup, SoupStrainer
+from typing import List, Dict, Iterator, Optional
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from datetime import date
+from functools import partial
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+import asyncio
 import logging
 import time
 import random # Added for more randomness in delay
+import re
+
+from requests.adapters import HTTPAdapter
+
+from utils.http_cache import ResponseCache
+from utils.metrics import METRICS
+from utils.parser_registry import ParserRegistry
+from utils.rate_limiter import HostRateLimiter
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError: # lxml is optional; the 'auto' engine falls back to the BeautifulSoup strainer
+    lxml_html = None
+
+
+# Precompiled selectors for the fast LinkedIn parser engines.
+# A regex class_ filter matches the same tags as the `lambda x: x and '...' in x` predicates
+# used by the reference parser: bs4 tests it against each class and the full class string.
+_RESULTS_LIST_STRAINER = SoupStrainer('ul', class_='jobs-search__results-list')
+_FALLBACK_CARD_CLASS = re.compile('job-search-card|base-card')
+_TITLE_CLASS = re.compile('base-search-card__title')
+_COMPANY_CLASS = re.compile('base-search-card__subtitle')
+_LOCATION_CLASS = re.compile('job-search-card__location')
+_LINK_CLASS = re.compile('base-card__full-link')
+_TRAILING_JOB_ID = re.compile(r'(\d+)/?$')
+
+if lxml_html is not None:
+    # XPath equivalents: contains(@class, ...) is a substring test on the full class string
+    _XP_RESULTS_LIST = etree.XPath(
+        "(//ul[contains(concat(' ', normalize-space(@class), ' '), ' jobs-search__results-list ')])[1]")
+    _XP_LIST_CARDS = etree.XPath(".//li")
+    _XP_FALLBACK_CARDS = etree.XPath(
+        "//div[contains(@class, 'job-search-card') or contains(@class, 'base-card')]")
+    _XP_TITLE = etree.XPath("(.//h3[contains(@class, 'base-search-card__title')])[1]")
+    _XP_COMPANY = etree.XPath("(.//h4[contains(@class, 'base-search-card__subtitle')])[1]")
+    _XP_LOCATION = etree.XPath("(.//span[contains(@class, 'job-search-card__location')])[1]")
+    _XP_LINK_HREF = etree.XPath("(.//a[contains(@class, 'base-card__full-link')])[1]/@href")
+    _XP_URN = etree.XPath("(descendant-or-self::*[@data-entity-urn])[1]/@data-entity-urn")
+
+PARSER_ENGINES = ('auto', 'lxml', 'strainer', 'bs4')
+
+
+def _linkedin_job_ref(href: Optional[str], urn: Optional[str]):
+    """
+    Derives the canonical detail URL and the numeric job ID of a LinkedIn card.
+
+    Args:
+        href (Optional[str]): The card's link, usually with tracking query parameters.
+        urn (Optional[str]): The card's `data-entity-urn`, e.g. "urn:li:jobPosting:3912345678".
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: (detail URL without query string, job ID).
+    """
+    url = href.split('?', 1)[0].strip() if href else None
+    job_id = None
+    if urn and urn.rsplit(':', 1)[-1].isdigit():
+        job_id = urn.rsplit(':', 1)[-1]
+    elif url:
+        match = _TRAILING_JOB_ID.search(url)
+        job_id = match.group(1) if match else None
+    return url or None, job_id
+
+# One parser-only agent per engine and process, reused by `parse_linkedin_page`
+_linkedin_page_parsers = {}
+
+
+def parse_linkedin_page(html_content: str, parser_engine: str = 'auto') -> List[Dict]:
+    """
+    Module-level entry point to `WebSearchAgent.parse_linkedin_jobs`, registered in the
+    default ParserRegistry. Being a plain function it can be pickled and run in a
+    process pool worker.
+
+    Args:
+        html_content (str): Raw HTML content of a LinkedIn search results page.
+        parser_engine (str): One of PARSER_ENGINES.
+
+    Returns:
+        List[Dict]: Parsed job postings.
+    """
+    parser = _linkedin_page_parsers.get(parser_engine)
+    if parser is None:
+        parser = _linkedin_page_parsers[parser_engine] = WebSearchAgent([], parser_engine=parser_engine)
+    return parser.parse_linkedin_jobs(html_content)
 
 
 class WebSearchAgent:
@@ -12,16 +102,50 @@ class WebSearchAgent:
     It supports scraping multiple MENA-region specific job boards.
     """
 
-    def __init__(self, platforms: List[str], delay: float = 1.5):
+    def __init__(self, platforms: List[str], delay: float = 1.5,
+                 max_concurrency: int = 4, host_rate: Optional[float] = None, host_burst: int = 1,
+                 cache_dir: Optional[str] = None, pool_size: int = 10, parser_engine: str = 'auto',
+                 parsers: Optional[ParserRegistry] = None, parse_workers: int = 0):
         """
         Initializes the WebSearchAgent with a list of job platforms.
 
         Args:
             platforms (List[str]): List of platform URLs to scrape.
             delay (float): Delay between requests to avoid bans.
+            max_concurrency (int): Maximum number of requests in flight in concurrent mode.
+            host_rate (Optional[float]): Requests per second allowed per host in concurrent mode.
+                                         Defaults to one request every `delay` seconds.
+            host_burst (int): Number of requests a host may receive back-to-back before the rate applies.
+            cache_dir (Optional[str]): Directory for the conditional-GET response cache. Disabled if None.
+            pool_size (int): Number of keep-alive connections kept per host by the HTTP session.
+            parser_engine (str): LinkedIn parser implementation: 'lxml' (XPath over an lxml tree),
+                                 'strainer' (BeautifulSoup limited to the results list), 'bs4'
+                                 (full BeautifulSoup tree, the reference implementation) or 'auto'
+                                 ('lxml' when installed, 'strainer' otherwise).
+            parsers (Optional[ParserRegistry]): Hostname -> parser mapping used to parse each platform.
+                                                LinkedIn is registered automatically if absent.
+            parse_workers (int): Number of worker processes for HTML parsing. 0 parses inline.
         """
+        if parser_engine not in PARSER_ENGINES:
+            raise ValueError(f"Unknown parser engine '{parser_engine}'. Expected one of {PARSER_ENGINES}.")
+        if parser_engine == 'auto':
+            parser_engine = 'lxml' if lxml_html is not None else 'strainer'
+        elif parser_engine == 'lxml' and lxml_html is None:
+            raise ImportError("The 'lxml' parser engine requires the lxml package.")
+        self.parser_engine = parser_engine
         self.platforms = platforms
         self.delay = delay
+        self.max_concurrency = max(1, max_concurrency)
+        self.host_rate = host_rate if host_rate else 1.0 / max(delay, 0.1)
+        self.host_burst = host_burst
+        # One token bucket per host for every request of this agent and of the JobDetailAgent
+        # built on it, so search and detail fetches to the same host share the rate limit
+        self.rate_limiter = HostRateLimiter(self.host_rate, self.host_burst)
+        # Copied, so registering the LinkedIn default never changes the caller's registry
+        self.parsers = parsers.copy() if parsers is not None else ParserRegistry()
+        if 'https://www.linkedin.com/' not in self.parsers:
+            self.parsers.register('linkedin.com', partial(parse_linkedin_page, parser_engine=self.parser_engine))
+        self.parse_workers = max(0, parse_workers)
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
                           '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -30,40 +154,90 @@ class WebSearchAgent:
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.9',
             'Connection': 'keep-alive',
         }
-        # Configure logging specifically for this agent.
+        # One pooled session for all fetches so connections (and TLS handshakes) are reused.
+        # The pool must be at least as large as the number of concurrent fetches.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        pool_maxsize = max(pool_size, self.max_concurrency)
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        # Logging is configured by the entry point (main.py or the demo below)
         self.logger = logging.getLogger("WebSearchAgent")
-        # Ensure that basicConfig is only called once.
-        if not logging.root.handlers:
-            logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
 
-    def fetch_html(self, url: str, attempt: int = 1) -> str:
+    def fetch_html(self, url: str, attempt: int = 1, throttle: bool = True) -> str:
         """
         Fetches HTML content from a given URL with retries.
+        When a response cache is configured, the request is made conditional and a
+        304 Not Modified answer is served from the cached copy.
 
         Args:
             url (str): The URL of the web page to fetch.
             attempt (int): Current retry attempt number.
+            throttle (bool): Wait for a token of the host's bucket in `self.rate_limiter` first.
+                             Callers that already acquired one pass False; retries always wait.
 
         Returns:
             str: Raw HTML content.
         """
         max_attempts = 3
+        if throttle:
+            with METRICS.timer("rate_limit_wait"):
+                self.rate_limiter.acquire_blocking(url)
         try:
             self.logger.info(f"Fetching HTML from: {url} (Attempt {attempt})")
-            response = requests.get(url, headers=self.headers, timeout=15) # Increased timeout
+            conditional_headers = self.cache.conditional_headers(url) if self.cache else {}
+            METRICS.count("http_requests")
+            with METRICS.timer("http_wait"):
+                response = self.session.get(url, headers=conditional_headers, timeout=15) # Increased timeout
+            if response.status_code == 304 and self.cache:
+                cached_html = self.cache.load(url)
+                if cached_html is not None:
+                    self.cache.record_hit()
+                    METRICS.count("http_responses", status="304")
+                    self.logger.info(f"Not modified, served from cache: {url}")
+                    return cached_html
+                # Cache entry vanished between the request and the read: fetch it in full
+                METRICS.count("http_requests")
+                with METRICS.timer("http_wait"):
+                    response = self.session.get(url, timeout=15)
+            METRICS.count("http_responses", status=response.status_code)
             response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
+            if self.cache:
+                self.cache.record_miss()
+                self.cache.store(url, response.text, response.headers.get('ETag'),
+                                 response.headers.get('Last-Modified'))
             return response.text
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Error fetching URL {url}: {e}")
+            METRICS.count("http_errors", error=type(e).__name__)
             if attempt < max_attempts:
                 self.logger.info(f"Retrying fetch for {url} in {self.delay * 2} seconds...")
-                time.sleep(self.delay * 2) # Exponential backoff
+                METRICS.count("http_retries")
+                self._sleep(self.delay * 2, "backoff") # Exponential backoff
+                # The retry takes a token from the host's bucket like any other request
                 return self.fetch_html(url, attempt + 1)
             else:
                 self.logger.error(f"Failed to fetch {url} after {max_attempts} attempts.")
+                METRICS.count("http_failures")
                 return ""
 
+    @staticmethod
+    def _sleep(seconds: float, reason: str):
+        """Sleeps between requests; the time is recorded under the "scrape_sleep" timer."""
+        METRICS.observe("scrape_sleep", seconds, reason=reason)
+        time.sleep(seconds)
+
+    @staticmethod
+    def _run_parser(parser, html: str) -> List[Dict]:
+        """Runs a page parser inline, recording the parse time and the number of cards parsed."""
+        with METRICS.timer("parse_page"):
+            jobs = parser(html)
+        METRICS.count("cards_parsed", len(jobs))
+        return jobs
+
     def parse_linkedin_jobs(self, html_content: str) -> List[Dict]:
         """
         Parses LinkedIn job search results HTML to extract job titles, companies, and locations.
@@ -75,6 +249,11 @@ class WebSearchAgent:
         Returns:
             List[Dict]: A list of dictionaries, each representing a job posting with title, company, location.
         """
+        if self.parser_engine == 'lxml':
+            return self._parse_linkedin_jobs_lxml(html_content)
+        if self.parser_engine == 'strainer':
+            return self._parse_linkedin_jobs_strained(html_content)
+
         jobs = []
         soup = BeautifulSoup(html_content, 'html.parser')
 
@@ -104,10 +283,15 @@ class WebSearchAgent:
                 title_tag = card.find('h3', class_=lambda x: x and 'base-search-card__title' in x)
                 company_tag = card.find('h4', class_=lambda x: x and 'base-search-card__subtitle' in x)
                 location_tag = card.find('span', class_=lambda x: x and 'job-search-card__location' in x)
+                # Detail page link and job URN, needed by the job-detail enrichment stage
+                link_tag = card.find('a', class_=lambda x: x and 'base-card__full-link' in x)
+                urn_tag = card if card.has_attr('data-entity-urn') else card.find(attrs={'data-entity-urn': True})
 
                 title = title_tag.text.strip() if title_tag else "N/A"
                 company = company_tag.text.strip() if company_tag else "N/A"
                 location = location_tag.text.strip() if location_tag else "N/A"
+                job_url, job_id = _linkedin_job_ref(link_tag.get('href') if link_tag else None,
+                                                    urn_tag.get('data-entity-urn') if urn_tag else None)
 
                 # Only add if essential information is available
                 if title != "N/A" and company != "N/A" and location != "N/A":
@@ -115,7 +299,9 @@ class WebSearchAgent:
                         'title': title,
                         'company': company,
                         'location': location,
-                        'source': 'LinkedIn'
+                        'source': 'LinkedIn',
+                        'url': job_url,
+                        'job_id': job_id
                     })
                 else:
                     self.logger.debug(f"Skipping job card due to missing essential info: Title='{title}', Company='{company}', Location='{location}'")
@@ -126,33 +312,320 @@ class WebSearchAgent:
         self.logger.info(f"Successfully parsed {len(jobs)} jobs from the LinkedIn page.")
         return jobs
 
-    def scrape_all(self) -> List[Dict]:
+    def _build_linkedin_jobs(self, fields) -> List[Dict]:
+        """
+        Shared tail of the fast parser engines: turns (title, company, location, href, urn)
+        tuples (None for a missing tag) into job records, with the same filtering as
+        `parse_linkedin_jobs`.
+        """
+        jobs = []
+        for title, company, location, href, urn in fields:
+            title = title.strip() if title is not None else "N/A"
+            company = company.strip() if company is not None else "N/A"
+            location = location.strip() if location is not None else "N/A"
+            if title != "N/A" and company != "N/A" and location != "N/A":
+                job_url, job_id = _linkedin_job_ref(href, urn)
+                jobs.append({
+                    'title': title,
+                    'company': company,
+                    'location': location,
+                    'source': 'LinkedIn',
+                    'url': job_url,
+                    'job_id': job_id
+                })
+            else:
+                self.logger.debug(f"Skipping job card due to missing essential info: Title='{title}', Company='{company}', Location='{location}'")
+        self.logger.info(f"Successfully parsed {len(jobs)} jobs from the LinkedIn page.")
+        return jobs
+
+    def _parse_linkedin_jobs_strained(self, html_content: str) -> List[Dict]:
+        """
+        'strainer' engine: only materialises the results list (`ul.jobs-search__results-list`)
+        and uses precompiled class selectors. Falls back to a full parse when the list is
+        missing, exactly like the reference parser. Pages that do not mention the list class
+        at all go straight to the full parse; only a page that mentions it without having the
+        list (e.g. the class on another tag) is parsed twice.
+        """
+        job_list_container = None
+        if 'jobs-search__results-list' in html_content:
+            soup = BeautifulSoup(html_content, 'html.parser', parse_only=_RESULTS_LIST_STRAINER)
+            job_list_container = soup.find('ul', class_='jobs-search__results-list')
+        if job_list_container:
+            job_cards = job_list_container.find_all('li')
+            self.logger.info(f"Found {len(job_cards)} 'li' job cards within the main list container.")
+        else:
+            soup = BeautifulSoup(html_content, 'html.parser')
+            job_cards = soup.find_all('div', class_=_FALLBACK_CARD_CLASS)
+            self.logger.warning(f"Main job list container not found. Trying general 'div' job cards. Found {len(job_cards)} general cards.")
+
+        if not job_cards:
+            self.logger.error("Still no specific job cards found on the LinkedIn page. HTML structure might have changed significantly or page is truly empty.")
+            return []
+
+        def card_fields(card):
+            for name, class_ in (('h3', _TITLE_CLASS), ('h4', _COMPANY_CLASS), ('span', _LOCATION_CLASS)):
+                tag = card.find(name, class_=class_)
+                yield tag.text if tag else None
+            link_tag = card.find('a', class_=_LINK_CLASS)
+            yield link_tag.get('href') if link_tag else None
+            urn_tag = card if card.has_attr('data-entity-urn') else card.find(attrs={'data-entity-urn': True})
+            yield urn_tag.get('data-entity-urn') if urn_tag else None
+
+        return self._build_linkedin_jobs(tuple(card_fields(card)) for card in job_cards)
+
+    def _parse_linkedin_jobs_lxml(self, html_content: str) -> List[Dict]:
+        """
+        'lxml' engine: parses with libxml2 and selects cards and fields with precompiled XPath.
+        """
+        try:
+            root = lxml_html.document_fromstring(html_content)
+        except (etree.ParserError, ValueError) as e:
+            self.logger.debug(f"lxml could not parse the page ({e}). Using the strainer engine.")
+            return self._parse_linkedin_jobs_strained(html_content)
+
+        containers = _XP_RESULTS_LIST(root)
+        if containers:
+            job_cards = _XP_LIST_CARDS(containers[0])
+            self.logger.info(f"Found {len(job_cards)} 'li' job cards within the main list container.")
+        else:
+            job_cards = _XP_FALLBACK_CARDS(root)
+            self.logger.warning(f"Main job list container not found. Trying general 'div' job cards. Found {len(job_cards)} general cards.")
+
+        if not job_cards:
+            self.logger.error("Still no specific job cards found on the LinkedIn page. HTML structure might have changed significantly or page is truly empty.")
+            return []
+
+        def first_text(xpath, card):
+            tags = xpath(card)
+            return tags[0].text_content() if tags else None
+
+        def first_value(xpath, card):
+            values = xpath(card)
+            return str(values[0]) if values else None
+
+        return self._build_linkedin_jobs(
+            (first_text(_XP_TITLE, card), first_text(_XP_COMPANY, card), first_text(_XP_LOCATION, card),
+             first_value(_XP_LINK_HREF, card), first_value(_XP_URN, card))
+            for card in job_cards
+        )
+
+    def _resolve_parser(self, platform_url: str, html: str):
+        """
+        Looks up the registered parser for the platform's host.
+
+        Returns:
+            The parser callable, or None (with the reason logged) if the fetch failed
+            or no parser is registered for the host.
+        """
+        if not html:
+            self.logger.error(f"Failed to fetch HTML from {platform_url}. No jobs scraped from this source.")
+            return None
+        parser = self.parsers.resolve(platform_url)
+        if parser is None:
+            self.logger.warning(f"No specific parser for {platform_url}. Skipping.")
+        return parser
+
+    def _parse_platform(self, platform_url: str, html: str) -> List[Dict]:
+        """
+        Dispatches downloaded HTML to the parser registered for the platform's host.
+
+        Args:
+            platform_url (str): The URL the HTML was fetched from.
+            html (str): Raw HTML content ("" if the fetch failed).
+
+        Returns:
+            List[Dict]: Parsed job postings, or an empty list if nothing could be parsed.
+        """
+        parser = self._resolve_parser(platform_url, html)
+        return self._run_parser(parser, html) if parser else []
+
+    @staticmethod
+    def _stamp_scrape_date(jobs: List[Dict]) -> List[Dict]:
+        """Sets each job's `scraped_at` to today's ISO date (used for the time-bucketed trends)."""
+        scraped_at = date.today().isoformat()
+        for job in jobs:
+            job['scraped_at'] = scraped_at
+        return jobs
+
+    def _parse_pool(self):
+        """
+        Returns a context manager yielding a ProcessPoolExecutor for parsing,
+        or None when `parse_workers` is 0 (parse inline).
+        """
+        if self.parse_workers:
+            return ProcessPoolExecutor(max_workers=self.parse_workers)
+        return nullcontext(None)
+
+    def scrape_all(self, concurrent: bool = False) -> List[Dict]:
         """
         Orchestrates the full scraping process across all platforms.
 
+        Args:
+            concurrent (bool): If True, fetch platforms with the asyncio engine
+                               (see `scrape_all_async`) instead of the serial loop.
+
         Returns:
             List[Dict]: Aggregated raw job postings.
         """
+        if concurrent:
+            return asyncio.run(self.scrape_all_async())
+
         all_jobs = []
-        for platform_url in self.platforms:
-            self.logger.info(f"Initiating scraping for platform: {platform_url}")
-            html = self.fetch_html(platform_url)
-            if html:
-                if 'linkedin' in platform_url:
-                    jobs_from_platform = self.parse_linkedin_jobs(html)
-                    all_jobs.extend(jobs_from_platform)
-                else:
-                    self.logger.warning(f"No specific parser for {platform_url}. Skipping.")
-            else:
-                self.logger.error(f"Failed to fetch HTML from {platform_url}. No jobs scraped from this source.")
+        with self._parse_pool() as pool:
+            # With a pool, pages are parsed in worker processes while the next URL is fetched;
+            # results are collected in platform order once the loop is done.
+            pending = []
+            for platform_url in self.platforms:
+                self.logger.info(f"Initiating scraping for platform: {platform_url}")
+                html = self.fetch_html(platform_url)
+                parser = self._resolve_parser(platform_url, html)
+                if parser and pool:
+                    pending.append(pool.submit(parser, html))
+                elif parser:
+                    all_jobs.extend(self._run_parser(parser, html))
+
+                # Add a dynamic delay to be more robust against simple bot detection
+                dynamic_delay = self.delay + (random.uniform(0.5, 2.0)) # Add random fraction
+                self.logger.info(f"Pausing for {dynamic_delay:.2f} seconds...")
+                self._sleep(dynamic_delay, "politeness")
+
+            for future in pending:
+                jobs = future.result()
+                METRICS.count("cards_parsed", len(jobs))
+                all_jobs.extend(jobs)
+
+        self.logger.info(f"Total jobs scraped across all platforms: {len(all_jobs)}")
+        self._log_cache_stats()
+        return self._stamp_scrape_date(all_jobs)
+
+    def _log_cache_stats(self):
+        if self.cache:
+            stats = self.cache.stats()
+            self.logger.info(f"Response cache: {stats['hits']} hits, {stats['misses']} misses.")
+
+    @staticmethod
+    def _page_url(platform_url: str, start: int) -> str:
+        """
+        Returns the search URL with its `start=` result offset set to `start`.
+        """
+        parts = urlparse(platform_url)
+        query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != 'start']
+        if start:
+            query.append(('start', str(start)))
+        return urlunparse(parts._replace(query=urlencode(query)))
+
+    def iter_search_pages(self, platform_url: str, max_pages: int = 10, page_size: int = 25) -> Iterator[List[Dict]]:
+        """
+        Lazily crawls the result pages of one search URL by following its `start=` offsets.
+        Yields the parsed jobs of each page as soon as it is downloaded, so callers can
+        process page N while page N+1 has not been requested yet.
+
+        The crawl stops early when a page fails to download, has no cards, or only
+        repeats the cards of the previous page (LinkedIn keeps serving the last page
+        past the end of the results). Only the fingerprints of the previous page are
+        kept, so memory stays flat however many pages are crawled.
+
+        Args:
+            platform_url (str): Search URL of the first results page.
+            max_pages (int): Maximum number of pages to request (crawl depth).
+            page_size (int): Number of results per page, i.e. the `start=` increment.
+
+        Yields:
+            List[Dict]: The jobs parsed from each page.
+        """
+        previous_page = set()
+        for page in range(max_pages):
+            if page:
+                dynamic_delay = self.delay + (random.uniform(0.5, 2.0))
+                self.logger.info(f"Pausing for {dynamic_delay:.2f} seconds before next page...")
+                self._sleep(dynamic_delay, "politeness")
+
+            page_url = self._page_url(platform_url, page * page_size)
+            jobs = self._parse_platform(page_url, self.fetch_html(page_url))
+
+            current_page = {hash(tuple(sorted(job.items()))) for job in jobs}
+            if not current_page or current_page <= previous_page:
+                self.logger.info(f"No new cards on page {page + 1} of {platform_url}. Stopping pagination.")
+                return
+            previous_page = current_page
+            self.logger.info(f"Page {page + 1} of {platform_url}: {len(jobs)} jobs.")
+            yield self._stamp_scrape_date(jobs)
+
+    def iter_pages(self, max_pages: int = 10, page_size: int = 25) -> Iterator[List[Dict]]:
+        """
+        Chains `iter_search_pages` over all platforms.
+
+        Args:
+            max_pages (int): Maximum number of result pages per platform URL.
+            page_size (int): Number of results per page.
+
+        Yields:
+            List[Dict]: The jobs parsed from each page, in crawl order.
+        """
+        total = 0
+        for i, platform_url in enumerate(self.platforms):
+            if i:
+                self._sleep(self.delay + (random.uniform(0.5, 2.0)), "politeness")
+            self.logger.info(f"Initiating paginated scraping for platform: {platform_url}")
+            for jobs in self.iter_search_pages(platform_url, max_pages=max_pages, page_size=page_size):
+                total += len(jobs)
+                yield jobs
+        self.logger.info(f"Total jobs scraped across all platforms and pages: {total}")
+        self._log_cache_stats()
+
+    def iter_jobs(self, max_pages: int = 10, page_size: int = 25) -> Iterator[Dict]:
+        """
+        Generator counterpart of `scrape_all` with pagination: yields jobs one by one
+        across all platforms and result pages, without accumulating them in memory.
+
+        Args:
+            max_pages (int): Maximum number of result pages per platform URL.
+            page_size (int): Number of results per page.
+
+        Yields:
+            Dict: Raw job postings, in crawl order.
+        """
+        for jobs in self.iter_pages(max_pages=max_pages, page_size=page_size):
+            yield from jobs
+
+    async def scrape_all_async(self) -> List[Dict]:
+        """
+        Concurrent version of `scrape_all`.
+        Keeps at most `max_concurrency` requests in flight across all hosts, while a
+        per-host token bucket enforces politeness towards each individual domain.
+        Results are returned in the same order as `self.platforms`.
+
+        Returns:
+            List[Dict]: Aggregated raw job postings.
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        limiter = self.rate_limiter
+        loop = asyncio.get_running_loop()
 
-            # Add a dynamic delay to be more robust against simple bot detection
-            dynamic_delay = self.delay + (random.uniform(0.5, 2.0)) # Add random fraction
-            self.logger.info(f"Pausing for {dynamic_delay:.2f} seconds...")
-            time.sleep(dynamic_delay)
+        with self._parse_pool() as pool:
+            async def scrape_one(platform_url: str) -> List[Dict]:
+                # Wait for the host's token before taking a slot, so a throttled host
+                # does not block requests to other hosts.
+                with METRICS.timer("rate_limit_wait"):
+                    await limiter.acquire(platform_url)
+                async with semaphore:
+                    self.logger.info(f"Initiating scraping for platform: {platform_url}")
+                    # fetch_html is blocking (requests), so it runs in a worker thread
+                    html = await asyncio.to_thread(self.fetch_html, platform_url, throttle=False)
+                parser = self._resolve_parser(platform_url, html)
+                if parser is None:
+                    return []
+                if pool:
+                    jobs = await loop.run_in_executor(pool, parser, html)
+                    METRICS.count("cards_parsed", len(jobs))
+                    return jobs
+                return self._run_parser(parser, html)
 
+            results = await asyncio.gather(*(scrape_one(url) for url in self.platforms))
+        all_jobs = [job for jobs in results for job in jobs]
         self.logger.info(f"Total jobs scraped across all platforms: {len(all_jobs)}")
-        return all_jobs
+        self._log_cache_stats()
+        return self._stamp_scrape_date(all_jobs)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,93 @@
+"""
+Benchmark: TrendAnalysisAgent.analyze with the 'pandas' engine vs the 'columnar' engine.
+
+Each engine runs in a fresh subprocess that first generates the synthetic structured
+postings (with descriptions, as produced by DataExtractionAgent) and then analyses them.
+Reported: analysis time and the peak RSS growth during the analysis. The insights of
+both engines are compared for equality.
+
+Usage:
+    python benchmarks/bench_analysis_engine.py --postings 1000000
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+TITLES = ["Machine Learning Engineer", "Data Scientist", "AI Engineer", "MLOps Engineer", "Data Engineer",
+          "Computer Vision Engineer", "NLP Engineer", "AI Researcher", "Data Analyst", "AI Product Manager"]
+CITIES = ["Dubai", "Abu Dhabi", "Riyadh", "Jeddah", "Cairo", "Doha", "Amman", "Casablanca", "Kuwait City", "Manama"]
+SKILLS = ["python", "sql", "aws", "pytorch", "tensorflow", "docker", "kubernetes", "spark", "nlp", "r",
+          "azure", "gcp", "pandas", "numpy", "mlops", "airflow", "tableau", "power bi", "git", "statistics"]
+
+
+def synthetic_postings(n, seed=0):
+    """Structured postings with a long tail of titles (seniority/team suffixes) and ~400-char descriptions."""
+    rng = random.Random(seed)
+    postings = []
+    for i in range(n):
+        title = rng.choice(TITLES)
+        if rng.random() < 0.3:
+            title = f"{rng.choice(['Senior', 'Lead', 'Junior', 'Staff'])} {title} - Team {rng.randrange(2000)}"
+        postings.append({
+            "title": title,
+            "company": f"Company {rng.randrange(20000)}",
+            "location": f"{rng.choice(CITIES)}, Region {rng.randrange(20)}",
+            "source": "LinkedIn",
+            "description": f"Posting {i}: " + " ".join(rng.choices(SKILLS, k=60)),
+            "skills": sorted(set(rng.choices(SKILLS, k=rng.randint(1, 8)))),
+        })
+    return postings
+
+
+def current_rss_kib():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * (os.sysconf("SC_PAGE_SIZE") // 1024)
+
+
+def worker(engine, n):
+    from agents.trend_analysis_agent import TrendAnalysisAgent
+
+    logging.disable(logging.INFO)
+    postings = synthetic_postings(n)
+    agent = TrendAnalysisAgent(engine=engine)
+    rss_before = current_rss_kib()
+    start = time.perf_counter()
+    insights = agent.analyze(postings)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"elapsed": elapsed, "rss_growth_mib": max(0, peak - rss_before) / 1024,
+                      "insights": insights}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postings", type=int, default=1_000_000)
+    parser.add_argument("--worker", choices=["pandas", "columnar"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.postings)
+        return
+
+    results = {}
+    for engine in ("pandas", "columnar"):
+        output = subprocess.run([sys.executable, __file__, "--worker", engine, "--postings", str(args.postings)],
+                                check=True, capture_output=True, text=True).stdout
+        results[engine] = json.loads(output.strip().splitlines()[-1])
+        print(f"{engine:<9} {args.postings} postings  {results[engine]['elapsed']:8.2f}s  "
+              f"peak RSS growth {results[engine]['rss_growth_mib']:8.1f} MiB")
+
+    assert results["pandas"]["insights"] == results["columnar"]["insights"], "Engines disagree."
+    print(f"Insights identical. Speed-up: {results['pandas']['elapsed'] / results['columnar']['elapsed']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark: streaming a legacy JSON array file with iter_json_array vs json.load.
+
+Writes an array of `--records` synthetic postings, then decodes it once with json.load
+(the whole array in memory) and once with iter_json_array at its default chunk size;
+both results are compared.
+
+Usage:
+    python benchmarks/bench_json_array.py --records 50000
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.jsonl_store import iter_json_array
+from benchmarks.bench_analysis_engine import synthetic_postings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=50_000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    postings = [{**post, "description": "Build and deploy machine learning models. " * 8}
+                for post in synthetic_postings(args.records)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "jobs.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(postings, f, ensure_ascii=False, indent=2)
+        size_mb = os.path.getsize(path) / 1e6
+
+        start = time.perf_counter()
+        with open(path, "r", encoding="utf-8") as f:
+            loaded = json.load(f)
+        load_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        streamed = list(iter_json_array(path))
+        stream_time = time.perf_counter() - start
+
+    print(f"{len(postings)} records, {size_mb:.1f} MB, outputs {'identical' if loaded == streamed else 'DIFFERENT'}.")
+    print(f"json.load       : {load_time:8.2f}s")
+    print(f"iter_json_array : {stream_time:8.2f}s  ({stream_time / load_time:.1f}x json.load)")
+
+
+if __name__ == "__main__":
+    main()
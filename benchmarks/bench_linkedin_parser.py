@@ -0,0 +1,56 @@
+"""
+Benchmark + parity check for the LinkedIn parser engines.
+
+Parses every saved page in benchmarks/fixtures/ with each engine, asserts that all
+engines return exactly the records of the reference 'bs4' engine, and reports the
+mean parse time per page.
+
+Usage:
+    python benchmarks/bench_linkedin_parser.py --repeat 20
+"""
+import argparse
+import glob
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.web_search_agent import WebSearchAgent, lxml_html
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="Parses per fixture and engine.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    logging.getLogger("WebSearchAgent").setLevel(logging.CRITICAL)
+
+    engines = ["bs4", "strainer"] + (["lxml"] if lxml_html is not None else [])
+    agents = {engine: WebSearchAgent([], parser_engine=engine) for engine in engines}
+
+    print(f"{'fixture':<32}" + "".join(f"{engine:>12}" for engine in engines) + "   (ms/page)")
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "linkedin_*.html"))):
+        with open(path, "r", encoding="utf-8") as f:
+            html = f.read()
+
+        reference = agents["bs4"].parse_linkedin_jobs(html)
+        timings = []
+        for engine in engines:
+            records = agents[engine].parse_linkedin_jobs(html)
+            assert records == reference, f"{engine} engine differs from bs4 on {os.path.basename(path)}"
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                agents[engine].parse_linkedin_jobs(html)
+            timings.append((time.perf_counter() - start) / args.repeat * 1000)
+
+        print(f"{os.path.basename(path):<32}" + "".join(f"{t:12.2f}" for t in timings)
+              + f"   [{len(reference)} records, parity OK]")
+
+
+if __name__ == "__main__":
+    main()
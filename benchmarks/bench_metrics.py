@@ -0,0 +1,73 @@
+"""
+Benchmark: overhead of the metrics instrumentation (utils/metrics.py).
+
+Runs instrumented hot paths with the registry disabled (the default), enabled, and enabled
+with tracemalloc peak-memory tracking around the stage: parsing LinkedIn result pages,
+cleaning raw postings and deduplicating them. Also times a bare instrumentation call.
+
+Usage:
+    python benchmarks/bench_metrics.py --postings 20000 --pages 200
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.data_extraction_agent import DataExtractionAgent
+from agents.dedup_agent import DeduplicationAgent
+from agents.web_search_agent import WebSearchAgent, parse_linkedin_page
+from utils.metrics import METRICS
+from benchmarks.bench_analysis_engine import synthetic_postings
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "linkedin_results_100.html")
+
+
+def workloads(postings, html, pages):
+    agent = WebSearchAgent([])
+    extraction_agent = DataExtractionAgent()
+    return {
+        "parse pages": lambda: [agent._run_parser(parse_linkedin_page, html) for _ in range(pages)],
+        "clean postings": lambda: list(extraction_agent.iter_clean(postings)),
+        "deduplicate": lambda: list(DeduplicationAgent().iter_unique(postings)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postings", type=int, default=20_000)
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    postings = synthetic_postings(args.postings)
+    with open(FIXTURE, encoding="utf-8") as f:
+        html = f.read()
+    print(f"{args.postings:,} postings, {args.pages} result pages")
+
+    METRICS.disable()
+    calls = 1_000_000
+    disabled_count = timeit.timeit(lambda: METRICS.count("bench"), number=calls) / calls
+    baseline = timeit.timeit(lambda: None, number=calls) / calls
+    print(f"  disabled METRICS.count: {(disabled_count - baseline) * 1e9:6.1f} ns per call")
+
+    for name, func in workloads(postings, html, args.pages).items():
+        timings = []
+        for label, enabled, track_memory in (("off", False, False), ("on", True, False), ("on + memory", True, True)):
+            if enabled:
+                METRICS.enable(track_memory=track_memory)
+            else:
+                METRICS.disable()
+            start = time.perf_counter()
+            with METRICS.stage(name):
+                func()
+            timings.append(f"{label} {time.perf_counter() - start:6.2f}s")
+        print(f"  {name:15}: " + ", ".join(timings))
+    METRICS.disable()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: batch pipeline vs streaming pipeline (main.run_batch_pipeline / main.run_streaming_pipeline).
+
+Both crawl the same paginated searches on a local stub server, fetch the job detail
+pages, extract skills and analyse the postings. Reports wall-clock time and peak
+traced memory (tracemalloc) of each mode and checks that the insights match.
+
+Usage:
+    python benchmarks/bench_pipeline.py --pages 6 --searches 2
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import main as pipeline
+from agents.web_search_agent import WebSearchAgent, parse_linkedin_page
+from agents.job_detail_agent import JobDetailAgent, parse_linkedin_job_detail
+from benchmarks.stub_server import StubServer
+from utils.parser_registry import ParserRegistry
+
+
+def run(label, func, search_agent, **kwargs):
+    with tempfile.TemporaryDirectory() as data_dir:
+        tracemalloc.start()
+        start = time.perf_counter()
+        insights = func(search_agent, data_dir=data_dir, **kwargs)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    print(f"{label:<10} {elapsed:8.2f}s   peak traced memory {peak / 1024 / 1024:8.2f} MiB")
+    return insights
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--searches", type=int, default=2, help="Number of search URLs.")
+    parser.add_argument("--pages", type=int, default=6, help="Result pages per search.")
+    parser.add_argument("--queue-size", type=int, default=50)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with StubServer(latency=0.02, total_results=args.pages * 25) as server:
+        def make_agents():
+            # The stub host serves both LinkedIn-style search pages and detail pages
+            search_agent = WebSearchAgent(server.urls(args.searches), delay=0.0, host_rate=200,
+                                          parsers=ParserRegistry({"127.0.0.1": parse_linkedin_page}))
+            detail_agent = JobDetailAgent(search_agent, max_workers=4,
+                                          detail_parsers=ParserRegistry({"127.0.0.1": parse_linkedin_job_detail}))
+            return search_agent, detail_agent
+
+        search_agent, detail_agent = make_agents()
+        batch = run("batch", pipeline.run_batch_pipeline, search_agent, max_pages=args.pages,
+                    detail_agent=detail_agent)
+        search_agent, detail_agent = make_agents()
+        stream = run("stream", pipeline.run_streaming_pipeline, search_agent, max_pages=args.pages,
+                     queue_size=args.queue_size, detail_agent=detail_agent)
+
+    assert batch == stream, "Streaming insights differ from batch insights."
+    print("Insights identical.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark: per-segment reports built one by one vs the batch fan-out.
+
+"One by one" is what producing segment reports cost before: for each segment (every
+country and role family), a pass over the postings to select its postings, an analysis
+and a report with its own charts. The fan-out computes every segment's insights in one
+pass (`TrendAnalysisAgent.segment_insights`), renders each distinct chart once and builds
+the PDFs in parallel (`ReportWriterAgent.generate_segment_reports`); it is then re-run
+with a warm chart cache.
+
+Usage:
+    python benchmarks/bench_segment_reports.py --postings 200000 --workers 2
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.report_writer_agent import ReportWriterAgent
+from agents.trend_analysis_agent import TrendAnalysisAgent
+from utils.segments import SegmentedAnalysis
+from benchmarks.bench_analysis_engine import synthetic_postings
+
+
+def one_by_one(postings, segments, output_dir):
+    agent = TrendAnalysisAgent()
+    writer = ReportWriterAgent(use_chart_cache=False)
+    splitter = SegmentedAnalysis()
+    for segment in segments:
+        selected = [post for post in postings if segment in splitter.segments_of(post)]
+        insights = agent.analyze(selected)
+        writer.generate_report(insights, os.path.join(output_dir, f"{segment.slug}.pdf"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postings", type=int, default=200_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)  # also the missing-font warnings
+
+    postings = synthetic_postings(args.postings)
+    segments = SegmentedAnalysis().update(postings).segments()
+    print(f"{args.postings:,} postings, {len(segments)} segments, {args.workers} worker(s), {os.cpu_count()} CPU(s)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        one_by_one(postings, segments, os.path.join(tmp, "one_by_one"))
+        print(f"  one by one           : {time.perf_counter() - start:6.2f}s")
+
+        from utils.visualizations import ChartCache
+        for label in ("fan-out, cold cache", "fan-out, warm cache"):
+            start = time.perf_counter()
+            segment_insights = TrendAnalysisAgent().segment_insights(postings, min_postings=1)
+            writer = ReportWriterAgent(chart_cache=ChartCache(os.path.join(tmp, "cache")))
+            reports = writer.generate_segment_reports(segment_insights, os.path.join(tmp, "fan_out"),
+                                                      max_workers=args.workers)
+            print(f"  {label:21}: {time.perf_counter() - start:6.2f}s ({len(reports)} reports, "
+                  f"{len(os.listdir(os.path.join(tmp, 'fan_out', 'assets')))} distinct charts)")
+
+
+if __name__ == "__main__":
+    main()
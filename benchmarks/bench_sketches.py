@@ -0,0 +1,89 @@
+"""
+Benchmark: exact AnalysisState counters vs the fixed-size SketchState (Space-Saving + HyperLogLog)
+on a stream with a very long tail of free-text titles and companies.
+
+Reported per structure: update time, serialised size, and for the sketches the top-10 title
+recall, the largest observed count error vs the guaranteed N / capacity bound and the relative
+error of the distinct-companies estimates. Shards are summarised separately and merged.
+
+Usage:
+    python benchmarks/bench_sketches.py --postings 1000000 --shards 4
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.analysis_state import AnalysisState
+from utils.sketches import SketchState
+from benchmarks.bench_analysis_engine import CITIES, SKILLS, TITLES
+
+
+def long_tail_postings(n, seed=0):
+    """Zipf-distributed base titles, half of them with a unique suffix (one-off titles), many companies."""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(TITLES))]
+    for i in range(n):
+        title = rng.choices(TITLES, weights)[0]
+        if rng.random() < 0.5:
+            title = f"{title} ({i})"
+        yield {
+            "title": title,
+            "company": f"Company {int(rng.paretovariate(0.8)) % 200000}",
+            "location": rng.choice(CITIES),
+            "skills": rng.sample(SKILLS, rng.randint(1, 6)),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postings", type=int, default=1_000_000)
+    parser.add_argument("--shards", type=int, default=4)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    postings = list(long_tail_postings(args.postings))
+    shard_size = -(-len(postings) // args.shards)
+    shards = [postings[i:i + shard_size] for i in range(0, len(postings), shard_size)]
+
+    start = time.perf_counter()
+    exact = AnalysisState()
+    for shard in shards:
+        exact.merge(AnalysisState().update(shard))
+    exact_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sketch = SketchState()
+    for shard in shards:
+        # Round-trip through JSON as shards/days would be persisted before merging
+        sketch.merge(SketchState.from_dict(json.loads(json.dumps(SketchState().update(shard).to_dict()))))
+    sketch_time = time.perf_counter() - start
+
+    exact_size = len(json.dumps(exact.to_dict()))
+    sketch_size = len(json.dumps(sketch.to_dict()))
+    print(f"exact   {exact_time:7.2f}s  state {exact_size / 1024:10.1f} KiB  ({len(exact.title_counts)} distinct titles)")
+    print(f"sketch  {sketch_time:7.2f}s  state {sketch_size / 1024:10.1f} KiB")
+
+    exact_top = [title for title, _ in exact.top_titles(10)]
+    sketch_top = [title for title, _ in sketch.top_titles(10)]
+    recall = len(set(exact_top) & set(sketch_top)) / len(exact_top)
+    worst = max(sketch.titles.estimate(t) - exact.title_counts[t] for t, _ in sketch.top_titles(None))
+    print(f"top-10 title recall {recall:.0%}, largest title over-count {worst} "
+          f"(bound N/m = {sketch.error_bounds()['title_count']:.0f})")
+
+    companies = defaultdict(set)
+    for post in postings:
+        companies[post["location"]].add(post["company"])
+    errors = [abs(sketch.distinct_companies(loc) - len(c)) / len(c) for loc, c in companies.items()]
+    print(f"distinct companies per location: max relative error {max(errors):.1%} "
+          f"(standard error {sketch.error_bounds()['distinct_companies_relative']:.1%})")
+
+
+if __name__ == "__main__":
+    main()
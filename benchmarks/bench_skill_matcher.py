@@ -0,0 +1,47 @@
+"""
+Benchmark for DataExtractionAgent.extract_skills.
+
+Times the precompiled trie matcher (utils.skill_matcher.SkillMatcher) against the
+previous implementation, which rebuilt a `\\b(?:kw1|kw2|...)\\b` alternation on every call.
+Their equivalence is tested in tests/test_skill_matcher.py.
+
+Usage:
+    python benchmarks/bench_skill_matcher.py --descriptions 100000
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.data_extraction_agent import DataExtractionAgent
+from tests.test_skill_matcher import legacy_extract_skills, synthetic_descriptions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--descriptions", type=int, default=100_000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    agent = DataExtractionAgent()
+
+    descriptions = list(synthetic_descriptions(args.descriptions, agent.all_skills))
+
+    start = time.perf_counter()
+    legacy = [legacy_extract_skills(agent.all_skills, d) for d in descriptions]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    fast = [agent.extract_skills(d) for d in descriptions]
+    fast_time = time.perf_counter() - start
+
+    print(f"{len(descriptions)} descriptions, outputs {'identical' if legacy == fast else 'DIFFERENT'}.")
+    print(f"regex rebuilt per call : {legacy_time:8.2f}s")
+    print(f"precompiled trie regex : {fast_time:8.2f}s  ({legacy_time / fast_time:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
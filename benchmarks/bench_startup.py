@@ -0,0 +1,77 @@
+"""
+Benchmark: start-up cost of the command line entry point.
+
+Runs each command under `python -X importtime` and reports the wall time, the total
+import time and which heavy third-party packages were loaded. The "eager" baseline
+imports the six agent modules up front, which is what every `main.py` invocation paid
+before the agents were imported lazily by the stage that uses them.
+
+Usage:
+    python benchmarks/bench_startup.py --postings 2000
+"""
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench_analysis_engine import synthetic_postings
+
+HEAVY_PACKAGES = ("requests", "bs4", "lxml", "numpy", "pandas", "matplotlib", "fpdf", "PIL")
+EAGER_IMPORTS = ("import agents.web_search_agent, agents.job_detail_agent, agents.dedup_agent, "
+                 "agents.data_extraction_agent, agents.trend_analysis_agent, agents.report_writer_agent")
+
+
+def importtime(args):
+    """Runs a Python command with -X importtime; returns (wall seconds, import seconds, heavy packages)."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime"] + args, cwd=ROOT, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if result.returncode:
+        raise RuntimeError(f"{args} failed:\n{result.stderr[-2000:]}")
+    total_us, loaded = 0, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        total_us += int(self_us)
+        loaded.add(name.strip().split(".")[0])
+    return wall, total_us / 1e6, [package for package in HEAVY_PACKAGES if package in loaded]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--postings", type=int, default=2000)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    import main as pipeline
+    from agents.trend_analysis_agent import TrendAnalysisAgent
+    from utils.jsonl_store import JsonlWriter
+
+    with tempfile.TemporaryDirectory() as tmp:
+        postings = synthetic_postings(args.postings)
+        with JsonlWriter(os.path.join(tmp, pipeline.PROCESSED_DATA_FILE)) as writer:
+            writer.write_all(postings)
+        pipeline.save_insights(TrendAnalysisAgent().analyze(postings), os.path.join(tmp, pipeline.INSIGHTS_FILE))
+
+        commands = [
+            ("eager agent imports", ["-c", EAGER_IMPORTS]),
+            ("main.py --help", ["main.py", "--help"]),
+            ("main.py report --help", ["main.py", "report", "--help"]),
+            ("main.py analyze --history", ["main.py", "analyze", "--history", "--data-dir", tmp]),
+            ("main.py report", ["main.py", "report", "--data-dir", tmp, "--output", os.path.join(tmp, "report.pdf")]),
+        ]
+        print(f"{args.postings:,} postings in the analyze/report fixtures")
+        for label, command in commands:
+            wall, imports, heavy = importtime(command)
+            print(f"  {label:27}: {wall:6.2f}s wall, {imports:5.2f}s importing  [{', '.join(heavy) or 'no heavy packages'}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Local stand-in for job boards, used by the benchmarks so they never hit real sites.
+Serves synthetic LinkedIn-style search result pages with a configurable latency.
+"""
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import parse_qs, urlparse
+
+TITLES = ["Machine Learning Engineer", "Data Scientist", "AI Engineer", "MLOps Engineer",
+          "Computer Vision Engineer", "NLP Engineer", "Data Engineer", "AI Researcher"]
+COMPANIES = ["Innovate AI", "Analytics Hub", "Future Tech", "Desert Data", "Nile Labs", "Gulf Robotics"]
+LOCATIONS = ["Dubai, United Arab Emirates", "Cairo, Egypt", "Riyadh, Saudi Arabia",
+             "Doha, Qatar", "Amman, Jordan", "Abu Dhabi, United Arab Emirates"]
+
+
+# Boilerplate that makes detail pages about as long as real job descriptions (~2 KB)
+ABOUT_US = " ".join([
+    "Our company is a fast-growing technology group serving customers across the Middle East and North Africa.",
+    "We offer competitive compensation, health insurance, flexible working hours and a hybrid work model.",
+    "You will collaborate with product managers, designers and engineers to ship reliable software to production.",
+    "We value ownership, curiosity and clear communication, and we invest in the growth of every team member.",
+] * 4)
+
+
+def make_linkedin_html(n_cards: int = 25, seed: int = 0, start: int = 0,
+                       base_url: str = "https://www.linkedin.com") -> str:
+    """
+    Builds a LinkedIn-like search results page with `n_cards` job cards.
+
+    Args:
+        n_cards (int): Number of job cards on the page.
+        seed (int): Seed for the random choice of titles/companies/locations.
+        start (int): Offset used for the job IDs (mimics LinkedIn's `start=` pagination).
+        base_url (str): Scheme and host of the job detail links.
+
+    Returns:
+        str: The HTML page.
+    """
+    rng = random.Random(seed)
+    cards = []
+    for i in range(start, start + n_cards):
+        cards.append(
+            f'<li><div class="base-card relative base-search-card job-search-card" data-entity-urn="urn:li:jobPosting:{1000 + i}">'
+            f'<a class="base-card__full-link" href="{base_url}/jobs/view/job-{1000 + i}?refId=abc&amp;trackingId=xyz"></a>'
+            f'<div class="base-search-card__info">'
+            f'<h3 class="base-search-card__title">\n      {rng.choice(TITLES)}\n    </h3>'
+            f'<h4 class="base-search-card__subtitle"><a href="#">{rng.choice(COMPANIES)}</a></h4>'
+            f'<div class="base-search-card__metadata">'
+            f'<span class="job-search-card__location">\n  {rng.choice(LOCATIONS)}\n</span>'
+            f'<time class="job-search-card__listdate">1 day ago</time></div></div></div></li>'
+        )
+    filler = "".join(f'<div class="nav-item"><a href="#">Link {i}</a></div>' for i in range(200))
+    return (
+        '<!DOCTYPE html><html><head><title>Jobs</title></head><body>'
+        f'<header>{filler}</header><main><section class="two-pane-serp-page__results-list">'
+        f'<ul class="jobs-search__results-list">{"".join(cards)}</ul></section></main>'
+        f'<footer>{filler}</footer></body></html>'
+    )
+
+
+def make_linkedin_detail_html(job_id: str, seed: int = 0) -> str:
+    """
+    Builds a LinkedIn-like job detail page whose description mentions a few skills.
+    """
+    rng = random.Random(seed)
+    skills = rng.sample(["Python", "PyTorch", "TensorFlow", "SQL", "AWS", "Docker", "Kubernetes",
+                         "Spark", "NLP", "computer vision", "MLOps", "CI/CD", "C++", "R"], 4)
+    return (
+        f'<!DOCTYPE html><html><body><main><h1 class="top-card-layout__title">Job {job_id}</h1>'
+        f'<section class="description"><div class="show-more-less-html__markup relative overflow-hidden">'
+        f'<p>We are hiring for role {job_id}.</p><ul><li>Experience with {", ".join(skills[:2])}.</li>'
+        f'<li>Knowledge of {skills[2]} and {skills[3]} is a plus.</li></ul><p>{ABOUT_US}</p></div></section>'
+        f'</main></body></html>'
+    )
+
+
+class StubServer:
+    """
+    Threaded HTTP server on 127.0.0.1 that answers every GET with a results page
+    after `latency` seconds, honouring `If-None-Match` with a 304. Use as a context manager.
+    """
+
+    def __init__(self, latency: float = 0.05, n_cards: int = 25, total_results: Optional[int] = None):
+        """
+        Args:
+            latency (float): Seconds to wait before answering each request.
+            n_cards (int): Cards per results page.
+            total_results (Optional[int]): If set, `start=` offsets are honoured and pages past
+                                           this many results come back empty.
+        """
+        self.latency = latency
+        self.n_cards = n_cards
+        self.total_results = total_results
+        self.hits = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.hits += 1
+                time.sleep(stub.latency)
+                if self.path.startswith("/jobs/view/"):
+                    job_id = urlparse(self.path).path.rstrip("/").rsplit("-", 1)[-1]
+                    self._send_page(make_linkedin_detail_html(job_id, seed=int(job_id)))
+                    return
+                n_cards, start = stub.n_cards, 0
+                if stub.total_results is not None:
+                    start = int(parse_qs(urlparse(self.path).query).get("start", ["0"])[0])
+                    n_cards = max(0, min(stub.n_cards, stub.total_results - start))
+                self._send_page(make_linkedin_html(n_cards, seed=hash(self.path) & 0xFFFF, start=start,
+                                                   base_url=stub.base_url))
+
+            def _send_page(self, html: str):
+                body = html.encode("utf-8")
+                etag = f'"{hashlib.md5(body).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def urls(self, n: int) -> List[str]:
+        """Returns `n` distinct LinkedIn-style search URLs on this server."""
+        return [f"{self.base_url}/jobs/search/?keywords=ml&page={i}" for i in range(n)]
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
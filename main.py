@@ -1,107 +1,767 @@
+import argparse
+import json
 import logging
 import os
-import json
 import sys
+from datetime import date
+from functools import partial
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
 
 # Ensure project root is in path for imports
 # This is crucial if you run the script from a different directory
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
 
-from agents.web_search_agent import WebSearchAgent
-from agents.data_extraction_agent import DataExtractionAgent
-from agents.trend_analysis_agent import TrendAnalysisAgent
-from agents.report_writer_agent import ReportWriterAgent
+# The agents and their heavy dependencies (requests, bs4, pandas, NumPy, Matplotlib, fpdf)
+# are imported inside the stage functions that use them: `python main.py report` never loads
+# the scraping stack, and `python main.py --help` loads none of them.
+from utils.metrics import METRICS
 
-# Configure logging for the main orchestrator
-# This ensures that all agents and the main script log to the console
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+if TYPE_CHECKING:
+    from agents.web_search_agent import WebSearchAgent
+    from agents.job_detail_agent import JobDetailAgent
+    from agents.dedup_agent import DeduplicationAgent
+    from agents.trend_analysis_agent import TrendAnalysisAgent
+    from utils.stage_cache import StageCache
+    from utils.title_normalizer import TitleNormalizer
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 logger = logging.getLogger("MainOrchestrator")
 
+# Append-only JSON Lines histories (see utils/jsonl_store.py; use a '.gz' suffix to compress).
+# Legacy JSON array files can be migrated with:
+#   python -m utils.jsonl_store data/raw_jobs_data.json data/raw_jobs_data.jsonl
+RAW_DATA_FILE = "raw_jobs_data.jsonl"
+PROCESSED_DATA_FILE = "processed_jobs_data.jsonl"
+# Records of the latest run only (overwritten by each run): the input of the next stage
+# when the stages are run one at a time (`python main.py extract`, `analyze`)
+LAST_RAW_FILE = "last_run_raw.jsonl"
+LAST_PROCESSED_FILE = "last_run_processed.jsonl"
+# Insights of the latest analysis, read by `python main.py report`
+INSIGHTS_FILE = "insights.json"
+# Fingerprints and artifacts of the stages of the run in progress, to resume a failed run (see utils/stage_cache.py)
+STAGE_MANIFEST_FILE = "stage_manifest.json"
+# Title/skill/location counters over the whole history, updated with each run's postings
+ANALYSIS_STATE_FILE = "analysis_state.json"
+# Approximate fixed-size sketches of the same history, for `--engine sketch` (see utils/sketches.py)
+SKETCH_STATE_FILE = "sketch_state.json"
+# Exact keys and description MinHashes of every posting seen so far (see agents/dedup_agent.py)
+DEDUP_INDEX_FILE = "dedup_index.jsonl"
+# Indexed SQLite copy of the raw and processed postings for aggregate queries (see utils/job_store.py)
+JOB_STORE_FILE = "jobs.sqlite"
+# Daily/weekly title/skill/location counts for trend-over-time analysis (see utils/time_buckets.py)
+TIME_BUCKETS_FILE = "time_buckets.json"
+# Skill co-occurrence matrix and category counts over the whole history (see utils/skill_matrix.py)
+SKILL_STATS_FILE = "skill_stats.json"
+# Manual title overrides and learned title clusters, so titles are counted by role rather than by spelling
+TITLE_MAPPING_FILE = "title_mapping.json"
+DEFAULT_REPORT_PATH = os.path.join("reports", "top_ai_ml_jobs_mena_may_2025.pdf")
 
-def main():
-    logger.info("Launching Multi-Agent AI/ML Market Intelligence System for MENA...")
+# IMPORTANT: Use a LinkedIn URL that you have tested manually in a browser
+# and confirmed has job listings.
+# If you are facing "Too many requests" or 0 jobs, try these steps:
+# 1. WAIT: Give LinkedIn a few hours (or 24h) to lift any temporary IP ban.
+# 2. TEST A SIMPLER URL: Temporarily use a very broad or simple search query.
+#    e.g., "https://www.linkedin.com/jobs/search/?keywords=software"
+#    or "https://www.linkedin.com/jobs/search/?keywords=engineer"
+# 3. VERIFY HTML SELECTORS: If still no jobs after lifting the ban, you MUST
+#    manually inspect LinkedIn's HTML (using browser developer tools) and
+#    update the selectors in 'web_search_agent.py' accordingly.
+PLATFORMS = [
+    "https://www.linkedin.com/jobs/search/?keywords=machine%20learning&location=MENA"
+    # Example for a simpler test:
+    # "https://www.linkedin.com/jobs/search/?keywords=software"
+    # You can add more LinkedIn URLs or other platforms if you implement their parsing logic.
+]
+# Adjust the delay based on your observations and LinkedIn's response.
+# Higher delay reduces the chance of being blocked but makes scraping slower.
+SEARCH_DELAY = 2.5 # Slight increase for robustness
+# Stages of a run, in order (also the values of --force)
+STAGES = ("scrape", "extract", "analyze", "report")
+# Insights read from the exact counters (AnalysisState) or from the approximate sketches (SketchState)
+ENGINES = ("exact", "sketch")
 
-    # Create directories if they don't exist
-    os.makedirs("data", exist_ok=True)
-    os.makedirs("reports", exist_ok=True)
 
-    # Step 1: Web Search Agent — collect raw job data
-    logger.info("Step 1: Initializing Web Search Agent for data collection.")
-    
-    # IMPORTANT: Use a LinkedIn URL that you have tested manually in a browser
-    # and confirmed has job listings.
-    # If you are facing "Too many requests" or 0 jobs, try these steps:
-    # 1. WAIT: Give LinkedIn a few hours (or 24h) to lift any temporary IP ban.
-    # 2. TEST A SIMPLER URL: Temporarily use a very broad or simple search query.
-    #    e.g., "https://www.linkedin.com/jobs/search/?keywords=software"
-    #    or "https://www.linkedin.com/jobs/search/?keywords=engineer"
-    # 3. VERIFY HTML SELECTORS: If still no jobs after lifting the ban, you MUST
-    #    manually inspect LinkedIn's HTML (using browser developer tools) and
-    #    update the selectors in 'web_search_agent.py' accordingly.
-    
-    platforms = [
-        "https://www.linkedin.com/jobs/search/?keywords=machine%20learning&location=MENA"
-        # Example for a simpler test:
-        # "https://www.linkedin.com/jobs/search/?keywords=software"
-        # You can add more LinkedIn URLs or other platforms if you implement their parsing logic.
-    ]
-    
-    # Adjust the delay based on your observations and LinkedIn's response.
-    # Higher delay reduces the chance of being blocked but makes scraping slower.
-    search_agent = WebSearchAgent(platforms=platforms, delay=2.5) # Slight increase for robustness
-    
-    raw_data = search_agent.scrape_all()
+def configure_logging(level: int = logging.INFO):
+    """Console logging for all agents; called by the command line entry point, not on import."""
+    logging.basicConfig(level=level, format=LOG_FORMAT)
+
+
+def build_search_agent(platforms: Optional[List[str]] = None) -> "WebSearchAgent":
+    from agents.web_search_agent import WebSearchAgent
+    return WebSearchAgent(platforms=platforms or PLATFORMS, delay=SEARCH_DELAY)
+
+
+def stamp_scrape_date(posting: Dict, scraped_at: str) -> Dict:
+    """
+    Sets a freshly scraped posting's `scraped_at` (ISO date) if the scraper left it empty, so
+    every record of the raw history is dated when it is scraped rather than when it is processed.
+    """
+    if not posting.get("scraped_at"):
+        posting["scraped_at"] = scraped_at
+    return posting
+
+
+@METRICS.stage("scrape")
+def collect_raw(search_agent: "WebSearchAgent", data_dir: str = "data", max_pages: int = 0,
+                detail_agent: Optional["JobDetailAgent"] = None,
+                dedup_agent: Optional["DeduplicationAgent"] = None) -> List[Dict]:
+    """
+    Step 1: scrapes the search results, fetches each job's description and drops postings
+    that were already seen. The new raw postings are appended to the raw history, upserted
+    into the job store and written to the last-run file; the deduplication index is saved.
+    Postings seen in earlier runs are already counted in the analysis state, so the report
+    (built from that state by `analyze_new`) still covers them.
 
+    Args:
+        search_agent (WebSearchAgent): Configured scraping agent.
+        data_dir (str): Directory of the histories, the job store and the deduplication index.
+        max_pages (int): Result pages to crawl per platform URL. 0 fetches only the first page (`scrape_all`).
+        detail_agent (Optional[JobDetailAgent]): Enrichment agent; defaults to one built on `search_agent`.
+        dedup_agent (Optional[DeduplicationAgent]): Deduplication stage; defaults to one using the
+                                                    persistent index in `data_dir`.
+
+    Returns:
+        List[Dict]: This run's new raw postings.
+    """
+    from agents.dedup_agent import DeduplicationAgent
+    from agents.job_detail_agent import JobDetailAgent
+    from utils.job_store import JobStore
+    from utils.jsonl_store import JsonlWriter
+
+    raw_path = os.path.join(data_dir, RAW_DATA_FILE)
+    scraped_at = date.today().isoformat()
+    raw_data = list(search_agent.iter_jobs(max_pages=max_pages)) if max_pages else search_agent.scrape_all()
+    raw_data = [stamp_scrape_date(posting, scraped_at) for posting in raw_data]
+
+    # Step 1b: Job Detail Agent — search cards have no description, fetch it from each job page
+    if raw_data:
+        logger.info("Step 1b: Fetching job descriptions from the job detail pages.")
+        detail_agent = detail_agent or JobDetailAgent(search_agent, max_workers=4)
+        raw_data = detail_agent.enrich(raw_data)
+
+        # Step 1c: Deduplication Agent — drop re-scraped and cross-posted copies
+        logger.info("Step 1c: Dropping postings that were already seen.")
+        dedup_agent = dedup_agent or DeduplicationAgent(os.path.join(data_dir, DEDUP_INDEX_FILE))
+        raw_data = dedup_agent.filter(raw_data)
+
+    with JsonlWriter(os.path.join(data_dir, LAST_RAW_FILE), append=False) as writer:
+        writer.write_all(raw_data)
     if not raw_data:
         logger.warning("Web Search Agent returned no raw data. Subsequent steps might be affected.")
         # Optionally, you can exit here if no data is crucial for the report.
         # sys.exit("No raw data collected. Exiting.")
     else:
         # Optional: persist raw data if collected
-        with open("data/raw_jobs_data.json", "w", encoding='utf-8') as f:
-            json.dump(raw_data, f, indent=2, ensure_ascii=False)
-        logger.info("Raw job data saved to data/raw_jobs_data.json")
+        with JsonlWriter(raw_path) as writer:
+            writer.write_all(raw_data)
+        with JobStore(os.path.join(data_dir, JOB_STORE_FILE)) as store:
+            store.upsert_raw(raw_data)
+        dedup_agent.save()
+        logger.info(f"Raw job data saved to {raw_path}")
+    return raw_data
+
+
+@METRICS.stage("extract")
+def extract_structured(raw_data: List[Dict], data_dir: str = "data") -> List[Dict]:
+    """
+    Step 2: cleans the raw postings and extracts their features. The structured postings are
+    appended to the processed history, upserted into the job store and written to the
+    last-run file.
+
+    Returns:
+        List[Dict]: Structured postings.
+    """
+    from agents.data_extraction_agent import DataExtractionAgent
+    from utils.job_store import JobStore
+    from utils.jsonl_store import JsonlWriter
 
-    # Step 2: Data Extraction Agent — clean and extract features
     logger.info("Step 2: Initializing Data Extraction Agent for data processing.")
+    processed_path = os.path.join(data_dir, PROCESSED_DATA_FILE)
     extraction_agent = DataExtractionAgent()
-    
+
     structured_data = []
     if raw_data: # Only process if there's raw data
         structured_data = extraction_agent.process_batch(raw_data)
-        with open("data/processed_jobs_data.json", "w", encoding='utf-8') as f:
-            json.dump(structured_data, f, indent=2, ensure_ascii=False)
-        logger.info("Processed job data saved to data/processed_jobs_data.json")
+        with JsonlWriter(processed_path) as writer:
+            writer.write_all(structured_data)
+        with JobStore(os.path.join(data_dir, JOB_STORE_FILE)) as store:
+            store.upsert_processed(structured_data)
+        logger.info(f"Processed job data saved to {processed_path}")
     else:
         logger.info("Skipping data extraction as no raw data was collected.")
+    with JsonlWriter(os.path.join(data_dir, LAST_PROCESSED_FILE), append=False) as writer:
+        writer.write_all(structured_data)
+    return structured_data
+
+
+def load_analysis_agent(data_dir: str, title_normalizer: "TitleNormalizer",
+                        engine: str = "exact") -> "TrendAnalysisAgent":
+    """
+    Trend Analysis Agent on the maintained analysis state and sketches of `data_dir`, reading
+    its insights from the ones selected by `engine` ("exact" or "sketch").
+    """
+    from agents.trend_analysis_agent import TrendAnalysisAgent
+    from utils.analysis_state import AnalysisState
+    from utils.sketches import SketchState
+
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}'. Expected one of {ENGINES}.")
+    state = AnalysisState.load(os.path.join(data_dir, ANALYSIS_STATE_FILE))
+    sketch = SketchState.load(os.path.join(data_dir, SKETCH_STATE_FILE))
+    if engine == "sketch" and sketch.posting_count < state.posting_count:
+        logger.warning(f"The sketches cover {sketch.posting_count} of the {state.posting_count} postings in the "
+                       f"history (postings analysed before {SKETCH_STATE_FILE} existed are not in them).")
+    return TrendAnalysisAgent(state=state, sketch=sketch, engine="sketch" if engine == "sketch" else "columnar",
+                              title_normalizer=title_normalizer)
+
 
+def save_analysis_state(analysis_agent: "TrendAnalysisAgent", data_dir: str):
+    """Writes the analysis state and sketches of an agent from `load_analysis_agent`."""
+    analysis_agent.state.save(os.path.join(data_dir, ANALYSIS_STATE_FILE))
+    analysis_agent.sketch.save(os.path.join(data_dir, SKETCH_STATE_FILE))
+
+
+@METRICS.stage("analyze")
+def analyze_new(structured_data: List[Dict], data_dir: str = "data", engine: str = "exact") -> Dict:
+    """
+    Step 3: adds this run's structured postings to the maintained analysis state, sketches,
+    time buckets and skill co-occurrence counts, and reads the insights of the whole history
+    from them (nothing is recounted). A run without new postings (e.g. a daily re-scrape of
+    already-seen jobs) still reports on the history.
+
+    Args:
+        structured_data (List[Dict]): This run's structured postings.
+        data_dir (str): Directory of the maintained state files.
+        engine (str): "exact" reads the top titles/skills/locations from the analysis state,
+                      "sketch" from the approximate sketches (both are always updated).
+
+    Returns:
+        Dict: Insights from the Trend Analysis Agent (empty if there is no history).
+    """
+    from agents.data_extraction_agent import SKILL_KEYWORDS
+    from utils.skill_matrix import SkillStats
+    from utils.time_buckets import TimeBuckets
+    from utils.title_normalizer import TitleNormalizer
 
-    # Step 3: Trend Analysis Agent — analyze trends
     logger.info("Step 3: Initializing Trend Analysis Agent for insights generation.")
-    analysis_agent = TrendAnalysisAgent()
-    
-    insights = {}
-    if structured_data: # Only analyze if there's structured data
-        insights = analysis_agent.analyze(structured_data)
+    buckets_path = os.path.join(data_dir, TIME_BUCKETS_FILE)
+    skill_stats_path = os.path.join(data_dir, SKILL_STATS_FILE)
+    title_normalizer = TitleNormalizer.load(os.path.join(data_dir, TITLE_MAPPING_FILE))
+    analysis_agent = load_analysis_agent(data_dir, title_normalizer, engine)
+
+    buckets = TimeBuckets.load(buckets_path, title_transform=title_normalizer)
+    skill_stats = SkillStats.load(skill_stats_path, SKILL_KEYWORDS)
+    if structured_data: # Only update the history if there's new structured data
+        analysis_agent.update(structured_data)
+        save_analysis_state(analysis_agent, data_dir)
+        buckets.update(structured_data)
+        buckets.save(buckets_path)
+        skill_stats.update(structured_data)
+        skill_stats.save(skill_stats_path)
+        title_normalizer.save()
     else:
+        logger.info("No new structured postings; reporting on the existing history.")
+    if not analysis_agent.state.posting_count:
         logger.info("Skipping trend analysis as no structured data was available.")
+        return {}
+    insights = analysis_agent.insights()
+    insights["trends"] = analysis_agent.trend_insights(buckets)
+    insights["skill_associations"] = analysis_agent.skill_associations(skill_stats)
+    return insights
+
+
+@METRICS.stage("analyze")
+def analyze_history(data_dir: str = "data", engine: str = "exact", **filters) -> Dict:
+    """
+    Insights of the whole processed history, read from the maintained analysis state (or
+    sketches), time buckets and skill co-occurrence counts. Read-only: none of them is updated. With filters,
+    the top titles, skills and locations are instead queried from the job store over the
+    matching postings only (the trend insights and skill associations still cover the whole
+    history).
+
+    Args:
+        data_dir (str): Directory of the analysis state, time buckets, title mapping and job store.
+        engine (str): Without filters, read the insights from the exact analysis state ("exact")
+                      or from the approximate sketches ("sketch"). Filtered queries are exact.
+        **filters: JobStore filters (see `TrendAnalysisAgent.insights_from_store`), e.g.
+                   location_like="Riyadh" or since="2025-01-01". None values are ignored.
+
+    Returns:
+        Dict: Insights from the Trend Analysis Agent (empty if there is no history).
+    """
+    from agents.data_extraction_agent import SKILL_KEYWORDS
+    from agents.trend_analysis_agent import TrendAnalysisAgent
+    from utils.job_store import JobStore
+    from utils.skill_matrix import SkillStats
+    from utils.time_buckets import TimeBuckets
+    from utils.title_normalizer import TitleNormalizer
+
+    title_normalizer = TitleNormalizer.load(os.path.join(data_dir, TITLE_MAPPING_FILE))
+    filters = {name: value for name, value in filters.items() if value is not None}
+    if filters:
+        store_path = os.path.join(data_dir, JOB_STORE_FILE)
+        if not os.path.exists(store_path):
+            logger.error(f"No job store at {store_path}. Run `python main.py extract` first.")
+            return {}
+        analysis_agent = TrendAnalysisAgent(title_normalizer=title_normalizer)
+        with JobStore(store_path) as store:
+            if not store.posting_count(**filters):
+                logger.error(f"No processed postings match {filters}.")
+                return {}
+            insights = analysis_agent.insights_from_store(store, **filters)
+    else:
+        analysis_agent = load_analysis_agent(data_dir, title_normalizer, engine)
+        if not analysis_agent.state.posting_count:
+            logger.error(f"No analysis state in {data_dir}. Run `python main.py analyze` first.")
+            return {}
+        insights = analysis_agent.insights()
+    buckets = TimeBuckets.load(os.path.join(data_dir, TIME_BUCKETS_FILE), title_transform=title_normalizer)
+    insights["trends"] = analysis_agent.trend_insights(buckets)
+    skill_stats = SkillStats.load(os.path.join(data_dir, SKILL_STATS_FILE), SKILL_KEYWORDS)
+    insights["skill_associations"] = analysis_agent.skill_associations(skill_stats)
+    return insights
+
+
+def run_batch_pipeline(search_agent: "WebSearchAgent", data_dir: str = "data", max_pages: int = 0,
+                       detail_agent: Optional["JobDetailAgent"] = None,
+                       dedup_agent: Optional["DeduplicationAgent"] = None) -> Dict:
+    """
+    Runs steps 1-3 one after another; each stage holds its full output in memory.
+
+    Args:
+        search_agent (WebSearchAgent): Configured scraping agent.
+        data_dir (str): Directory of the raw and processed JSON Lines files and of the job store;
+                        this run's records are appended/upserted.
+        max_pages (int): Result pages to crawl per platform URL. 0 fetches only the first page (`scrape_all`).
+        detail_agent (Optional[JobDetailAgent]): Enrichment agent; defaults to one built on `search_agent`.
+        dedup_agent (Optional[DeduplicationAgent]): Deduplication stage; defaults to one using the
+                                                    persistent index in `data_dir`.
+
+    Returns:
+        Dict: Insights from the Trend Analysis Agent (empty if there is no history).
+    """
+    raw_data = collect_raw(search_agent, data_dir, max_pages, detail_agent, dedup_agent)
+    structured_data = extract_structured(raw_data, data_dir)
+    return analyze_new(structured_data, data_dir)
+
+
+@METRICS.stage("pipeline")
+def run_streaming_pipeline(search_agent: "WebSearchAgent", data_dir: str = "data",
+                           max_pages: int = 10, queue_size: int = 100,
+                           detail_agent: Optional["JobDetailAgent"] = None,
+                           dedup_agent: Optional["DeduplicationAgent"] = None, engine: str = "exact") -> Dict:
+    """
+    Runs steps 1-3 as overlapping stages connected by bounded queues:
+
+        scrape + fetch details + dedup (thread) -> queue -> extraction (thread) -> queue -> analysis
+
+    Postings flow through as soon as their results page is scraped, raw and processed
+    records are written to disk as they pass, and the analysis only keeps counters.
+    Peak memory is therefore bounded by `queue_size`, not by the number of postings.
+
+    Args:
+        search_agent (WebSearchAgent): Configured scraping agent.
+        data_dir (str): Directory of the raw and processed JSON Lines files and of the job store;
+                        this run's records are appended/upserted.
+        max_pages (int): Result pages to crawl per platform URL.
+        queue_size (int): Maximum number of postings buffered between two stages.
+        detail_agent (Optional[JobDetailAgent]): Enrichment agent; defaults to one built on `search_agent`.
+        dedup_agent (Optional[DeduplicationAgent]): Deduplication stage; defaults to one using the
+                                                    persistent index in `data_dir`.
+        engine (str): Insights from the exact analysis state or the sketches (see `analyze_new`).
+
+    Returns:
+        Dict: Insights from the Trend Analysis Agent (empty if there is no history).
+    """
+    from agents.data_extraction_agent import SKILL_KEYWORDS, DataExtractionAgent
+    from agents.dedup_agent import DeduplicationAgent
+    from agents.job_detail_agent import JobDetailAgent
+    from utils.job_store import JobStore
+    from utils.jsonl_store import JsonlWriter
+    from utils.skill_matrix import SkillStats
+    from utils.streaming import tap, threaded
+    from utils.time_buckets import TimeBuckets
+    from utils.title_normalizer import TitleNormalizer
+
+    raw_path = os.path.join(data_dir, RAW_DATA_FILE)
+    processed_path = os.path.join(data_dir, PROCESSED_DATA_FILE)
+    buckets_path = os.path.join(data_dir, TIME_BUCKETS_FILE)
+    skill_stats_path = os.path.join(data_dir, SKILL_STATS_FILE)
+
+    logger.info("Steps 1-3: Streaming scraping, extraction and analysis.")
+    detail_agent = detail_agent or JobDetailAgent(search_agent, max_workers=4)
+    dedup_agent = dedup_agent or DeduplicationAgent(os.path.join(data_dir, DEDUP_INDEX_FILE))
+    extraction_agent = DataExtractionAgent()
+    title_normalizer = TitleNormalizer.load(os.path.join(data_dir, TITLE_MAPPING_FILE))
+    analysis_agent = load_analysis_agent(data_dir, title_normalizer, engine)
+    buckets = TimeBuckets.load(buckets_path, title_transform=title_normalizer)
+    skill_stats = SkillStats.load(skill_stats_path, SKILL_KEYWORDS)
+
+    with JsonlWriter(raw_path) as raw_writer, JsonlWriter(processed_path) as processed_writer, \
+            JsonlWriter(os.path.join(data_dir, LAST_RAW_FILE), append=False) as last_raw_writer, \
+            JsonlWriter(os.path.join(data_dir, LAST_PROCESSED_FILE), append=False) as last_processed_writer, \
+            JobStore(os.path.join(data_dir, JOB_STORE_FILE)) as store, \
+            store.batch_writer(processed=False) as raw_store, store.batch_writer() as processed_store:
+        raw_stream = detail_agent.iter_enriched(search_agent.iter_pages(max_pages=max_pages))
+        raw_stream = dedup_agent.iter_unique(raw_stream)
+        raw_stream = tap(raw_stream, partial(stamp_scrape_date, scraped_at=date.today().isoformat()))
+        raw_stream = tap(threaded(raw_stream, maxsize=queue_size, name="scrape-stage"), raw_writer.write)
+        raw_stream = tap(raw_stream, last_raw_writer.write)
+        raw_stream = tap(raw_stream, raw_store.write)
+        structured_stream = threaded(extraction_agent.iter_clean(raw_stream), maxsize=queue_size,
+                                     name="extraction-stage")
+        structured_stream = tap(structured_stream, processed_writer.write)
+        structured_stream = tap(structured_stream, last_processed_writer.write)
+        structured_stream = tap(structured_stream, processed_store.write)
+        structured_stream = tap(structured_stream, buckets.add)
+        structured_stream = tap(structured_stream, skill_stats.add)
+        analysis_agent.analyze_stream(structured_stream)
+
+    logger.info(f"Raw job data saved to {raw_path} ({raw_writer.count} records)")
+    logger.info(f"Processed job data saved to {processed_path} ({processed_writer.count} records)")
+    if processed_writer.count:
+        save_analysis_state(analysis_agent, data_dir)
+        buckets.save(buckets_path)
+        skill_stats.save(skill_stats_path)
+        title_normalizer.save()
+        dedup_agent.save()
+    else:
+        logger.warning("No new structured postings; reporting on the existing history.")
+    if not analysis_agent.state.posting_count:
+        return {}
+    insights = analysis_agent.insights()
+    insights["trends"] = analysis_agent.trend_insights(buckets)
+    insights["skill_associations"] = analysis_agent.skill_associations(skill_stats)
+    return insights
+
+
+def save_insights(insights: Dict, path: str):
+    """Writes insights to a JSON file (atomically, via a temporary file), for `report` runs."""
+    output_dir = os.path.dirname(path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(insights, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+    logger.info(f"Insights saved to {path}")
+
+
+def load_insights(path: str) -> Dict:
+    """Reads insights saved by `save_insights` ({} if the file does not exist)."""
+    if not os.path.exists(path):
+        logger.error(f"No insights at {path}. Run `python main.py analyze` first.")
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def has_report_insights(insights: Dict) -> bool:
+    """True if the insights have every section the PDF report needs."""
+    return bool(insights and insights.get("summary") and insights.get("top_titles") and insights.get("top_skills")
+                and insights.get("location_distribution"))
 
-    # Step 4: Report Writer Agent — generate PDF report
+
+@METRICS.stage("report")
+def write_report(insights: Dict, report_path: str = DEFAULT_REPORT_PATH) -> bool:
+    """
+    Step 4: Report Writer Agent — generates the PDF report if the insights are complete.
+
+    Returns:
+        bool: True if the report was written.
+    """
     logger.info("Step 4: Initializing Report Writer Agent for PDF report generation.")
-    report_agent = ReportWriterAgent()
 
     # Check if essential insights are available before trying to generate report
-    if insights and insights.get("summary") and insights.get("top_titles") and insights.get("top_skills") and insights.get("location_distribution"):
+    if has_report_insights(insights):
         try:
+            from agents.report_writer_agent import ReportWriterAgent
+            report_agent = ReportWriterAgent(report_path)
             report_agent.generate_report(insights)
             logger.info("Report generation complete. Check the 'reports' folder.")
+            return True
         except Exception as e:
             logger.error(f"Error during report generation: {e}")
             logger.error("Report generation skipped due to errors or missing FPDF/Matplotlib setup.")
     else:
         logger.error("Cannot generate report due to missing or insufficient insights from trend analysis.")
         logger.error("Report generation skipped. Ensure data was collected and processed successfully.")
+    return False
+
+
+@METRICS.stage("segment_reports")
+def write_segment_reports(data_dir: str = "data", output_dir: str = os.path.join("reports", "segments"),
+                          min_postings: int = 5) -> Dict[str, str]:
+    """
+    Step 4b: one PDF per country and per role family, from the whole processed history.
+    All segments are analysed in one pass over the postings and the reports share their
+    rendered charts (see `ReportWriterAgent.generate_segment_reports`).
+
+    Args:
+        data_dir (str): Directory of the processed JSON Lines history and of the title mapping.
+        output_dir (str): Directory of the segment reports.
+        min_postings (int): Segments with fewer postings get no report.
+
+    Returns:
+        Dict[str, str]: Segment slug -> report path.
+    """
+    from agents.report_writer_agent import ReportWriterAgent
+    from agents.trend_analysis_agent import TrendAnalysisAgent
+    from utils.jsonl_store import iter_jsonl
+    from utils.title_normalizer import TitleNormalizer
+
+    processed_path = os.path.join(data_dir, PROCESSED_DATA_FILE)
+    if not os.path.exists(processed_path):
+        logger.error(f"No processed postings at {processed_path}. Segment reports skipped.")
+        return {}
+    logger.info("Step 4b: Building per-country and per-role-family segment reports.")
+    title_normalizer = TitleNormalizer.load(os.path.join(data_dir, TITLE_MAPPING_FILE))
+    analysis_agent = TrendAnalysisAgent(title_normalizer=title_normalizer)
+    segment_insights = analysis_agent.segment_insights(iter_jsonl(processed_path), min_postings=min_postings)
+    report_agent = ReportWriterAgent()
+    return report_agent.generate_segment_reports(segment_insights, output_dir)
+
+
+def run_resumable_pipeline(cache: "StageCache", data_dir: str = "data", mode: str = "batch",
+                           max_pages: int = 0, engine: str = "exact") -> Dict:
+    """
+    Runs steps 1-3 like `run_batch_pipeline` / `run_streaming_pipeline`, but skips each stage
+    whose fingerprint matches the one recorded in `cache` by an unfinished earlier run, and
+    loads that stage's artifact (last-run raw/processed postings, insights) instead.
+
+    Fingerprints cover the stage's input artifact and its configuration:
+        scrape:  platform URLs, result pages per URL
+        extract: raw postings, required fields, skill keywords
+        analyze: structured postings, skill keywords, engine
+
+    Extract appends to the processed history and analyze updates the analysis state,
+    sketches, time buckets and skill co-occurrence counts; both are journaled per scraped
+    batch (`StageCache.protect`), so re-running them on the same batch (forced, or after a
+    crash) replaces their earlier contribution.
+
+    Returns:
+        Dict: Insights from the Trend Analysis Agent (empty if there is no history).
+    """
+    from agents.data_extraction_agent import REQUIRED_FIELDS, SKILL_KEYWORDS
+    from utils.jsonl_store import iter_jsonl
+    from utils.stage_cache import fingerprint
+
+    raw_path = os.path.join(data_dir, LAST_RAW_FILE)
+    processed_path = os.path.join(data_dir, LAST_PROCESSED_FILE)
+    insights_path = os.path.join(data_dir, INSIGHTS_FILE)
+    if mode == "stream":
+        max_pages = max_pages or 10
+
+    def extract_fingerprint():
+        return fingerprint("extract", cache.artifact_digest("scrape"), REQUIRED_FIELDS, SKILL_KEYWORDS)
+
+    def analyze_fingerprint():
+        return fingerprint("analyze", cache.artifact_digest("extract"), SKILL_KEYWORDS, engine)
+
+    # Step 1: Web Search Agent — collect raw job data
+    scrape_fingerprint = fingerprint("scrape", PLATFORMS, max_pages)
+    if cache.hit("scrape", scrape_fingerprint):
+        raw_data = list(iter_jsonl(raw_path))
+    elif mode == "stream":
+        logger.info("Step 1: Initializing Web Search Agent for data collection.")
+        insights = run_streaming_pipeline(build_search_agent(), data_dir=data_dir, max_pages=max_pages, engine=engine)
+        if insights:
+            save_insights(insights, insights_path)
+            cache.record("scrape", scrape_fingerprint, raw_path)
+            cache.record("extract", extract_fingerprint(), processed_path)
+            cache.record("analyze", analyze_fingerprint(), insights_path)
+        return insights
+    else:
+        logger.info("Step 1: Initializing Web Search Agent for data collection.")
+        raw_data = collect_raw(build_search_agent(), data_dir, max_pages)
+        if raw_data:
+            cache.record("scrape", scrape_fingerprint, raw_path)
+
+    # Postings of this run's scrape: the unit journaled by the stages that add to the histories/state
+    batch = cache.artifact_digest("scrape")
+
+    # Step 2: Data Extraction Agent
+    if cache.hit("extract", extract_fingerprint()):
+        structured_data = list(iter_jsonl(processed_path))
+    else:
+        cache.protect("extract", batch, appended=[os.path.join(data_dir, PROCESSED_DATA_FILE)])
+        structured_data = extract_structured(raw_data, data_dir)
+        if structured_data:
+            cache.record("extract", extract_fingerprint(), processed_path)
+
+    # Step 3: Trend Analysis Agent
+    if cache.hit("analyze", analyze_fingerprint()):
+        return load_insights(insights_path)
+    cache.protect("analyze", batch, replaced=[os.path.join(data_dir, ANALYSIS_STATE_FILE),
+                                              os.path.join(data_dir, SKETCH_STATE_FILE),
+                                              os.path.join(data_dir, TIME_BUCKETS_FILE),
+                                              os.path.join(data_dir, SKILL_STATS_FILE)])
+    insights = analyze_new(structured_data, data_dir, engine)
+    if insights:
+        save_insights(insights, insights_path)
+        cache.record("analyze", analyze_fingerprint(), insights_path)
+    return insights
+
+
+def main(mode: str = "batch", max_pages: int = 0, segment_reports: bool = False, data_dir: str = "data",
+         force: Iterable[str] = (), resume: bool = True, engine: str = "exact"):
+    """
+    Args:
+        mode (str): "batch" runs the stages one after another, "stream" overlaps them
+                    (see `run_streaming_pipeline`).
+        max_pages (int): Result pages to crawl per search URL (0: first page only in batch
+                         mode, 10 in stream mode).
+        segment_reports (bool): Also build one report per country and role family (`write_segment_reports`).
+        data_dir (str): Directory of the histories, stores and stage outputs.
+        force (Iterable[str]): Stages ("scrape", "extract", "analyze", "report") to re-run even
+                               if an unfinished earlier run already completed them.
+        resume (bool): Reuse the stages completed by an unfinished earlier run (see `run_resumable_pipeline`).
+        engine (str): "exact" or "sketch" insights (see `analyze_new`).
+    """
+    from utils.stage_cache import StageCache, fingerprint
+
+    logger.info("Launching Multi-Agent AI/ML Market Intelligence System for MENA...")
+
+    # Create directories if they don't exist
+    os.makedirs(data_dir, exist_ok=True)
+    os.makedirs("reports", exist_ok=True)
+
+    manifest_path = os.path.join(data_dir, STAGE_MANIFEST_FILE)
+    cache = StageCache.load(manifest_path) if resume else StageCache(manifest_path)
+    cache.start_run(force)
+    insights = run_resumable_pipeline(cache, data_dir=data_dir, mode=mode, max_pages=max_pages, engine=engine)
+
+    # Step 4: Report Writer Agent; the run is complete once the report is written, or
+    # if there is nothing to report (re-running the same stages would not change that)
+    report_fingerprint = fingerprint("report", cache.artifact_digest("analyze"), DEFAULT_REPORT_PATH)
+    if cache.hit("report", report_fingerprint) or write_report(insights):
+        cache.record("report", report_fingerprint, DEFAULT_REPORT_PATH)
+        cache.finish_run()
+    elif not has_report_insights(insights):
+        cache.finish_run()
+    else:
+        logger.warning(f"Run not complete; the next run resumes from the stages recorded in {manifest_path}.")
+    if segment_reports:
+        write_segment_reports(data_dir)
+
+
+def _shared_options(subcommand: bool = False) -> Tuple[argparse.ArgumentParser, argparse.ArgumentParser]:
+    """
+    Parent parsers of the pipeline options and of the options common to every command.
+    The options are accepted both before and after the command; the copies attached to the
+    subcommands (`subcommand=True`) have no defaults, so they only override what was given
+    before the command ("--data-dir x scrape") instead of resetting it.
+    """
+    def default(value):
+        return argparse.SUPPRESS if subcommand else value
+
+    run_options = argparse.ArgumentParser(add_help=False)
+    run_options.add_argument("--mode", choices=["batch", "stream"], default=default("batch"),
+                             help="Run the stages one after another (batch) or overlapped through bounded queues (stream).")
+    run_options.add_argument("--max-pages", type=int, default=default(0), help="Result pages to crawl per search URL.")
+    run_options.add_argument("--segment-reports", action="store_true", default=default(False),
+                             help="Also build one PDF per country and per role family in reports/segments/.")
+    run_options.add_argument("--force", action="append", default=default([]), choices=STAGES, metavar="STAGE",
+                             help=f"Re-run this stage ({', '.join(STAGES)}) even if an unfinished earlier run "
+                                  f"completed it (repeatable). Re-running extract or analyze first rolls back "
+                                  f"what they added to the history/state, so postings are counted once.")
+    run_options.add_argument("--engine", choices=ENGINES, default=default("exact"),
+                             help="Read the insights from the exact counters or from fixed-size approximate sketches.")
+    run_options.add_argument("--no-resume", dest="resume", action="store_false", default=default(True),
+                             help=f"Ignore <data-dir>/{STAGE_MANIFEST_FILE} and run every stage.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--data-dir", default=default("data"),
+                        help="Directory of the histories, stores and stage outputs.")
+    common.add_argument("--metrics-dir", default=default(None),
+                        help="Record per-stage timings, counters and peak memory, and write them "
+                             "to this directory (run-<time>.json and market_intel.prom).")
+    common.add_argument("--trace-memory", action="store_true", default=default(False),
+                        help="With --metrics-dir, also record each stage's peak memory (tracemalloc; slower).")
+    return run_options, common
+
+
+def build_parser() -> argparse.ArgumentParser:
+    run_options, common = _shared_options()
+    sub_run_options, sub_common = _shared_options(subcommand=True)
+
+    parser = argparse.ArgumentParser(description="Multi-Agent AI/ML Market Intelligence System for MENA. "
+                                                 "Without a command, runs the whole pipeline (like `run`).",
+                                     parents=[run_options, common])
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.add_parser("run", parents=[sub_run_options, sub_common], help="Scrape, extract, analyze and report (default).")
+    scrape_parser = commands.add_parser("scrape", parents=[sub_common],
+                                        help=f"Step 1 only: new raw postings -> <data-dir>/{LAST_RAW_FILE}.")
+    scrape_parser.add_argument("--max-pages", type=int, default=argparse.SUPPRESS,
+                               help="Result pages to crawl per search URL.")
+    extract_parser = commands.add_parser("extract", parents=[sub_common],
+                                         help=f"Step 2 only: {LAST_RAW_FILE} -> <data-dir>/{LAST_PROCESSED_FILE}.")
+    extract_parser.add_argument("--input", help=f"Raw JSON Lines file to process (default: <data-dir>/{LAST_RAW_FILE}).")
+    analyze_parser = commands.add_parser("analyze", parents=[sub_common],
+                                         help=f"Step 3 only: {LAST_PROCESSED_FILE} -> <data-dir>/{INSIGHTS_FILE}.")
+    analyze_parser.add_argument("--engine", choices=ENGINES, default=argparse.SUPPRESS,
+                                help="Read the insights from the exact counters or from fixed-size approximate sketches.")
+    analyze_parser.add_argument("--history", action="store_true",
+                                help="Read the insights of the history without adding the last run (read-only).")
+    analyze_parser.add_argument("--title", dest="title_like", help="With --history: only titles containing this text.")
+    analyze_parser.add_argument("--location", dest="location_like",
+                                help="With --history: only locations containing this text.")
+    analyze_parser.add_argument("--skill", help="With --history: only postings requiring this skill.")
+    analyze_parser.add_argument("--since", help="With --history: only postings scraped on or after this date.")
+    analyze_parser.add_argument("--until", help="With --history: only postings scraped on or before this date.")
+    report_parser = commands.add_parser("report", parents=[sub_common], help=f"Step 4 only: {INSIGHTS_FILE} -> PDF.")
+    report_parser.add_argument("--insights", help=f"Insights JSON file (default: <data-dir>/{INSIGHTS_FILE}).")
+    report_parser.add_argument("--output", default=DEFAULT_REPORT_PATH, help="Output PDF path.")
+    report_parser.add_argument("--segments", action="store_true",
+                               help="Also build one PDF per country and per role family in reports/segments/.")
+    return parser
+
+
+def cli(argv: Optional[List[str]] = None):
+    args = build_parser().parse_args(argv)
+    configure_logging()
+    if args.metrics_dir:
+        METRICS.enable(track_memory=args.trace_memory)
+    try:
+        run_command(args)
+    finally:
+        if args.metrics_dir:
+            METRICS.export(args.metrics_dir)
+
+
+def run_command(args: argparse.Namespace):
+    """Runs the pipeline or the single stage selected by the parsed command line."""
+    data_dir = args.data_dir
+    if args.command in (None, "run"):
+        main(mode=args.mode, max_pages=args.max_pages, segment_reports=args.segment_reports, data_dir=data_dir,
+             force=args.force, resume=args.resume, engine=args.engine)
+        return
+
+    os.makedirs(data_dir, exist_ok=True)
+    if args.command == "scrape":
+        raw_data = collect_raw(build_search_agent(), data_dir, args.max_pages)
+        logger.info(f"Scraped {len(raw_data)} new postings.")
+    elif args.command == "extract":
+        from utils.jsonl_store import iter_jsonl
+        input_path = args.input or os.path.join(data_dir, LAST_RAW_FILE)
+        raw_data = list(iter_jsonl(input_path)) if os.path.exists(input_path) else []
+        structured_data = extract_structured(raw_data, data_dir)
+        logger.info(f"Extracted {len(structured_data)} structured postings from {input_path}.")
+    elif args.command == "analyze":
+        if args.history:
+            insights = analyze_history(data_dir, args.engine, title_like=args.title_like, location_like=args.location_like,
+                                       skill=args.skill, since=args.since, until=args.until)
+        else:
+            from utils.jsonl_store import iter_jsonl
+            input_path = os.path.join(data_dir, LAST_PROCESSED_FILE)
+            insights = analyze_new(list(iter_jsonl(input_path)) if os.path.exists(input_path) else [], data_dir,
+                                   args.engine)
+        if insights:
+            save_insights(insights, os.path.join(data_dir, INSIGHTS_FILE))
+    elif args.command == "report":
+        write_report(load_insights(args.insights or os.path.join(data_dir, INSIGHTS_FILE)), args.output)
+        if args.segments:
+            write_segment_reports(data_dir)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    cli()
@@ -0,0 +1,51 @@
+"""
+render_charts caches a chart only when its renderer actually wrote it: neither a stale PNG
+left at the output path nor a failed save may end up in the chart cache.
+"""
+import logging
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.visualizations import ChartCache, ChartJob, chart_key, render_charts
+
+
+class RenderChartsCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        logging.getLogger("Visualizations").setLevel(logging.CRITICAL)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = ChartCache(os.path.join(self.tmp.name, "cache"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_empty_data_does_not_cache_stale_chart(self):
+        filename = os.path.join(self.tmp.name, "top_titles.png")
+        with open(filename, "wb") as f:
+            f.write(b"stale chart from an earlier run")
+        job = ChartJob("bar", {"data": [], "title": "Top Titles", "filename": filename})
+        stats = render_charts([job], self.cache, max_workers=1)
+        self.assertEqual(stats["rendered"], 0)
+        self.assertFalse(os.path.exists(filename))
+        self.assertNotIn(chart_key(job), self.cache.render_seconds)
+
+    def test_failed_save_is_not_cached(self):
+        # The output path is a directory, so saving the PNG fails
+        job = ChartJob("bar", {"data": [("Python", 3)], "title": "Top Skills", "filename": self.tmp.name})
+        stats = render_charts([job], self.cache, max_workers=1)
+        self.assertEqual(stats["rendered"], 0)
+        self.assertNotIn(chart_key(job), self.cache.render_seconds)
+
+    def test_rendered_chart_is_cached(self):
+        job = ChartJob("bar", {"data": [("Python", 3)], "title": "Top Skills",
+                               "filename": os.path.join(self.tmp.name, "top_skills.png")})
+        self.assertEqual(render_charts([job], self.cache, max_workers=1)["rendered"], 1)
+        self.assertEqual(render_charts([job], self.cache, max_workers=1)["cached"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
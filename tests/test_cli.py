@@ -0,0 +1,42 @@
+"""
+Options shared by the top-level parser and the subcommands may be given before or after the
+command; the subcommand's copy must not reset what was given before it.
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from main import build_parser
+
+
+class SharedOptionsTest(unittest.TestCase):
+
+    def parse(self, *argv):
+        return build_parser().parse_args(list(argv))
+
+    def test_defaults(self):
+        for argv in ([], ["run"], ["scrape"]):
+            with self.subTest(argv=argv):
+                args = self.parse(*argv)
+                self.assertEqual((args.data_dir, args.mode, args.max_pages, args.force, args.resume, args.engine),
+                                 ("data", "batch", 0, [], True, "exact"))
+
+    def test_options_before_the_command(self):
+        self.assertEqual(self.parse("--data-dir", "x", "scrape").data_dir, "x")
+        self.assertEqual(self.parse("--mode", "stream", "run").mode, "stream")
+        self.assertEqual(self.parse("--max-pages", "3", "run").max_pages, 3)
+        self.assertEqual(self.parse("--max-pages", "3", "scrape").max_pages, 3)
+        self.assertEqual(self.parse("--metrics-dir", "m", "report").metrics_dir, "m")
+        self.assertEqual(self.parse("--engine", "sketch", "analyze").engine, "sketch")
+
+    def test_options_after_the_command(self):
+        args = self.parse("--data-dir", "x", "run", "--data-dir", "y", "--force", "scrape", "--no-resume")
+        self.assertEqual((args.data_dir, args.force, args.resume), ("y", ["scrape"], False))
+        self.assertEqual(self.parse("run", "--engine", "sketch").engine, "sketch")
+        self.assertEqual(self.parse("analyze", "--history", "--engine", "sketch").engine, "sketch")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+Location resolution against the offline MENA gazetteer, including city names that are
+ambiguous across countries or that prefix other places.
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.gazetteer import Place, resolve_location
+
+DUBAI = Place("Dubai", "United Arab Emirates", "GCC")
+CAIRO = Place("Cairo", "Egypt", "North Africa")
+
+CASES = {
+    "Dubai, United Arab Emirates": DUBAI,
+    "Dubai, UAE": DUBAI,
+    "دبي": DUBAI,
+    "Dubai Silicon Oasis": DUBAI,
+    "Sheikh Zayed Road, Dubai": DUBAI,
+    "Riyadh Province": Place("Riyadh", "Saudi Arabia", "GCC"),
+    "Al Riyadh": Place("Riyadh", "Saudi Arabia", "GCC"),
+    "Jeddah, Makkah Province, Saudi Arabia": Place("Jeddah", "Saudi Arabia", "GCC"),
+    "Greater Cairo": CAIRO,
+    "Ain Shams, Cairo": CAIRO,
+    "Al Ain": Place("Al Ain", "United Arab Emirates", "GCC"),
+    "Tripoli": Place("Tripoli", "Libya", "North Africa"),
+    "Tripoli, Lebanon": Place("Tripoli", "Lebanon", "Levant"),
+    "Dubai, Saudi Arabia": Place(None, "Saudi Arabia", "GCC"),
+    "Middle East": Place(None, None, "MENA"),
+    "Alexandria, Virginia, United States": None,
+    "Bengaluru, Karnataka, India": None,
+    "Ain Shams": None,
+    "EMEA": None,
+    "Remote": None,
+    "": None,
+}
+
+
+class ResolveLocationTest(unittest.TestCase):
+
+    def test_cases(self):
+        for location, expected in CASES.items():
+            with self.subTest(location=location):
+                self.assertEqual(resolve_location(location), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
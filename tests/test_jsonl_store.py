@@ -0,0 +1,70 @@
+"""
+iter_json_array must decode the same elements as json.load whatever the chunk size, including
+numbers and whitespace that straddle a chunk boundary, in time linear in the file size.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.jsonl_store import iter_json_array
+
+RECORDS = [{"title": "Data Scientist", "score": 2.5, "skills": ["python", "sql"]}, 12345.678, -0.5e-3, "text",
+           True, None, [1, 2.25, 3]]
+
+
+class IterJsonArrayTest(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".json")
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def write(self, text):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def test_chunk_boundaries(self):
+        for indent in (None, 2):
+            self.write(json.dumps(RECORDS, indent=indent))
+            for chunk_size in (1, 2, 3, 5, 8, 4096):
+                with self.subTest(indent=indent, chunk_size=chunk_size):
+                    self.assertEqual(list(iter_json_array(self.path, chunk_size=chunk_size)), RECORDS)
+
+    def test_leading_whitespace_longer_than_a_chunk(self):
+        self.write(" " * 100 + "\n" + json.dumps(RECORDS))
+        self.assertEqual(list(iter_json_array(self.path, chunk_size=16)), RECORDS)
+
+    def test_multi_megabyte_array_default_chunk_size(self):
+        records = [{"title": f"Data Scientist {i}", "description": "Build ML models. " * 20, "score": i / 4}
+                   for i in range(20000)]
+        self.write(json.dumps(records, indent=1))
+        self.assertGreater(os.path.getsize(self.path), 5 * 1024 * 1024)
+        start = time.perf_counter()
+        with open(self.path, "r", encoding="utf-8") as f:
+            json.load(f)
+        load_time = time.perf_counter() - start
+        start = time.perf_counter()
+        self.assertEqual(list(iter_json_array(self.path)), records)
+        # Copying the buffer per record made this ~100x slower than json.load
+        self.assertLess(time.perf_counter() - start, 20 * load_time + 1.0)
+
+    def test_missing_delimiter_raises(self):
+        self.write("[1, 2 3]")
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_array(self.path, chunk_size=2))
+
+    def test_not_an_array(self):
+        self.write('{"a": 1}')
+        with self.assertRaises(ValueError):
+            list(iter_json_array(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
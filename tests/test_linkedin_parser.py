@@ -0,0 +1,50 @@
+"""
+Parity of the LinkedIn parser engines: 'strainer' and 'lxml' must return exactly the records
+of the reference 'bs4' engine on every saved page in benchmarks/fixtures/.
+"""
+import glob
+import logging
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.web_search_agent import WebSearchAgent, lxml_html
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), '..', 'benchmarks', 'fixtures')
+
+
+class LinkedInParserParityTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        logging.getLogger("WebSearchAgent").setLevel(logging.CRITICAL)
+        cls.fixtures = sorted(glob.glob(os.path.join(FIXTURES_DIR, "linkedin_*.html")))
+        cls.reference = WebSearchAgent([], parser_engine='bs4')
+
+    def assert_parity(self, engine):
+        agent = WebSearchAgent([], parser_engine=engine)
+        self.assertTrue(self.fixtures, "No LinkedIn fixtures found.")
+        for path in self.fixtures:
+            with self.subTest(fixture=os.path.basename(path)):
+                with open(path, "r", encoding="utf-8") as f:
+                    html = f.read()
+                self.assertEqual(agent.parse_linkedin_jobs(html), self.reference.parse_linkedin_jobs(html))
+
+    def test_strainer_matches_bs4(self):
+        self.assert_parity('strainer')
+
+    @unittest.skipIf(lxml_html is None, "lxml is not installed")
+    def test_lxml_matches_bs4(self):
+        self.assert_parity('lxml')
+
+    def test_fixtures_have_records(self):
+        with open(os.path.join(FIXTURES_DIR, "linkedin_results_25.html"), "r", encoding="utf-8") as f:
+            records = self.reference.parse_linkedin_jobs(f.read())
+        self.assertEqual(len(records), 25)
+        self.assertTrue(all(record['job_id'] for record in records))
+
+
+if __name__ == "__main__":
+    unittest.main()
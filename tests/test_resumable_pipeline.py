@@ -0,0 +1,101 @@
+"""
+Forcing (or, after a crash, repeating) the extract and analyze stages of an unfinished run
+must not count that run's postings twice in the processed history, the analysis state, the
+sketches, the time buckets or the skill co-occurrence counts.
+"""
+import logging
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import main as pipeline
+from utils.analysis_state import AnalysisState
+from agents.data_extraction_agent import SKILL_KEYWORDS
+from utils.jsonl_store import JsonlWriter, iter_jsonl
+from utils.sketches import SketchState
+from utils.skill_matrix import SkillStats
+from utils.stage_cache import StageCache, fingerprint
+from utils.time_buckets import TimeBuckets
+
+RAW_POSTINGS = [
+    {"title": "Machine Learning Engineer", "company": "Careem", "location": "Dubai, United Arab Emirates",
+     "description": "Python, PyTorch and MLOps on AWS.", "scraped_at": "2025-05-12", "job_id": "1"},
+    {"title": "Data Scientist", "company": "Noon", "location": "Riyadh, Saudi Arabia",
+     "description": "SQL, Python and machine learning.", "scraped_at": "2025-05-12", "job_id": "2"},
+    {"title": "NLP Engineer", "company": "Talabat", "location": "Cairo, Egypt",
+     "description": "NLP with transformers and Python.", "scraped_at": "2025-05-13", "job_id": "3"},
+]
+
+
+def no_scraping(*args, **kwargs):
+    raise AssertionError("The scrape stage was recorded and must not run again.")
+
+
+class ForcedStagesTest(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.WARNING)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_dir = self.tmp.name
+        self.build_search_agent, pipeline.build_search_agent = pipeline.build_search_agent, no_scraping
+        # An unfinished run whose scrape stage completed
+        raw_path = os.path.join(self.data_dir, pipeline.LAST_RAW_FILE)
+        with JsonlWriter(raw_path, append=False) as writer:
+            writer.write_all(RAW_POSTINGS)
+        self.cache = StageCache(os.path.join(self.data_dir, pipeline.STAGE_MANIFEST_FILE))
+        self.cache.record("scrape", fingerprint("scrape", pipeline.PLATFORMS, 0), raw_path)
+
+    def tearDown(self):
+        pipeline.build_search_agent = self.build_search_agent
+        logging.disable(logging.NOTSET)
+        self.tmp.cleanup()
+
+    def run_pipeline(self, force=(), engine="exact"):
+        self.cache.start_run(force)
+        return pipeline.run_resumable_pipeline(self.cache, data_dir=self.data_dir, engine=engine)
+
+    def counts(self):
+        state = AnalysisState.load(os.path.join(self.data_dir, pipeline.ANALYSIS_STATE_FILE))
+        sketch = SketchState.load(os.path.join(self.data_dir, pipeline.SKETCH_STATE_FILE))
+        buckets = TimeBuckets.load(os.path.join(self.data_dir, pipeline.TIME_BUCKETS_FILE))
+        skill_stats = SkillStats.load(os.path.join(self.data_dir, pipeline.SKILL_STATS_FILE), SKILL_KEYWORDS)
+        history = list(iter_jsonl(os.path.join(self.data_dir, pipeline.PROCESSED_DATA_FILE)))
+        return (state.posting_count, sketch.posting_count,
+                sum(bucket["postings"] for bucket in buckets.buckets["day"].values()),
+                skill_stats.posting_count, len(history))
+
+    def test_force_analyze_twice(self):
+        insights = self.run_pipeline()
+        self.assertEqual(self.counts(), (3, 3, 3, 3, 3))
+        for _ in range(2):
+            self.assertEqual(self.run_pipeline(force=["analyze"]), insights)
+            self.assertEqual(self.counts(), (3, 3, 3, 3, 3))
+
+    def test_force_extract_and_analyze(self):
+        self.run_pipeline()
+        self.run_pipeline(force=["extract", "analyze"])
+        self.assertEqual(self.counts(), (3, 3, 3, 3, 3))
+
+    def test_crash_before_record(self):
+        self.run_pipeline()
+        # The stages wrote their output but the process died before recording them
+        del self.cache.stages["extract"], self.cache.stages["analyze"]
+        self.run_pipeline()
+        self.assertEqual(self.counts(), (3, 3, 3, 3, 3))
+
+    def test_sketch_engine(self):
+        exact = self.run_pipeline()
+        insights = self.run_pipeline(force=["analyze"], engine="sketch")
+        self.assertEqual(self.counts(), (3, 3, 3, 3, 3))
+        self.assertIn("error_bounds", insights)
+        self.assertEqual(insights["top_skills"], exact["top_skills"])
+        # Dated by the latest scrape in the data, not by the day the report is built
+        self.assertEqual(insights["summary"], exact["summary"])
+        self.assertIn("May 2025", insights["summary"])
+
+
+if __name__ == "__main__":
+    unittest.main()
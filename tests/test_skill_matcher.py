@@ -0,0 +1,69 @@
+"""
+Equivalence of the precompiled trie matcher (utils.skill_matcher.SkillMatcher, used by
+DataExtractionAgent.extract_skills) with the previous implementation, which rebuilt a
+`\\b(?:kw1|kw2|...)\\b` alternation on every call.
+"""
+import os
+import random
+import re
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.data_extraction_agent import DataExtractionAgent
+
+EDGE_CASES = [
+    "Strong C++ and Python skills.", "c++developer wanted", "Experience with CI/CD pipelines",
+    "ci/cd, git, jenkins", "Knowledge of R.", "R and Python", "Rust is not R", "r/python", "our r&d team",
+    "MACHINE LEARNING and Deep-Learning", "natural language processing (NLP)", "scikit-learn; xgboost",
+    "Power BI dashboards", "power  bi", "big data lakes", "data warehousing and data lakes",
+    "PostgreSQL/MySQL", "nosql vs sql", "GitHub and git", "sparkling spark", "aws-certified",
+    "Time-series or time series", "reinforcement learning", "redshift", "", "   ",
+]
+
+FILLER = ("we are looking for a motivated engineer to join our growing team in the region with "
+          "excellent communication skills and experience building production systems at scale").split()
+
+
+def legacy_extract_skills(all_skills, description):
+    """The original implementation, kept here as the reference."""
+    if not description:
+        return []
+    found_skills = set()
+    pattern = r'\b(?:' + '|'.join(re.escape(s) for s in all_skills) + r')\b'
+    for match in re.findall(pattern, description, re.IGNORECASE):
+        found_skills.add(match.lower())
+    return sorted(list(found_skills))
+
+
+def synthetic_descriptions(n, all_skills, seed=0):
+    """Filler text with skills inserted in random case and with trailing punctuation."""
+    rng = random.Random(seed)
+    for _ in range(n):
+        words = rng.choices(FILLER, k=rng.randint(40, 120))
+        for _ in range(rng.randint(0, 8)):
+            skill = rng.choice(all_skills)
+            skill = rng.choice([skill, skill.upper(), skill.title()])
+            words.insert(rng.randrange(len(words) + 1), skill + rng.choice(["", ",", ".", ";", " /"]))
+        yield " ".join(words)
+
+
+class SkillMatcherEquivalenceTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.agent = DataExtractionAgent()
+
+    def test_edge_cases(self):
+        for text in EDGE_CASES:
+            with self.subTest(text=text):
+                self.assertEqual(self.agent.extract_skills(text), legacy_extract_skills(self.agent.all_skills, text))
+
+    def test_synthetic_descriptions(self):
+        for text in synthetic_descriptions(2000, self.agent.all_skills):
+            self.assertEqual(self.agent.extract_skills(text), legacy_extract_skills(self.agent.all_skills, text), text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+SkillStats: persisted skill co-occurrence counts updated batch by batch (or posting by posting)
+match a one-shot count of the whole history, and reach the report as the skill category chart
+and the co-occurrence heatmap.
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.report_writer_agent import ReportWriterAgent
+from agents.trend_analysis_agent import TrendAnalysisAgent
+from utils.skill_matrix import SkillMatrix, SkillStats
+from utils.visualizations import render_charts
+
+SKILL_KEYWORDS = {
+    "languages": ["python", "sql", "r"],
+    "frameworks": ["pytorch", "tensorflow"],
+    "cloud": ["aws", "azure"],
+}
+POSTINGS = [
+    {"skills": ["python", "pytorch", "aws"]},
+    {"skills": ["python", "sql"]},
+    {"skills": ["python", "pytorch", "sql"]},
+    {"skills": ["r", "sql", "kotlin"]},
+    {"skills": []},
+    {"skills": ["python", "pytorch", "azure"]},
+]
+
+
+class SkillStatsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.expected = SkillStats(SKILL_KEYWORDS).update(POSTINGS)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assertSameCounts(self, stats, expected):
+        self.assertEqual(stats.posting_count, expected.posting_count)
+        np.testing.assert_array_equal(stats.cooccurrence, expected.cooccurrence)
+        self.assertEqual(stats.category_distribution(), expected.category_distribution())
+
+    def test_one_shot_counts(self):
+        matrix = SkillMatrix(SKILL_KEYWORDS)
+        self.assertEqual(self.expected.cooccurrence[matrix.index["python"], matrix.index["pytorch"]], 3)
+        self.assertEqual(self.expected.category_distribution(),
+                         [("languages", 5), ("frameworks", 3), ("cloud", 2)])
+        self.assertEqual(self.expected.top_pairs(k=1)[0]["skills"], ("python", "pytorch"))
+
+    def test_incremental_batches_through_disk(self):
+        path = os.path.join(self.tmp.name, "skill_stats.json")
+        for batch in (POSTINGS[:2], POSTINGS[2:5], POSTINGS[5:]):
+            SkillStats.load(path, SKILL_KEYWORDS).update(batch).save(path)
+        self.assertSameCounts(SkillStats.load(path, SKILL_KEYWORDS), self.expected)
+
+    def test_streamed_postings_and_merge(self):
+        streamed = SkillStats(SKILL_KEYWORDS, chunk_size=4)
+        for post in POSTINGS[:3]:
+            streamed.add(post)
+        other = SkillStats(SKILL_KEYWORDS, chunk_size=4)
+        for post in POSTINGS[3:]:
+            other.add(post)
+        self.assertSameCounts(streamed.merge(other), self.expected)
+
+    def test_heatmap_in_report_charts(self):
+        insights = {"top_titles": [], "top_skills": [],
+                    "skill_associations": TrendAnalysisAgent().skill_associations(self.expected, heatmap_skills=4)}
+        heatmap = insights["skill_associations"]["heatmap"]
+        self.assertEqual(heatmap["labels"][0], "python")
+        self.assertEqual(len(heatmap["matrix"]), 4)
+
+        jobs = ReportWriterAgent()._chart_jobs(insights, self.tmp.name)
+        render_charts([jobs["skill_categories"], jobs["skill_heatmap"]], max_workers=1)
+        self.assertTrue(os.path.exists(jobs["skill_categories"].filename))
+        self.assertTrue(os.path.exists(jobs["skill_heatmap"].filename))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+TimeBuckets.growth ordering: measured growth first (fastest first), values new in the current
+window after them, and ties in a deterministic order. Legacy postings without a scrape date
+stay out of the buckets instead of showing up as growth on the day they are processed.
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.data_extraction_agent import DataExtractionAgent
+from utils.time_buckets import TimeBuckets
+
+
+def postings(day, skills_per_posting):
+    return [{"scraped_at": day, "skills": skills} for skills in skills_per_posting]
+
+
+class GrowthOrderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.buckets = TimeBuckets()
+        # Week of 2025-01-06, then week of 2025-01-13 (4 postings each)
+        self.buckets.update(postings("2025-01-06", [["sql", "python"], ["sql", "spark"], ["python"], ["spark"]]))
+        self.buckets.update(postings("2025-01-13", [["sql", "python", "rust"], ["sql", "spark", "go"],
+                                                    ["python", "sql", "rust"], ["spark", "go"]]))
+
+    def test_new_values_after_measured(self):
+        rows = self.buckets.growth("skill", min_count=1, top=None)
+        self.assertEqual([row["value"] for row in rows], ["sql", "python", "spark", "go", "rust"])
+        self.assertEqual([row["growth"] for row in rows[3:]], [None, None])
+        self.assertAlmostEqual(rows[0]["growth"], 0.5)
+
+    def test_ties_by_value(self):
+        rows = self.buckets.growth("skill", min_count=1, top=None)
+        self.assertEqual(rows[1]["growth"], rows[2]["growth"])
+        for _ in range(5):
+            shuffled = TimeBuckets.from_dict(self.buckets.to_dict())
+            self.assertEqual(shuffled.growth("skill", min_count=1, top=None), rows)
+
+
+class UndatedPostingsTest(unittest.TestCase):
+
+    def test_legacy_records_stay_undated(self):
+        legacy = {"title": "Data Scientist", "company": "Noon", "location": "Riyadh, Saudi Arabia",
+                  "description": "Python and SQL.", "source": "LinkedIn"}
+        cleaned = DataExtractionAgent().clean_posting(legacy)
+        self.assertIsNone(cleaned["scraped_at"])
+
+        buckets = TimeBuckets().update(postings("2025-01-06", [["python"]]))
+        buckets.update([cleaned, cleaned])
+        self.assertEqual(list(buckets.buckets["day"]), ["2025-01-06"])
+        self.assertEqual(buckets.undated, 2)
+        self.assertEqual(TimeBuckets.from_dict(buckets.to_dict()).undated, 2)
+        self.assertEqual([row["current"] for row in buckets.growth("skill", min_count=1)], [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+canonicalize_title keeps title segments that are part of the role and drops only places,
+work arrangements and companies; TitleNormalizer keeps no unbounded memo of raw titles.
+"""
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.title_normalizer import TitleNormalizer, canonicalize_title
+
+CASES = {
+    "Sr. ML Engineer - Dubai": "Machine Learning Engineer",
+    "Data Scientist II | Riyadh": "Data Scientist",
+    "MLOps Eng., UAE": "MLOps Engineer",
+    "Lead Data Scientist - Remote": "Data Scientist",
+    "Data Engineer, Hybrid, Cairo, Egypt": "Data Engineer",
+    "AI Engineer @ Careem": "AI Engineer",
+    "Software Engineer - Machine Learning": "Software Engineer Machine Learning",
+    "Senior Manager, Data Science": "Manager Data Science",
+    "Research Scientist: Computer Vision": "Research Scientist Computer Vision",
+}
+
+
+class CanonicalizeTitleTest(unittest.TestCase):
+
+    def test_cases(self):
+        for raw, expected in CASES.items():
+            with self.subTest(title=raw):
+                self.assertEqual(canonicalize_title(raw), expected)
+
+
+class TitleNormalizerTest(unittest.TestCase):
+
+    def test_overrides_and_bounded_cache(self):
+        normalizer = TitleNormalizer({"Quant": "Quantitative Researcher"}, cache_size=4)
+        self.assertEqual(normalizer.normalize("Quant"), "Quantitative Researcher")
+        for i in range(20):
+            normalizer.normalize(f"Data Scientist {i}")
+        self.assertEqual(normalizer.overrides, {"Quant": "Quantitative Researcher"})
+        self.assertEqual(normalizer.cache_info().currsize, 4)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "title_mapping.json")
+            normalizer = TitleNormalizer({"Quant": "Quantitative Researcher"}, path=path)
+            normalizer.normalize("Sr. ML Engineer")
+            normalizer.save()
+            with open(path, "r", encoding="utf-8") as f:
+                self.assertEqual(json.load(f)["overrides"], {"Quant": "Quantitative Researcher"})
+            self.assertEqual(TitleNormalizer.load(path).normalize("Quant"), "Quantitative Researcher")
+
+
+if __name__ == "__main__":
+    unittest.main()
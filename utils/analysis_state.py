@@ -0,0 +1,118 @@
+import json
+import logging
+import os
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("AnalysisState")
+
+
+class AnalysisState:
+    """
+    Persistent, mergeable counters behind the trend analysis: how often each job title,
+    skill and location occurs. The state is updated with new postings only, so refreshing
+    the analysis costs O(new postings) instead of re-counting the whole history, and
+    states built on separate shards or days can be merged.
+    """
+
+    VERSION = 1
+
+    def __init__(self):
+        self.posting_count = 0
+        self.title_counts = Counter()
+        self.skill_counts = Counter()
+        self.location_counts = Counter()
+        # Most recent 'scraped_at' ISO date among the counted postings
+        self.latest_scraped_at: Optional[str] = None
+
+    def update(self, new_postings: Iterable[Dict]) -> "AnalysisState":
+        """
+        Adds structured postings (output of DataExtractionAgent) to the counters.
+        Missing titles/locations are ignored, like `dropna()` in the DataFrame analysis.
+
+        Args:
+            new_postings (Iterable[Dict]): Postings not yet counted in this state.
+
+        Returns:
+            AnalysisState: self, to allow chaining.
+        """
+        for post in new_postings:
+            self.add(post)
+        return self
+
+    def add(self, post: Dict):
+        """Adds one structured posting to the counters."""
+        self.posting_count += 1
+        if post.get("title") is not None:
+            self.title_counts[post["title"]] += 1
+        if post.get("location") is not None:
+            self.location_counts[post["location"]] += 1
+        self.skill_counts.update(post.get("skills", []))
+        scraped_at = post.get("scraped_at")
+        if scraped_at and (self.latest_scraped_at is None or scraped_at > self.latest_scraped_at):
+            self.latest_scraped_at = scraped_at
+
+    def merge(self, other: "AnalysisState") -> "AnalysisState":
+        """
+        Adds the counts of another state (e.g. another shard or day) to this one.
+
+        Returns:
+            AnalysisState: self, to allow chaining.
+        """
+        self.posting_count += other.posting_count
+        self.title_counts.update(other.title_counts)
+        self.skill_counts.update(other.skill_counts)
+        self.location_counts.update(other.location_counts)
+        if other.latest_scraped_at and (self.latest_scraped_at is None
+                                        or other.latest_scraped_at > self.latest_scraped_at):
+            self.latest_scraped_at = other.latest_scraped_at
+        return self
+
+    def top_titles(self, n: int = 10) -> List[Tuple[str, int]]:
+        return self.title_counts.most_common(n)
+
+    def top_skills(self, n: int = 10) -> List[Tuple[str, int]]:
+        return self.skill_counts.most_common(n)
+
+    def location_distribution(self) -> List[Tuple[str, int]]:
+        return self.location_counts.most_common()
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": self.VERSION,
+            "posting_count": self.posting_count,
+            "title_counts": dict(self.title_counts),
+            "skill_counts": dict(self.skill_counts),
+            "location_counts": dict(self.location_counts),
+            "latest_scraped_at": self.latest_scraped_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "AnalysisState":
+        state = cls()
+        state.posting_count = data.get("posting_count", 0)
+        state.title_counts = Counter(data.get("title_counts", {}))
+        state.skill_counts = Counter(data.get("skill_counts", {}))
+        state.location_counts = Counter(data.get("location_counts", {}))
+        state.latest_scraped_at = data.get("latest_scraped_at")
+        return state
+
+    def save(self, path: str):
+        """Writes the state to a JSON file (atomically, via a temporary file)."""
+        output_dir = os.path.dirname(path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        logger.info(f"Analysis state with {self.posting_count} postings saved to {path}")
+
+    @classmethod
+    def load(cls, path: str) -> "AnalysisState":
+        """Reads a state saved by `save`; returns an empty state if the file does not exist."""
+        if not os.path.exists(path):
+            logger.info(f"No analysis state at {path}. Starting from an empty state.")
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
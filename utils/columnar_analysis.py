@@ -0,0 +1,144 @@
+from itertools import chain, islice
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class CategoryEncoder:
+    """
+    Assigns consecutive integer codes to distinct values in order of first appearance,
+    so that codes can be counted with `np.bincount` and ties can be broken by code
+    exactly like `Counter.most_common` breaks them by insertion order.
+    An optional `transform` (e.g. a title normalizer) maps values to their label first,
+    so values with the same label share a code.
+    """
+
+    def __init__(self, transform: Optional[Callable] = None):
+        self.codes: Dict[Hashable, int] = {}
+        self.labels: List[Hashable] = []
+        self.transform = transform
+
+    def encode(self, value) -> int:
+        if self.transform is not None:
+            value = self.transform(value)
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.labels)
+            self.labels.append(value)
+        return code
+
+    def encode_column(self, values: List) -> np.ndarray:
+        """
+        Encodes a whole column at once. The values are hashed by `pd.factorize` (in C, first-appearance
+        order); only the distinct values go through `encode`. Missing values (None/NaN) get code -1.
+        """
+        local_codes, uniques = pd.factorize(np.asarray(values, dtype=object) if values else np.empty(0, dtype=object))
+        if not len(uniques):
+            return local_codes.astype(np.int64)
+        mapping = np.fromiter((self.encode(value) for value in uniques), dtype=np.int64, count=len(uniques))
+        return np.where(local_codes >= 0, mapping[local_codes], -1)
+
+
+def top_k(counts: np.ndarray, labels: List[Hashable], k: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+    """
+    Returns the k most frequent labels as (label, count) pairs, highest count first and
+    ties in first-appearance order (same order as `Counter.most_common(k)`).
+    Uses a partition to pre-select candidates, so only ~k entries are fully sorted.
+
+    Args:
+        counts (np.ndarray): Count per code (output of `np.bincount`).
+        labels (List[Hashable]): Label per code.
+        k (Optional[int]): Number of entries to return; None returns all labels.
+    """
+    n = len(counts)
+    if n == 0:
+        return []
+    if k is None or k >= n:
+        candidates = np.arange(n)
+    else:
+        if k <= 0:
+            return []
+        kth_count = np.partition(counts, n - k)[n - k]
+        # Keep every code tied with the k-th count so the tie-break below is exact
+        candidates = np.flatnonzero(counts >= kth_count)
+    # lexsort sorts by the last key first: count descending, then code ascending
+    order = candidates[np.lexsort((candidates, -counts[candidates]))]
+    if k is not None:
+        order = order[:k]
+    return [(labels[code], int(counts[code])) for code in order]
+
+
+class ColumnarAnalysis:
+    """
+    Column-oriented frequency engine for the trend analysis. Only the title, location and
+    skills of each posting are read (descriptions and other fields are never copied);
+    each column is integer-coded into a dictionary and counted with `np.bincount`.
+    """
+
+    def __init__(self, title_transform: Optional[Callable] = None):
+        """
+        Args:
+            title_transform (Optional[Callable]): Maps raw titles to the counted label (e.g. a TitleNormalizer).
+        """
+        self.posting_count = 0
+        self.titles = CategoryEncoder(title_transform)
+        self.locations = CategoryEncoder()
+        self.skills = CategoryEncoder()
+        self.title_counts = np.zeros(0, dtype=np.int64)
+        self.location_counts = np.zeros(0, dtype=np.int64)
+        self.skill_counts = np.zeros(0, dtype=np.int64)
+
+    @classmethod
+    def from_postings(cls, postings: Iterable[Dict], title_transform: Optional[Callable] = None) -> "ColumnarAnalysis":
+        engine = cls(title_transform)
+        engine.add(postings)
+        return engine
+
+    def add(self, postings: Iterable[Dict], chunk_size: int = 100_000) -> "ColumnarAnalysis":
+        """
+        Encodes postings into code columns and adds their frequencies. Postings are
+        processed `chunk_size` at a time, so the temporary columns stay small.
+
+        Args:
+            postings (Iterable[Dict]): Structured job entries.
+            chunk_size (int): Number of postings encoded per column batch.
+
+        Returns:
+            ColumnarAnalysis: self, to allow chaining.
+        """
+        postings = iter(postings)
+        while True:
+            chunk = list(islice(postings, chunk_size))
+            if not chunk:
+                return self
+            self._add_chunk(chunk)
+
+    def _add_chunk(self, postings: List[Dict]):
+        self.posting_count += len(postings)
+        # Only these three columns are materialised; the posting dicts are not copied
+        titles = [post.get("title") for post in postings]
+        locations = [post.get("location") for post in postings]
+        skills = list(chain.from_iterable(post.get("skills") or () for post in postings))
+
+        self.title_counts = self._add_counts(self.title_counts, self.titles.encode_column(titles),
+                                             len(self.titles.labels))
+        self.location_counts = self._add_counts(self.location_counts, self.locations.encode_column(locations),
+                                                len(self.locations.labels))
+        self.skill_counts = self._add_counts(self.skill_counts, self.skills.encode_column(skills),
+                                             len(self.skills.labels))
+
+    @staticmethod
+    def _add_counts(counts: np.ndarray, codes: np.ndarray, size: int) -> np.ndarray:
+        new_counts = np.bincount(codes[codes >= 0], minlength=size)
+        new_counts[:len(counts)] += counts
+        return new_counts
+
+    def top_titles(self, k: Optional[int] = 10) -> List[Tuple[Hashable, int]]:
+        return top_k(self.title_counts, self.titles.labels, k)
+
+    def top_skills(self, k: Optional[int] = 10) -> List[Tuple[Hashable, int]]:
+        return top_k(self.skill_counts, self.skills.labels, k)
+
+    def location_distribution(self) -> List[Tuple[Hashable, int]]:
+        return top_k(self.location_counts, self.locations.labels)
@@ -0,0 +1,274 @@
+import bisect
+import re
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Offline MENA gazetteer: country -> (region, country aliases, {city: city aliases}).
+# Aliases cover English/French spellings, common Arabic transliterations and Arabic script;
+# the canonical names themselves are always aliases too.
+MENA_GAZETTEER: Dict[str, Tuple[str, List[str], Dict[str, List[str]]]] = {
+    "United Arab Emirates": ("GCC", ["UAE", "U.A.E.", "Emirates", "الإمارات", "الامارات"], {
+        "Dubai": ["Dubayy", "Dubai Internet City", "Dubai Media City", "DIFC", "دبي"],
+        "Abu Dhabi": ["Abu Zabi", "Abu Dabi", "Abudhabi", "Masdar City", "أبو ظبي", "ابوظبي"],
+        "Sharjah": ["Ash Shariqah", "Al Sharjah", "الشارقة"],
+        "Ajman": ["عجمان"],
+        "Ras Al Khaimah": ["RAK", "Ras al-Khaimah", "رأس الخيمة"],
+        "Fujairah": ["Al Fujairah", "الفجيرة"],
+        "Al Ain": ["العين"],
+    }),
+    "Saudi Arabia": ("GCC", ["KSA", "Saudi", "Kingdom of Saudi Arabia", "K.S.A.", "السعودية",
+                             "المملكة العربية السعودية"], {
+        "Riyadh": ["Ar Riyad", "Al Riyadh", "Riyad", "الرياض"],
+        "Jeddah": ["Jiddah", "Jedda", "Jidda", "جدة"],
+        "Dammam": ["Ad Dammam", "Al Dammam", "الدمام"],
+        "Khobar": ["Al Khobar", "Al Khubar", "Alkhobar", "الخبر"],
+        "Dhahran": ["Az Zahran", "الظهران"],
+        "Mecca": ["Makkah", "Makka", "مكة"],
+        "Medina": ["Madinah", "Al Madinah", "المدينة المنورة"],
+        "NEOM": ["نيوم"],
+        "Thuwal": ["KAUST", "ثول"],
+    }),
+    "Qatar": ("GCC", ["State of Qatar", "قطر"], {
+        "Doha": ["Ad Dawhah", "Al Dawha", "الدوحة"],
+        "Lusail": ["لوسيل"],
+    }),
+    "Kuwait": ("GCC", ["State of Kuwait", "الكويت"], {
+        "Kuwait City": ["Al Kuwayt", "Madinat al Kuwayt", "مدينة الكويت"],
+    }),
+    "Bahrain": ("GCC", ["Kingdom of Bahrain", "البحرين"], {
+        "Manama": ["Al Manamah", "المنامة"],
+    }),
+    "Oman": ("GCC", ["Sultanate of Oman", "سلطنة عمان"], {
+        "Muscat": ["Masqat", "مسقط"],
+    }),
+    "Egypt": ("North Africa", ["Arab Republic of Egypt", "Misr", "مصر"], {
+        "Cairo": ["Al Qahirah", "El Qahira", "New Cairo", "Nasr City", "Heliopolis", "القاهرة"],
+        "Giza": ["Al Jizah", "El Giza", "Sheikh Zayed", "6th of October", "الجيزة"],
+        "Alexandria": ["Al Iskandariyah", "الإسكندرية", "الاسكندرية"],
+    }),
+    "Morocco": ("North Africa", ["Maroc", "Kingdom of Morocco", "المغرب"], {
+        "Casablanca": ["Dar el Beida", "الدار البيضاء"],
+        "Rabat": ["الرباط"],
+        "Marrakesh": ["Marrakech", "مراكش"],
+        "Tangier": ["Tanger", "Tangiers", "طنجة"],
+    }),
+    "Tunisia": ("North Africa", ["Tunisie", "تونس"], {
+        "Tunis": [],
+        "Sfax": ["صفاقس"],
+    }),
+    "Algeria": ("North Africa", ["Algérie", "Algerie", "الجزائر"], {
+        "Algiers": ["Alger"],
+        "Oran": ["وهران"],
+    }),
+    "Libya": ("North Africa", ["ليبيا"], {
+        "Tripoli": ["Tarabulus", "طرابلس"],
+        "Benghazi": ["بنغازي"],
+    }),
+    "Sudan": ("North Africa", ["السودان"], {
+        "Khartoum": ["Al Khartum", "الخرطوم"],
+    }),
+    "Jordan": ("Levant", ["Hashemite Kingdom of Jordan", "الأردن", "الاردن"], {
+        "Amman": ["Ammān", "عمّان"],
+        "Irbid": ["إربد"],
+    }),
+    "Lebanon": ("Levant", ["Liban", "لبنان"], {
+        "Beirut": ["Bayrut", "Beyrouth", "بيروت"],
+        "Tripoli": ["Trablous"],
+    }),
+    "Palestine": ("Levant", ["State of Palestine", "Palestinian Territories", "فلسطين"], {
+        "Ramallah": ["رام الله"],
+        "Gaza": ["غزة"],
+    }),
+    "Syria": ("Levant", ["Syrian Arab Republic", "سوريا"], {
+        "Damascus": ["Dimashq", "دمشق"],
+        "Aleppo": ["Halab", "حلب"],
+    }),
+    "Iraq": ("Levant", ["العراق"], {
+        "Baghdad": ["بغداد"],
+        "Erbil": ["Arbil", "Hawler", "أربيل"],
+        "Basra": ["Al Basrah", "البصرة"],
+    }),
+    "Israel": ("Levant", [], {
+        "Tel Aviv": ["Tel Aviv-Yafo", "Tel Aviv Yafo"],
+        "Haifa": [],
+    }),
+    "Yemen": ("Arabian Peninsula", ["اليمن"], {
+        "Sanaa": ["Sana'a", "صنعاء"],
+        "Aden": ["عدن"],
+    }),
+    "Türkiye": ("Other MENA", ["Turkey", "Turkiye", "Türkiye Cumhuriyeti", "تركيا"], {
+        "Istanbul": ["İstanbul", "إسطنبول"],
+        "Ankara": ["أنقرة"],
+    }),
+    "Iran": ("Other MENA", ["Islamic Republic of Iran", "إيران"], {
+        "Tehran": ["Teheran", "طهران"],
+    }),
+}
+
+# Region-level names (no country): alias -> region
+REGION_ALIASES = {
+    "MENA": "MENA", "Middle East": "MENA", "Middle East and North Africa": "MENA",
+    "GCC": "GCC", "Gulf": "GCC", "Gulf Region": "GCC", "Arabian Gulf": "GCC", "Levant": "Levant",
+    "North Africa": "North Africa", "Maghreb": "North Africa",
+}
+
+# Countries outside the gazetteer that MENA city names also occur in ("Alexandria, Virginia, United States").
+# A location naming one of them is not resolved.
+NON_MENA_COUNTRIES = [
+    "United States", "United States of America", "USA", "US", "U.S.", "U.S.A.", "United Kingdom", "UK", "U.K.",
+    "Great Britain", "England", "Scotland", "Ireland", "Canada", "Australia", "New Zealand", "India", "Pakistan",
+    "Bangladesh", "Sri Lanka", "Germany", "France", "Spain", "Portugal", "Italy", "Greece", "Cyprus", "Malta",
+    "Netherlands", "Belgium", "Switzerland", "Austria", "Sweden", "Norway", "Denmark", "Finland", "Poland",
+    "Romania", "Ukraine", "Russia", "China", "Japan", "South Korea", "Singapore", "Malaysia", "Indonesia",
+    "Philippines", "Nigeria", "Kenya", "Ethiopia", "South Africa", "Brazil", "Mexico", "Argentina",
+]
+
+# Words that do not change which place is meant ("Dubai Emirate", "Riyadh Province", "Greater Cairo")
+_NOISE_WORDS = {"emirate", "province", "region", "governorate", "greater", "metropolitan", "area",
+                "city", "state", "remote", "hybrid", "on", "site", "onsite"}
+_SEGMENT_SEPARATORS = re.compile(r"\s*[,;|/()]\s*|\s+-\s+")
+_ARTICLE = re.compile(r"^(?:al|el|ar|ad|as|ash|az)[\s-]+")
+
+
+class Place(NamedTuple):
+    city: Optional[str]
+    country: Optional[str]
+    region: Optional[str]
+
+    def label(self, level: str = "city") -> Optional[str]:
+        """Display name at a level: 'city' ("Dubai, United Arab Emirates"), 'country' or 'region'."""
+        if level == "region":
+            return self.region
+        if level == "country":
+            return self.country or self.region
+        if self.city:
+            return f"{self.city}, {self.country}"
+        return self.country or self.region
+
+
+def normalize_key(text: str) -> str:
+    """Casefolds, strips accents/Arabic diacritics and punctuation, and collapses whitespace."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    cleaned = re.sub(r"[^\w\s]", " ", stripped.replace("'", "").replace("’", ""))
+    return " ".join(cleaned.split())
+
+
+class Gazetteer:
+    """
+    Hash index of place aliases (normalized key -> candidate places) plus a sorted key
+    list for prefix lookups. Resolving a location string is a few dictionary lookups per
+    comma-separated segment and is memoized, so normalizing a posting is O(1) on repeats.
+    """
+
+    def __init__(self, gazetteer: Dict = MENA_GAZETTEER, region_aliases: Dict[str, str] = REGION_ALIASES,
+                 foreign_countries: Iterable[str] = NON_MENA_COUNTRIES, cache_size: int = 65536):
+        self.index: Dict[str, List[Place]] = {}
+        self.alias_keys = set()
+        for country, (region, country_aliases, cities) in gazetteer.items():
+            for alias in [country] + country_aliases:
+                self._add(alias, Place(None, country, region))
+            for city, city_aliases in cities.items():
+                for alias in [city] + city_aliases:
+                    self._add(alias, Place(city, country, region))
+        for alias, region in region_aliases.items():
+            self._add(alias, Place(None, None, region))
+        # Keys that only exist with their article stripped ("ain" for "Al Ain"): matched whole, never as a prefix
+        self.article_stripped_keys = set(self.index) - self.alias_keys
+        self.foreign_keys = {normalize_key(country) for country in foreign_countries}
+        self.keys = sorted(self.index)
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def _add(self, alias: str, place: Place):
+        key = normalize_key(alias)
+        self.alias_keys.add(key)
+        for key in {key, _ARTICLE.sub("", key)}:
+            if key and place not in self.index.setdefault(key, []):
+                self.index[key].append(place)
+
+    def complete(self, prefix: str, limit: int = 10) -> List[str]:
+        """Alias keys starting with `prefix` (e.g. for suggestions), via binary search on the sorted keys."""
+        prefix = normalize_key(prefix)
+        start = bisect.bisect_left(self.keys, prefix)
+        matches = []
+        for key in self.keys[start:]:
+            if not key.startswith(prefix) or len(matches) >= limit:
+                break
+            matches.append(key)
+        return matches
+
+    def _lookup(self, segment: str) -> Tuple[List[Place], bool]:
+        """
+        Candidate places of one segment, and whether the whole segment matched (rather than a word prefix).
+        """
+        words = normalize_key(segment).split()
+        # The segment as written ("kuwait city") or without noise words ("riyadh province" -> "riyadh")
+        variants = (words, [word for word in words if word not in _NOISE_WORDS])
+        for variant_words in variants:
+            candidate = " ".join(variant_words)
+            for variant in (candidate, _ARTICLE.sub("", candidate)):
+                if variant in self.index:
+                    return self.index[variant], True
+        # Else the longest word prefix ("dubai silicon oasis" -> "dubai"), on alias keys only:
+        # "ain shams" must not match "ain", the article-stripped key of "Al Ain"
+        for variant_words in variants:
+            for end in range(len(variant_words) - 1, 0, -1):
+                candidate = " ".join(variant_words[:end])
+                for variant in (candidate, _ARTICLE.sub("", candidate)):
+                    if variant in self.index and variant not in self.article_stripped_keys:
+                        return self.index[variant], False
+        return [], False
+
+    def _is_foreign(self, segment: str) -> bool:
+        return " ".join(word for word in normalize_key(segment).split() if word not in _NOISE_WORDS) \
+            in self.foreign_keys
+
+    def _resolve(self, location: str) -> Optional[Place]:
+        segments = [segment for segment in _SEGMENT_SEPARATORS.split(location) if segment.strip()]
+        if any(self._is_foreign(segment) for segment in segments):
+            return None
+        lookups = [self._lookup(segment) for segment in segments]
+        countries = [place for places, _ in lookups for place in places if place.city is None and place.country]
+        regions = [place.region for places, _ in lookups for place in places if place.country is None]
+        # Number of segments that point to each country (by naming it or one of its cities)
+        support = Counter(country for places, _ in lookups
+                          for country in {place.country for place in places if place.country})
+        cities = [(-support[place.country], not exact, position, place)
+                  for position, (places, exact) in enumerate(lookups) for place in places if place.city]
+
+        # An explicit country disambiguates cities with the same name ("Tripoli, Lebanon") and rules out
+        # cities elsewhere; otherwise the city most segments agree with wins, whole-segment matches
+        # ("Dubai") before prefix matches ("Sheikh Zayed Road" -> Giza), then the first one
+        named_countries = {place.country for place in countries}
+        if named_countries:
+            cities = [city for city in cities if city[3].country in named_countries]
+        if cities:
+            return min(cities, key=lambda city: city[:3])[3]
+        if countries:
+            return countries[0]
+        if regions:
+            return Place(None, None, regions[0])
+        return None
+
+
+_default_gazetteer: Optional[Gazetteer] = None
+
+
+def default_gazetteer() -> Gazetteer:
+    """Shared gazetteer built on first use."""
+    global _default_gazetteer
+    if _default_gazetteer is None:
+        _default_gazetteer = Gazetteer()
+    return _default_gazetteer
+
+
+def resolve_location(location: Optional[str]) -> Optional[Place]:
+    """
+    Resolves a free-text location ("Dubai, United Arab Emirates", "Dubai, UAE", "دبي", "Riyadh Province")
+    to a canonical Place(city, country, region), or None if nothing in it is known.
+    """
+    if not location or not location.strip():
+        return None
+    return default_gazetteer().resolve(location.strip())
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger("HttpCache")
+
+
+class ResponseCache:
+    """
+    Persistent on-disk cache of HTTP responses keyed by URL.
+    Stores the body together with its ETag / Last-Modified validators so that the
+    next fetch can be made conditional and a 304 Not Modified served from disk.
+    """
+
+    def __init__(self, cache_dir: str = "data/http_cache"):
+        """
+        Args:
+            cache_dir (str): Directory holding one `<sha256>.html` body and one
+                             `<sha256>.json` metadata file per cached URL.
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + ".json", base + ".html"
+
+    def _read_meta(self, url: str) -> Optional[Dict]:
+        meta_path, body_path = self._paths(url)
+        if not (os.path.exists(meta_path) and os.path.exists(body_path)):
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry for {url}: {e}")
+            return None
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Returns the `If-None-Match` / `If-Modified-Since` headers for a cached URL
+        (an empty dict if the URL is not cached or has no validators).
+        """
+        meta = self._read_meta(url)
+        if not meta:
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def load(self, url: str) -> Optional[str]:
+        """Returns the cached body for a URL, or None if it is not cached."""
+        _, body_path = self._paths(url)
+        try:
+            with open(body_path, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store(self, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """
+        Saves a response body and its validators. Responses without any validator
+        are not cached since they could never be revalidated.
+        """
+        if not etag and not last_modified:
+            return
+        meta_path, body_path = self._paths(url)
+        # Write to temp files and rename so concurrent readers never see partial entries
+        for path, content in ((body_path, body),
+                              (meta_path, json.dumps({"url": url, "etag": etag, "last_modified": last_modified}))):
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+
+    def record_hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the hit/miss counters collected since the cache was created."""
+        return {"hits": self.hits, "misses": self.misses}
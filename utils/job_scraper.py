@@ -1,5 +1,10 @@
+import hashlib
 import re
-from typing import List
+from typing import Dict, List, Optional
+
+from utils.gazetteer import resolve_location
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
 
 
 def extract_emails(text: str) -> List[str]:
@@ -16,19 +21,49 @@ def extract_emails(text: str) -> List[str]:
     return re.findall(email_pattern, text)
 
 
-def normalize_location(location: str) -> str:
+def normalize_location(location: str, level: str = "city") -> str:
     """
-    Normalizes a location string (e.g., trimming whitespace, standard casing).
+    Normalizes a location string with the offline MENA gazetteer (utils/gazetteer.py), so
+    "Dubai, United Arab Emirates", "Dubai, UAE" and "دبي" all become "Dubai, United Arab Emirates".
+    Locations the gazetteer does not know fall back to trimming whitespace and standard casing.
 
     Args:
         location (str): Raw location text.
+        level (str): Aggregation level of the result: "city" ("City, Country"), "country" or "region".
 
     Returns:
         str: Cleaned location.
     """
     if not location:
         return "Unknown"
-    return location.strip().title()
+    place = resolve_location(location)
+    label = place.label(level) if place else None
+    return label or location.strip().title()
+
+
+def normalize_field(value: Optional[str]) -> str:
+    """
+    Lowercases a field and collapses punctuation/whitespace, e.g. 'ML Engineer - Dubai ' -> 'ml engineer dubai'.
+    """
+    return _NON_ALNUM.sub(" ", (value or "").lower()).strip()
+
+
+def posting_key(posting: Dict) -> Optional[str]:
+    """
+    Identity of a posting across boards and re-scrapes: a hash of its normalized
+    (title, company, location), or None if the title or company is missing.
+
+    Args:
+        posting (Dict): Raw or structured job posting.
+
+    Returns:
+        Optional[str]: 32-character hex key.
+    """
+    title, company = normalize_field(posting.get("title")), normalize_field(posting.get("company"))
+    if not title or not company:
+        return None
+    fields = "\x1f".join((title, company, normalize_field(posting.get("location"))))
+    return hashlib.blake2b(fields.encode("utf-8"), digest_size=16).hexdigest()
 
 
 def keyword_in_text(keywords: List[str], text: str) -> List[str]:
@@ -53,4 +88,5 @@ if __name__ == "__main__":
     demo_text = "We're hiring a Python developer in Cairo. Contact us at hr@techfirm.com."
     print("Emails:", extract_emails(demo_text))
     print("Location:", normalize_location("  cairo "))
+    print("Location:", normalize_location("Riyadh Province, KSA", level="country"))
     print("Keywords:", keyword_in_text(["python", "java"], demo_text))
@@ -0,0 +1,276 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.job_scraper import posting_key
+
+logger = logging.getLogger("JobStore")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS raw_postings (
+    id INTEGER PRIMARY KEY,
+    posting_key TEXT NOT NULL UNIQUE,
+    title TEXT, company TEXT, location TEXT, source TEXT,
+    url TEXT, job_id TEXT, description TEXT,
+    scraped_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_raw_scraped_at ON raw_postings(scraped_at);
+CREATE INDEX IF NOT EXISTS idx_raw_source ON raw_postings(source);
+
+CREATE TABLE IF NOT EXISTS postings (
+    id INTEGER PRIMARY KEY,
+    posting_key TEXT NOT NULL UNIQUE,
+    title TEXT, company TEXT, location TEXT, source TEXT, description TEXT,
+    scraped_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_postings_title ON postings(title);
+CREATE INDEX IF NOT EXISTS idx_postings_location ON postings(location);
+CREATE INDEX IF NOT EXISTS idx_postings_company ON postings(company);
+CREATE INDEX IF NOT EXISTS idx_postings_source ON postings(source);
+CREATE INDEX IF NOT EXISTS idx_postings_scraped_at ON postings(scraped_at);
+
+CREATE TABLE IF NOT EXISTS skills (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+-- position: index of the skill in the posting's list, used to reproduce Counter tie order
+CREATE TABLE IF NOT EXISTS posting_skills (
+    posting_id INTEGER NOT NULL REFERENCES postings(id) ON DELETE CASCADE,
+    skill_id INTEGER NOT NULL REFERENCES skills(id),
+    position INTEGER NOT NULL,
+    PRIMARY KEY (posting_id, skill_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_posting_skills_skill ON posting_skills(skill_id, posting_id);
+"""
+
+# Keyword filters accepted by the aggregate queries: name -> SQL condition on the postings table `p`
+_FILTERS = {
+    "title": "p.title = ?",
+    "title_like": "p.title LIKE ?",
+    "company": "p.company = ?",
+    "location": "p.location = ?",
+    "location_like": "p.location LIKE ?",
+    "source": "p.source = ?",
+    "since": "p.scraped_at >= ?",
+    "until": "p.scraped_at <= ?",
+    "skill": "p.id IN (SELECT ps.posting_id FROM posting_skills ps JOIN skills s ON s.id = ps.skill_id WHERE s.name = ?)",
+}
+
+
+def _record_key(posting: Dict) -> str:
+    """posting_key, falling back to the job ID/URL, then to a hash of the whole record."""
+    key = posting_key(posting) or posting.get("job_id") or posting.get("url")
+    if key is None:
+        key = hashlib.blake2b(json.dumps(posting, sort_keys=True, default=str).encode("utf-8"),
+                              digest_size=16).hexdigest()
+    return key
+
+
+class JobStore:
+    """
+    SQLite store of raw and processed postings. Processed postings have a normalized
+    posting-skill table and indexes on title, location, company, source and scrape date,
+    so aggregate questions ("top skills in Riyadh for MLOps titles") are answered by
+    indexed SQL queries instead of a Python scan over every posting.
+
+    Postings are identified by their normalized (title, company, location) key, so re-scraped
+    postings update their row instead of adding one. Writes are batched into transactions.
+    One connection is shared by all threads and serialised with a lock.
+    """
+
+    def __init__(self, path: str = "data/jobs.sqlite"):
+        """
+        Args:
+            path (str): SQLite database file (created if missing), or ":memory:".
+        """
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(_SCHEMA)
+        self._skill_ids: Dict[str, int] = dict(
+            (name, skill_id) for skill_id, name in self._conn.execute("SELECT id, name FROM skills"))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- Writes -----------------------------------------------------------------------------
+
+    def upsert_raw(self, postings: Iterable[Dict], scraped_at: Optional[str] = None) -> int:
+        """
+        Inserts or updates raw postings in one transaction.
+
+        Args:
+            postings (Iterable[Dict]): Raw postings (WebSearchAgent/JobDetailAgent output).
+            scraped_at (Optional[str]): ISO date used for postings without a 'scraped_at' field. Defaults to today.
+
+        Returns:
+            int: Number of postings written.
+        """
+        default_date = scraped_at or date.today().isoformat()
+        rows = [(_record_key(p), p.get("title"), p.get("company"), p.get("location"), p.get("source"),
+                 p.get("url"), p.get("job_id"), p.get("description"), p.get("scraped_at") or default_date)
+                for p in postings]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO raw_postings (posting_key, title, company, location, source, url, job_id,"
+                " description, scraped_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(posting_key) DO UPDATE SET title = excluded.title, company = excluded.company,"
+                " location = excluded.location, source = excluded.source, url = excluded.url,"
+                " job_id = excluded.job_id, description = excluded.description, scraped_at = excluded.scraped_at",
+                rows)
+        return len(rows)
+
+    def upsert_processed(self, postings: Iterable[Dict], scraped_at: Optional[str] = None) -> int:
+        """
+        Inserts or updates structured postings and their skills in one transaction.
+
+        Args:
+            postings (Iterable[Dict]): Structured postings (DataExtractionAgent output).
+            scraped_at (Optional[str]): ISO date used for postings without a 'scraped_at' field. Defaults to today.
+
+        Returns:
+            int: Number of postings written.
+        """
+        default_date = scraped_at or date.today().isoformat()
+        postings = list(postings)
+        if not postings:
+            return 0
+        with self._lock, self._conn:
+            cursor = self._conn.cursor()
+            skill_rows = []
+            for post in postings:
+                cursor.execute(
+                    "INSERT INTO postings (posting_key, title, company, location, source, description, scraped_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT(posting_key) DO UPDATE SET title = excluded.title, company = excluded.company,"
+                    " location = excluded.location, source = excluded.source,"
+                    " description = excluded.description, scraped_at = excluded.scraped_at"
+                    " RETURNING id",
+                    (_record_key(post), post.get("title"), post.get("company"), post.get("location"),
+                     post.get("source"), post.get("description"), post.get("scraped_at") or default_date))
+                posting_id = cursor.fetchone()[0]
+                cursor.execute("DELETE FROM posting_skills WHERE posting_id = ?", (posting_id,))
+                for position, skill in enumerate(dict.fromkeys(post.get("skills") or ())):
+                    skill_rows.append((posting_id, self._skill_id(cursor, skill), position))
+            cursor.executemany("INSERT INTO posting_skills (posting_id, skill_id, position) VALUES (?, ?, ?)",
+                               skill_rows)
+        return len(postings)
+
+    def _skill_id(self, cursor: sqlite3.Cursor, name: str) -> int:
+        skill_id = self._skill_ids.get(name)
+        if skill_id is None:
+            cursor.execute("INSERT INTO skills (name) VALUES (?) ON CONFLICT(name) DO NOTHING", (name,))
+            skill_id = cursor.execute("SELECT id FROM skills WHERE name = ?", (name,)).fetchone()[0]
+            self._skill_ids[name] = skill_id
+        return skill_id
+
+    def batch_writer(self, processed: bool = True, batch_size: int = 500) -> "JobStoreWriter":
+        """
+        Returns a context manager with a `write(posting)` method that buffers postings and
+        upserts them `batch_size` at a time (e.g. as a `utils.streaming.tap` callback).
+        """
+        return JobStoreWriter(self, processed, batch_size)
+
+    # --- Aggregate queries --------------------------------------------------------------------
+
+    @staticmethod
+    def _where(filters: Dict) -> Tuple[str, List]:
+        unknown = set(filters) - set(_FILTERS)
+        if unknown:
+            raise ValueError(f"Unknown filters {sorted(unknown)}. Expected some of {sorted(_FILTERS)}.")
+        conditions, params = [], []
+        for name, value in filters.items():
+            if value is None:
+                continue
+            conditions.append(_FILTERS[name])
+            params.append(f"%{value}%" if name.endswith("_like") else value)
+        return (" WHERE " + " AND ".join(conditions)) if conditions else "", params
+
+    def _query(self, sql: str, params: List) -> List[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def posting_count(self, **filters) -> int:
+        """Number of processed postings matching the filters (see `_FILTERS` for the names)."""
+        where, params = self._where(filters)
+        return self._query(f"SELECT COUNT(*) FROM postings p{where}", params)[0][0]
+
+    def latest_scraped_at(self, **filters) -> Optional[str]:
+        """Most recent scrape date among the processed postings matching the filters."""
+        where, params = self._where(filters)
+        return self._query(f"SELECT MAX(p.scraped_at) FROM postings p{where}", params)[0][0]
+
+    def _top_column(self, column: str, n: Optional[int], filters: Dict) -> List[Tuple[str, int]]:
+        where, params = self._where(filters)
+        where = (where + " AND" if where else " WHERE") + f" p.{column} IS NOT NULL"
+        # Ties in first-stored order, like Counter.most_common over the postings in insertion order
+        sql = (f"SELECT p.{column}, COUNT(*) AS n FROM postings p{where}"
+               f" GROUP BY p.{column} ORDER BY n DESC, MIN(p.id)")
+        if n is not None:
+            sql += " LIMIT ?"
+            params.append(n)
+        return [(value, count) for value, count in self._query(sql, params)]
+
+    def top_titles(self, n: int = 10, **filters) -> List[Tuple[str, int]]:
+        return self._top_column("title", n, filters)
+
+    def location_distribution(self, **filters) -> List[Tuple[str, int]]:
+        return self._top_column("location", None, filters)
+
+    def top_companies(self, n: int = 10, **filters) -> List[Tuple[str, int]]:
+        return self._top_column("company", n, filters)
+
+    def top_skills(self, n: int = 10, **filters) -> List[Tuple[str, int]]:
+        """Most frequent skills among the processed postings matching the filters."""
+        where, params = self._where(filters)
+        sql = ("SELECT s.name, COUNT(*) AS n FROM postings p"
+               " JOIN posting_skills ps ON ps.posting_id = p.id JOIN skills s ON s.id = ps.skill_id"
+               f"{where} GROUP BY s.id ORDER BY n DESC, MIN(ps.posting_id * 65536 + ps.position) LIMIT ?")
+        return [(name, count) for name, count in self._query(sql, params + [n])]
+
+
+class JobStoreWriter:
+    """Buffered upserts for `JobStore.batch_writer`. Use as a context manager."""
+
+    def __init__(self, store: JobStore, processed: bool, batch_size: int):
+        self.store = store
+        self.processed = processed
+        self.batch_size = batch_size
+        self.count = 0
+        self._buffer: List[Dict] = []
+
+    def __enter__(self):
+        return self
+
+    def write(self, posting: Dict):
+        self._buffer.append(posting)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        upsert = self.store.upsert_processed if self.processed else self.store.upsert_raw
+        self.count += upsert(self._buffer)
+        self._buffer = []
+
+    def __exit__(self, *exc):
+        self.flush()
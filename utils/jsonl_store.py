@@ -0,0 +1,174 @@
+import argparse
+import gzip
+import json
+import logging
+import os
+import re
+from typing import Dict, Iterable, Iterator
+
+logger = logging.getLogger("JsonlStore")
+
+_WHITESPACE = re.compile(r"\s*")
+# Between two array elements: whitespace and the ',' delimiter
+_SEPARATORS = re.compile(r"\s*,*\s*")
+
+
+def _open(path: str, mode: str):
+    """Opens a text file, transparently gzip-compressed when the path ends with '.gz'."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class JsonlWriter:
+    """
+    Append-only JSON Lines writer: one record per line, written as soon as it arrives,
+    so nothing has to be held in memory. Paths ending in '.gz' are gzip-compressed
+    (each run appends a new gzip member, which gzip readers handle transparently).
+    Use as a context manager.
+    """
+
+    def __init__(self, path: str, append: bool = True):
+        """
+        Args:
+            path (str): Target file (e.g. "data/raw_jobs_data.jsonl" or "...jsonl.gz").
+            append (bool): Append to an existing file (default) or truncate it.
+        """
+        self.path = path
+        self.append = append
+        self.count = 0
+        self._file = None
+
+    def __enter__(self):
+        output_dir = os.path.dirname(self.path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        self._file = _open(self.path, "a" if self.append else "w")
+        return self
+
+    def write(self, record: Dict):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def write_all(self, records: Iterable[Dict]) -> int:
+        """Writes every record of an iterable; returns how many were written."""
+        for record in records:
+            self.write(record)
+        return self.count
+
+    def __exit__(self, *exc):
+        self._file.close()
+
+
+def iter_jsonl(path: str) -> Iterator[Dict]:
+    """
+    Streams the records of a JSON Lines file (gzip-aware) in constant memory.
+    Blank lines are ignored; a truncated or corrupt line (e.g. from an interrupted
+    append) is logged and skipped.
+
+    Args:
+        path (str): JSON Lines file to read.
+
+    Yields:
+        Dict: One record per line.
+    """
+    if not os.path.exists(path):
+        logger.warning(f"JSONL file not found: {path}")
+        return
+    with _open(path, "r") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Skipping corrupt line {line_number} in {path}: {e}")
+
+
+def iter_json_array(path: str, chunk_size: int = 1 << 20) -> Iterator[Dict]:
+    """
+    Streams the elements of a top-level JSON array file without loading the whole array,
+    decoding one element at a time from a sliding buffer.
+
+    Args:
+        path (str): File containing a JSON array (such as the legacy data/*.json files).
+        chunk_size (int): Number of characters read from disk at a time.
+
+    Yields:
+        Dict: The array's elements, in order.
+    """
+    decoder = json.JSONDecoder()
+    with _open(path, "r") as f:
+        buffer = f.read(chunk_size).lstrip()
+        # Leading whitespace may be longer than a chunk
+        while not buffer:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            buffer = chunk.lstrip()
+        if not buffer.startswith("["):
+            raise ValueError(f"{path} does not contain a JSON array.")
+        # Records are decoded in place from a read offset; the buffer is only trimmed (and
+        # copied) when a chunk is appended, i.e. once per chunk rather than once per record
+        index, eof = 1, False
+        while True:
+            index = _SEPARATORS.match(buffer, index).end()
+            if index < len(buffer) and buffer[index] == "]":
+                return
+            try:
+                record, end = decoder.raw_decode(buffer, index)
+                # The element is complete only once the delimiter that follows it (',' or ']')
+                # is in the buffer: a number cut at the buffer end ("2." | "5") decodes early
+                delimiter = _WHITESPACE.match(buffer, end).end()
+                if delimiter < len(buffer):
+                    complete = True
+                    if buffer[delimiter] not in ",]":
+                        if eof:
+                            raise json.JSONDecodeError("Expecting ',' delimiter", buffer, end)
+                        complete = False
+                else:
+                    complete = eof
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                complete = False
+            if not complete:
+                # The element (or its delimiter) spans past the end of the buffer: read more and retry
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer, index = buffer[index:] + chunk, 0
+                continue
+            yield record
+            index = end
+            if len(buffer) - index < chunk_size and not eof:
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer, index = buffer[index:] + chunk, 0
+
+
+def convert_json_array_to_jsonl(src: str, dst: str, append: bool = True) -> int:
+    """
+    Converts a JSON array file into JSON Lines in constant memory.
+
+    Args:
+        src (str): Source JSON array file.
+        dst (str): Destination JSON Lines file ('.gz' suffix for gzip).
+        append (bool): Append to `dst` if it exists instead of overwriting it.
+
+    Returns:
+        int: Number of records converted.
+    """
+    with JsonlWriter(dst, append=append) as writer:
+        count = writer.write_all(iter_json_array(src))
+    logger.info(f"Converted {count} records from {src} to {dst}.")
+    return count
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Convert a JSON array file (e.g. data/raw_jobs_data.json) to JSON Lines.")
+    parser.add_argument("src", help="Source JSON array file.")
+    parser.add_argument("dst", help="Destination .jsonl (or .jsonl.gz) file.")
+    parser.add_argument("--overwrite", action="store_true", help="Overwrite dst instead of appending to it.")
+    args = parser.parse_args()
+    convert_json_array_to_jsonl(args.src, args.dst, append=not args.overwrite)
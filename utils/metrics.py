@@ -0,0 +1,220 @@
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("Metrics")
+
+METRIC_PREFIX = "market_intel"
+# Returned by `Metrics.timer` while disabled: a shared no-op context manager
+_NULL_TIMER = nullcontext()
+
+
+def _label_key(labels: Dict) -> Tuple:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _prometheus_labels(label_key: Tuple) -> str:
+    if not label_key:
+        return ""
+    def escape(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in label_key) + "}"
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "label_key", "start")
+
+    def __init__(self, metrics: "Metrics", name: str, label_key: Tuple):
+        self.metrics = metrics
+        self.name = name
+        self.label_key = label_key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics._observe(self.name, self.label_key, time.perf_counter() - self.start)
+        return False
+
+
+class Metrics:
+    """
+    Process-wide counters, timers and per-stage peak memory of a pipeline run, exported to a
+    JSON file and a Prometheus textfile (node_exporter's textfile collector format).
+
+    Disabled by default: `count` then returns immediately and `timer` returns a shared no-op
+    context manager, so the instrumentation left in the agents costs one attribute check per
+    call. Worker processes (chart rendering, parallel extraction) have their own registry,
+    which is not merged into the parent's.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.track_memory = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forgets every recorded value (the start of a new run)."""
+        with self._lock:
+            self.counters: Dict[Tuple[str, Tuple], float] = defaultdict(float)
+            # (name, labels) -> [observations, total seconds, max seconds]
+            self.timers: Dict[Tuple[str, Tuple], List[float]] = {}
+            self.peak_memory: Dict[str, int] = {}
+            self.started_at = time.time()
+
+    def enable(self, track_memory: bool = False):
+        """
+        Args:
+            track_memory (bool): Record each stage's peak memory with tracemalloc. Tracing makes
+                                 allocation-heavy stages 2-4x slower (see benchmarks/bench_metrics.py).
+        """
+        self.reset()
+        self.enabled = True
+        self.track_memory = track_memory
+
+    def disable(self):
+        self.enabled = False
+
+    def count(self, name: str, value: float = 1, **labels):
+        """Adds `value` to the counter `name` with the given labels."""
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] += value
+
+    def _observe(self, name: str, label_key: Tuple, seconds: float):
+        with self._lock:
+            timer = self.timers.get((name, label_key))
+            if timer is None:
+                self.timers[(name, label_key)] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                timer[2] = max(timer[2], seconds)
+
+    def observe(self, name: str, seconds: float, **labels):
+        """Records a duration measured by the caller (e.g. a sleep) under the timer `name`."""
+        if self.enabled:
+            self._observe(name, _label_key(labels), seconds)
+
+    def timer(self, name: str, **labels):
+        """Context manager timing its block under the timer `name`."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, _label_key(labels))
+
+    def timed(self, name: str, **labels) -> Callable:
+        """Decorator timing each call of the function under the timer `name`."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.timer(name, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Times a pipeline stage ("stage" timer, `stage` label) and, with `track_memory`, records the
+        peak traced memory while it runs. Stages are not meant to be nested: an inner stage resets
+        the peak of the outer one.
+        """
+        if not self.enabled:
+            yield
+            return
+        started_tracing = False
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+        try:
+            with self.timer("stage", stage=name):
+                yield
+        finally:
+            if self.track_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                with self._lock:
+                    self.peak_memory[name] = max(peak, self.peak_memory.get(name, 0))
+                if started_tracing:
+                    tracemalloc.stop()
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at)),
+                "duration_seconds": round(time.time() - self.started_at, 3),
+                "counters": [{"name": name, "labels": dict(label_key), "value": value}
+                             for (name, label_key), value in sorted(self.counters.items())],
+                "timers": [{"name": name, "labels": dict(label_key), "count": int(count),
+                            "total_seconds": round(total, 6), "max_seconds": round(longest, 6)}
+                           for (name, label_key), (count, total, longest) in sorted(self.timers.items())],
+                "peak_memory_bytes": dict(self.peak_memory),
+            }
+
+    def to_prometheus(self) -> str:
+        """The recorded values in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            counters = defaultdict(list)
+            for (name, label_key), value in sorted(self.counters.items()):
+                counters[name].append((label_key, value))
+            for name, samples in counters.items():
+                lines.append(f"# TYPE {METRIC_PREFIX}_{name}_total counter")
+                lines.extend(f"{METRIC_PREFIX}_{name}_total{_prometheus_labels(key)} {value:g}" for key, value in samples)
+            timers = defaultdict(list)
+            for (name, label_key), values in sorted(self.timers.items()):
+                timers[name].append((label_key, values))
+            for name, samples in timers.items():
+                metric = f"{METRIC_PREFIX}_{name}_seconds"
+                lines.append(f"# TYPE {metric} summary")
+                for key, (count, total, _) in samples:
+                    lines.append(f"{metric}_sum{_prometheus_labels(key)} {total:.6f}")
+                    lines.append(f"{metric}_count{_prometheus_labels(key)} {int(count)}")
+            if self.peak_memory:
+                metric = f"{METRIC_PREFIX}_stage_peak_memory_bytes"
+                lines.append(f"# TYPE {metric} gauge")
+                lines.extend(f"{metric}{_prometheus_labels((('stage', stage),))} {peak}"
+                             for stage, peak in sorted(self.peak_memory.items()))
+        lines.append(f"# TYPE {METRIC_PREFIX}_run_timestamp_seconds gauge")
+        lines.append(f"{METRIC_PREFIX}_run_timestamp_seconds {self.started_at:.0f}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, output_dir: str, run_id: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Writes the run's metrics to `<output_dir>/run-<run_id>.json` and to
+        `<output_dir>/market_intel.prom` (overwritten by each run, for the textfile collector).
+        Both files are written atomically, via a temporary file.
+
+        Returns:
+            Tuple[str, str]: Paths of the JSON file and of the Prometheus textfile.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        run_id = run_id or time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started_at))
+        json_path = os.path.join(output_dir, f"run-{run_id}.json")
+        prom_path = os.path.join(output_dir, f"{METRIC_PREFIX}.prom")
+        for path, content in ((json_path, json.dumps(self.to_dict(), ensure_ascii=False, indent=2)),
+                              (prom_path, self.to_prometheus())):
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        logger.info(f"Run metrics written to {json_path} and {prom_path}")
+        return json_path, prom_path
+
+
+# The registry used by the agents and the pipeline
+METRICS = Metrics()
@@ -0,0 +1,155 @@
+import base64
+import hashlib
+import logging
+import os
+import re
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.jsonl_store import JsonlWriter, iter_jsonl
+
+logger = logging.getLogger("MinHash")
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+")
+
+
+def shingles(text: str, size: int = 3) -> List[str]:
+    """Lowercased word n-grams of a text (the whole text if it has fewer than `size` words)."""
+    words = _TOKEN_PATTERN.findall(text.lower())
+    if len(words) <= size:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+class MinHasher:
+    """
+    MinHash signatures of word shingles: the fraction of equal positions between two
+    signatures estimates the Jaccard similarity of the two shingle sets (standard error
+    about 1 / sqrt(num_perm)). Permutations are seeded, so signatures are comparable
+    across runs and processes.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        # Universal hashes h(x) = (a * x + b) mod p; a, b < 2**31 and x < 2**32 keep a * x + b within uint64
+        self._a = rng.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.int64).astype(np.uint64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        Returns the uint32 signature of a text, or None if it has no words.
+        """
+        tokens = shingles(text, self.shingle_size)
+        if not tokens:
+            return None
+        hashes = np.fromiter((zlib.crc32(token.encode("utf-8")) for token in set(tokens)),
+                             dtype=np.uint64)
+        # (num_perm, n_shingles) table of permuted hashes, minimised over the shingles
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % np.uint64(_MERSENNE_PRIME)
+        return permuted.min(axis=1).astype(np.uint32)
+
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return float(np.count_nonzero(first == second)) / len(first)
+
+
+class LSHIndex:
+    """
+    Persistent MinHash LSH index with exact-key lookups.
+
+    Signatures are cut into `bands` bands of `num_perm / bands` rows; two documents become
+    candidates when any band is identical, which happens with probability 1 - (1 - s**r)**b
+    for Jaccard similarity s (steep around (1 / b) ** (1 / r), ~0.77 for 8 bands of 8 rows).
+    Candidates are confirmed against the stored signatures, so a lookup touches only the
+    few documents sharing a bucket instead of the whole history.
+
+    The index is persisted as an append-only JSON Lines file (one entry per document)
+    and rebuilt in memory on load.
+    """
+
+    def __init__(self, path: Optional[str] = None, num_perm: int = 64, bands: int = 8):
+        """
+        Args:
+            path (Optional[str]): JSON Lines file of the index. None keeps it in memory only.
+            num_perm (int): Signature length; must be divisible by `bands`.
+            bands (int): Number of LSH bands.
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by the number of bands.")
+        self.path = path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.keys = set()
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        self._signatures: List[np.ndarray] = []
+        self._pending: List[Dict] = []
+        if path and os.path.exists(path):
+            self._load(path)
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows]
+            yield band, hashlib.blake2b(chunk.tobytes(), digest_size=8).digest()
+
+    def _index(self, key: Optional[str], signature: Optional[np.ndarray]):
+        if key is not None:
+            self.keys.add(key)
+        if signature is not None:
+            doc_id = len(self._signatures)
+            self._signatures.append(signature)
+            for band_key in self._band_keys(signature):
+                self._buckets.setdefault(band_key, []).append(doc_id)
+
+    def _load(self, path: str):
+        for entry in iter_jsonl(path):
+            signature = entry.get("minhash")
+            if signature is not None:
+                signature = np.frombuffer(base64.b64decode(signature), dtype=np.uint32)
+                if len(signature) != self.num_perm:
+                    logger.warning(f"Skipping index entry with a {len(signature)}-value signature in {path}.")
+                    signature = None
+            self._index(entry.get("key"), signature)
+        if self.keys or self._signatures:
+            logger.info(f"Loaded dedup index from {path}: {len(self.keys)} keys, {len(self)} signatures.")
+
+    def find_similar(self, signature: np.ndarray, threshold: float) -> Optional[float]:
+        """
+        Returns the highest estimated similarity >= `threshold` among the indexed documents
+        sharing an LSH bucket with the signature, or None if there is no such document.
+        """
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates.update(self._buckets.get(band_key, ()))
+        best = None
+        for doc_id in candidates:
+            similarity = MinHasher.similarity(signature, self._signatures[doc_id])
+            if similarity >= threshold and (best is None or similarity > best):
+                best = similarity
+        return best
+
+    def add(self, key: Optional[str], signature: Optional[np.ndarray]):
+        """Indexes a document; it is written to disk on the next `flush`."""
+        self._index(key, signature)
+        self._pending.append({
+            "key": key,
+            "minhash": base64.b64encode(signature.tobytes()).decode("ascii") if signature is not None else None,
+        })
+
+    def flush(self):
+        """Appends the documents added since the last flush to the index file."""
+        if not self.path or not self._pending:
+            return
+        with JsonlWriter(self.path) as writer:
+            writer.write_all(self._pending)
+        logger.info(f"Appended {len(self._pending)} entries to the dedup index {self.path}.")
+        self._pending = []
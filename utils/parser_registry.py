@@ -0,0 +1,57 @@
+import logging
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger("ParserRegistry")
+
+# A parser takes the raw HTML of a results page and returns the job postings found on it.
+# Parsers must be picklable (module-level functions or functools.partial of one) so that
+# they can be shipped to a process pool.
+PageParser = Callable[[str], List[Dict]]
+
+
+class ParserRegistry:
+    """
+    Maps job board hostnames to page parser callables.
+    A parser registered for "linkedin.com" also serves "www.linkedin.com",
+    "eg.linkedin.com", etc.; the most specific registered host wins.
+    """
+
+    def __init__(self, parsers: Optional[Dict[str, PageParser]] = None):
+        self._parsers: Dict[str, PageParser] = {}
+        for host, parser in (parsers or {}).items():
+            self.register(host, parser)
+
+    def register(self, host: str, parser: PageParser):
+        """
+        Registers (or replaces) the parser for a hostname.
+
+        Args:
+            host (str): Hostname without scheme or port, e.g. "bayt.com".
+            parser (PageParser): Callable turning page HTML into a list of job postings.
+        """
+        self._parsers[host.lower().strip(".")] = parser
+        logger.debug(f"Registered parser for host '{host}'.")
+
+    def resolve(self, url: str) -> Optional[PageParser]:
+        """
+        Returns the parser for a URL's host, walking up to parent domains, or None.
+        """
+        host = (urlparse(url).hostname or "").lower()
+        while host:
+            parser = self._parsers.get(host)
+            if parser is not None:
+                return parser
+            host = host.partition(".")[2]
+        return None
+
+    def copy(self) -> "ParserRegistry":
+        """Returns an independent registry with the same host -> parser entries."""
+        return ParserRegistry(dict(self._parsers))
+
+    def hosts(self) -> List[str]:
+        """Returns the registered hostnames."""
+        return sorted(self._parsers)
+
+    def __contains__(self, url: str) -> bool:
+        return self.resolve(url) is not None
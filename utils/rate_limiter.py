@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """
+    Token bucket: allows bursts of up to `capacity` requests and refills at `rate` tokens
+    per second afterwards. Each acquire reserves the next free slot under a thread lock and
+    then waits for it, so one bucket can be shared by several event loops (each `asyncio.run`)
+    and by blocking code in worker threads, and tokens are handed out in FIFO order.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        """
+        Args:
+            rate (float): Tokens added per second (i.e. sustained requests per second).
+            capacity (int): Maximum number of tokens that can be stored (burst size).
+        """
+        if rate <= 0:
+            raise ValueError("Token bucket rate must be positive.")
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def reserve(self) -> float:
+        """
+        Consumes a token, going into debt if none is left.
+
+        Returns:
+            float: Seconds to wait before the reserved token may be used (0 if available now).
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self):
+        """Waits until a token is available and consumes it."""
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+    def acquire_blocking(self):
+        """Blocking version of `acquire`, for synchronous code (e.g. retries in `fetch_html`)."""
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+
+class HostRateLimiter:
+    """
+    Keeps one TokenBucket per host so politeness is enforced per domain
+    rather than through a global sleep between every request.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1, host_rates: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            rate (float): Default requests per second allowed for each host.
+            capacity (int): Burst size for each host bucket.
+            host_rates (Optional[Dict[str, float]]): Per-host overrides, keyed by netloc (e.g. "www.linkedin.com").
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.host_rates = host_rates or {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_for(url: str) -> str:
+        """Returns the netloc used as the bucket key for a URL."""
+        return urlparse(url).netloc.lower()
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        host = self.host_for(url)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.host_rates.get(host, self.rate), self.capacity)
+                self._buckets[host] = bucket
+        return bucket
+
+    async def acquire(self, url: str):
+        """Waits for the bucket of the URL's host to release a token."""
+        await self.bucket_for(url).acquire()
+
+    def acquire_blocking(self, url: str):
+        """Blocking version of `acquire`."""
+        self.bucket_for(url).acquire_blocking()
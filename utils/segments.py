@@ -0,0 +1,98 @@
+import re
+import unicodedata
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from utils.analysis_state import AnalysisState
+from utils.gazetteer import resolve_location
+from utils.title_normalizer import role_family
+
+ALL_SEGMENT = "all"
+SEGMENT_KINDS = ("country", "role")
+
+
+class Segment(NamedTuple):
+    kind: str     # "all", "country" or "role"
+    name: str     # Display name ("United Arab Emirates", "NLP & LLM")
+
+    @property
+    def slug(self) -> str:
+        """File-name safe identifier, e.g. 'country-united-arab-emirates'."""
+        ascii_name = unicodedata.normalize("NFKD", self.name).encode("ascii", "ignore").decode("ascii")
+        words = re.findall(r"[a-z0-9]+", ascii_name.lower())
+        return "-".join([self.kind] + words) if self.kind != ALL_SEGMENT else ALL_SEGMENT
+
+
+OVERALL_SEGMENT = Segment(ALL_SEGMENT, "All MENA")
+
+
+def posting_country(post: Dict) -> Optional[str]:
+    """Country of a structured posting: its 'country' field, else resolved from its location."""
+    if post.get("country"):
+        return post["country"]
+    place = resolve_location(post.get("location"))
+    return place.country if place else None
+
+
+class SegmentedAnalysis:
+    """
+    Analysis counters (one AnalysisState) for every segment of the postings at once: all
+    postings, each country and each role family. A single pass over the postings updates the
+    state of every segment a posting belongs to, so the insights of N segment reports cost
+    one read of the history instead of N.
+    """
+
+    def __init__(self, kinds: Iterable[str] = SEGMENT_KINDS, title_transform: Optional[Callable] = None):
+        """
+        Args:
+            kinds (Iterable[str]): Segment kinds to count besides "all" ("country", "role").
+            title_transform (Optional[Callable]): Maps raw titles to the counted label (e.g. a TitleNormalizer).
+        """
+        self.kinds = tuple(kinds)
+        unknown = set(self.kinds) - set(SEGMENT_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown segment kinds {sorted(unknown)}. Expected any of {SEGMENT_KINDS}.")
+        self.title_transform = title_transform
+        self.states: Dict[Segment, AnalysisState] = {OVERALL_SEGMENT: AnalysisState()}
+
+    def segments_of(self, post: Dict) -> List[Segment]:
+        """Segments a structured posting (with its title already transformed) belongs to."""
+        segments = [OVERALL_SEGMENT]
+        if "country" in self.kinds:
+            country = posting_country(post)
+            if country:
+                segments.append(Segment("country", country))
+        if "role" in self.kinds:
+            segments.append(Segment("role", role_family(post.get("title"))))
+        return segments
+
+    def add(self, post: Dict):
+        """Adds one structured posting to the state of each of its segments."""
+        if self.title_transform is not None and post.get("title") is not None:
+            post = {**post, "title": self.title_transform(post["title"])}
+        for segment in self.segments_of(post):
+            state = self.states.get(segment)
+            if state is None:
+                state = self.states[segment] = AnalysisState()
+            state.add(post)
+
+    def update(self, postings: Iterable[Dict]) -> "SegmentedAnalysis":
+        """
+        Adds structured postings (one pass, whatever the number of segments).
+
+        Returns:
+            SegmentedAnalysis: self, to allow chaining.
+        """
+        for post in postings:
+            self.add(post)
+        return self
+
+    def segments(self, min_postings: int = 1) -> List[Segment]:
+        """Segments with at least `min_postings` postings: "all" first, then by kind and size."""
+        kept = [segment for segment, state in self.states.items() if state.posting_count >= min_postings]
+        order = {ALL_SEGMENT: 0, **{kind: i + 1 for i, kind in enumerate(SEGMENT_KINDS)}}
+        return sorted(kept, key=lambda segment: (order[segment.kind], -self.states[segment].posting_count,
+                                                  segment.name))
+
+    @property
+    def overall(self) -> AnalysisState:
+        return self.states[OVERALL_SEGMENT]
@@ -0,0 +1,359 @@
+import base64
+import hashlib
+import heapq
+import json
+import logging
+import math
+import os
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("Sketches")
+
+
+def _hash64(value) -> int:
+    """Stable 64-bit hash (Python's `hash` is salted per process, so it cannot be merged across runs)."""
+    return int.from_bytes(hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitter summary (Metwally et al., 2005) with a fixed number of counters.
+
+    Error bounds, for a stream of N items summarised with `capacity` = m counters:
+    - every estimated count over-estimates the true count by at most `error(item)` <= N / m;
+    - every item whose true count exceeds N / m is guaranteed to be in the summary.
+    Memory is O(m) regardless of how many distinct items the stream contains.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        """
+        Args:
+            capacity (int): Number of counters kept (m above).
+        """
+        if capacity < 1:
+            raise ValueError("Space-Saving capacity must be at least 1.")
+        self.capacity = capacity
+        self.total = 0
+        self._counts: Dict[Hashable, int] = {}
+        self._errors: Dict[Hashable, int] = {}
+        # Min-heap of (count, item); entries go stale when a count grows and are fixed up lazily
+        self._heap: List[Tuple[int, Hashable]] = []
+
+    def __len__(self):
+        return len(self._counts)
+
+    def __contains__(self, item):
+        return item in self._counts
+
+    def offer(self, item: Hashable, count: int = 1) -> Optional[Hashable]:
+        """
+        Adds `count` occurrences of `item`.
+
+        Returns:
+            Optional[Hashable]: The item evicted to make room, if any.
+        """
+        self.total += count
+        if item in self._counts:
+            self._counts[item] += count
+            return None
+        if len(self._counts) < self.capacity:
+            self._counts[item] = count
+            self._errors[item] = 0
+            heapq.heappush(self._heap, (count, item))
+            return None
+        evicted, min_count = self._pop_min()
+        # The newcomer inherits the evicted counter: its count may be over-estimated by min_count
+        self._counts[item] = min_count + count
+        self._errors[item] = min_count
+        heapq.heappush(self._heap, (min_count + count, item))
+        return evicted
+
+    def _pop_min(self) -> Tuple[Hashable, int]:
+        while True:
+            count, item = heapq.heappop(self._heap)
+            current = self._counts.get(item)
+            if current == count:
+                del self._counts[item]
+                del self._errors[item]
+                return item, count
+            if current is not None:
+                heapq.heappush(self._heap, (current, item))
+
+    def min_count(self) -> int:
+        """Smallest kept count once the summary is full (the bound for unseen items), 0 otherwise."""
+        return min(self._counts.values()) if len(self._counts) >= self.capacity else 0
+
+    def estimate(self, item: Hashable) -> int:
+        """Upper bound of the item's count (for unseen items: `min_count()`)."""
+        return self._counts.get(item, self.min_count())
+
+    def error(self, item: Hashable) -> int:
+        """Maximum over-estimation of `estimate(item)`."""
+        return self._errors.get(item, self.min_count())
+
+    def max_error(self) -> float:
+        """Guaranteed bound N / m on the over-estimation of any count."""
+        return self.total / self.capacity
+
+    def top(self, k: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        """
+        Returns the k items with the highest estimated counts as (item, count) pairs,
+        highest first (ties by item order of arrival in the summary). None returns all.
+        """
+        items = sorted(self._counts.items(), key=lambda pair: pair[1], reverse=True)
+        return items if k is None else items[:k]
+
+    def merge(self, other: "SpaceSaving") -> List[Hashable]:
+        """
+        Adds another summary (e.g. another shard or day) into this one. An item missing from a
+        full summary is charged that summary's `min_count()` as count and error, so the merged
+        estimates remain upper bounds with error <= (N1 + N2) / m.
+
+        Returns:
+            List[Hashable]: Items dropped because the merged summary exceeded `capacity`.
+        """
+        own_min, other_min = self.min_count(), other.min_count()
+        counts, errors = {}, {}
+        for item in self._counts.keys() | other._counts.keys():
+            counts[item] = self._counts.get(item, own_min) + other._counts.get(item, other_min)
+            errors[item] = self._errors.get(item, own_min) + other._errors.get(item, other_min)
+        kept = sorted(counts, key=counts.get, reverse=True)
+        dropped = kept[self.capacity:]
+        self.total += other.total
+        self._counts = {item: counts[item] for item in kept[:self.capacity]}
+        self._errors = {item: errors[item] for item in self._counts}
+        self._heap = [(count, item) for item, count in self._counts.items()]
+        heapq.heapify(self._heap)
+        return dropped
+
+    def to_dict(self) -> Dict:
+        return {
+            "capacity": self.capacity,
+            "total": self.total,
+            "counters": [[item, count, self._errors[item]] for item, count in self._counts.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SpaceSaving":
+        summary = cls(data["capacity"])
+        summary.total = data["total"]
+        for item, count, error in data["counters"]:
+            summary._counts[item] = count
+            summary._errors[item] = error
+        summary._heap = [(count, item) for item, count in summary._counts.items()]
+        heapq.heapify(summary._heap)
+        return summary
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct counter (Flajolet et al., 2007) with 2**precision one-byte registers.
+
+    The relative standard error of `count()` is about 1.04 / sqrt(2**precision)
+    (precision 10: 3.3% with 1 KiB, precision 12: 1.6% with 4 KiB, precision 14: 0.8% with 16 KiB).
+    Merging two sketches (register-wise max) gives exactly the sketch of the union.
+    """
+
+    def __init__(self, precision: int = 12):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18.")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add(self, value):
+        h = _hash64(value)
+        index = h >> (64 - self.precision)
+        remainder = h & ((1 << (64 - self.precision)) - 1)
+        # Position of the leftmost 1-bit in the remaining (64 - p) bits
+        rank = (64 - self.precision) - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / float(np.sum(np.exp2(-self.registers.astype(np.float64))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction: linear counting
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precisions.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def to_dict(self) -> Dict:
+        return {"precision": self.precision,
+                "registers": base64.b64encode(self.registers.tobytes()).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "HyperLogLog":
+        sketch = cls(data["precision"])
+        sketch.registers = np.frombuffer(base64.b64decode(data["registers"]), dtype=np.uint8).copy()
+        return sketch
+
+
+class SketchState:
+    """
+    Approximate, fixed-size counterpart of `AnalysisState`: Space-Saving summaries for titles,
+    skills and locations and one HyperLogLog of distinct companies per tracked location.
+
+    Memory does not depend on the number of postings or distinct values: at most
+    `title_capacity + skill_capacity + location_capacity` counters plus `location_capacity`
+    HyperLogLogs of 2**`hll_precision` bytes. With the defaults (1000/500/200 counters,
+    precision 10) that is well under 1 MiB. Top-k counts over-estimate by at most
+    N / capacity (see `SpaceSaving`), distinct company counts are within about
+    1.04 / sqrt(2**hll_precision) relative error (see `HyperLogLog`).
+    """
+
+    VERSION = 1
+
+    def __init__(self, title_capacity: int = 1000, skill_capacity: int = 500,
+                 location_capacity: int = 200, hll_precision: int = 10):
+        self.posting_count = 0
+        self.hll_precision = hll_precision
+        self.titles = SpaceSaving(title_capacity)
+        self.skills = SpaceSaving(skill_capacity)
+        self.locations = SpaceSaving(location_capacity)
+        # Distinct companies for the locations currently kept by `self.locations`
+        self.companies_by_location: Dict[str, HyperLogLog] = {}
+        # Most recent 'scraped_at' ISO date among the counted postings
+        self.latest_scraped_at: Optional[str] = None
+
+    def update(self, new_postings: Iterable[Dict]) -> "SketchState":
+        """
+        Adds structured postings to the sketches. Missing titles/locations are ignored.
+
+        Returns:
+            SketchState: self, to allow chaining.
+        """
+        for post in new_postings:
+            self.add(post)
+        return self
+
+    def add(self, post: Dict):
+        """Adds one structured posting (e.g. as a `utils.streaming.tap` callback)."""
+        self.posting_count += 1
+        title = post.get("title")
+        if title is not None:
+            self.titles.offer(title)
+        for skill in post.get("skills") or ():
+            self.skills.offer(skill)
+        location = post.get("location")
+        if location is not None:
+            evicted = self.locations.offer(location)
+            if evicted is not None:
+                self.companies_by_location.pop(evicted, None)
+            company = post.get("company")
+            if company is not None:
+                self._companies(location).add(company)
+        scraped_at = post.get("scraped_at")
+        if scraped_at and (self.latest_scraped_at is None or scraped_at > self.latest_scraped_at):
+            self.latest_scraped_at = scraped_at
+
+    def _companies(self, location: str) -> HyperLogLog:
+        sketch = self.companies_by_location.get(location)
+        if sketch is None:
+            sketch = self.companies_by_location[location] = HyperLogLog(self.hll_precision)
+        return sketch
+
+    def merge(self, other: "SketchState") -> "SketchState":
+        """
+        Adds the sketches of another state (e.g. another shard or day) to this one.
+
+        Returns:
+            SketchState: self, to allow chaining.
+        """
+        self.posting_count += other.posting_count
+        self.titles.merge(other.titles)
+        self.skills.merge(other.skills)
+        for location in self.locations.merge(other.locations):
+            self.companies_by_location.pop(location, None)
+        for location, sketch in other.companies_by_location.items():
+            if location in self.locations:
+                self._companies(location).merge(sketch)
+        if other.latest_scraped_at and (self.latest_scraped_at is None
+                                        or other.latest_scraped_at > self.latest_scraped_at):
+            self.latest_scraped_at = other.latest_scraped_at
+        return self
+
+    def top_titles(self, n: int = 10) -> List[Tuple[str, int]]:
+        return self.titles.top(n)
+
+    def top_skills(self, n: int = 10) -> List[Tuple[str, int]]:
+        return self.skills.top(n)
+
+    def location_distribution(self) -> List[Tuple[str, int]]:
+        return self.locations.top()
+
+    def distinct_companies(self, location: str) -> int:
+        """Estimated number of distinct companies posting in a location (0 if it is not tracked)."""
+        sketch = self.companies_by_location.get(location)
+        return sketch.count() if sketch is not None else 0
+
+    def distinct_companies_by_location(self) -> List[Tuple[str, int]]:
+        """Estimated distinct companies per tracked location, in `location_distribution` order."""
+        return [(location, self.distinct_companies(location)) for location, _ in self.location_distribution()]
+
+    def error_bounds(self) -> Dict[str, float]:
+        """Current worst-case count over-estimation per summary and the HyperLogLog relative error."""
+        return {
+            "title_count": self.titles.max_error(),
+            "skill_count": self.skills.max_error(),
+            "location_count": self.locations.max_error(),
+            "distinct_companies_relative": 1.04 / math.sqrt(1 << self.hll_precision),
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": self.VERSION,
+            "posting_count": self.posting_count,
+            "hll_precision": self.hll_precision,
+            "titles": self.titles.to_dict(),
+            "skills": self.skills.to_dict(),
+            "locations": self.locations.to_dict(),
+            "companies_by_location": {location: sketch.to_dict()
+                                      for location, sketch in self.companies_by_location.items()},
+            "latest_scraped_at": self.latest_scraped_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SketchState":
+        state = cls(hll_precision=data.get("hll_precision", 10))
+        state.posting_count = data.get("posting_count", 0)
+        if "titles" in data:
+            state.titles = SpaceSaving.from_dict(data["titles"])
+            state.skills = SpaceSaving.from_dict(data["skills"])
+            state.locations = SpaceSaving.from_dict(data["locations"])
+        state.companies_by_location = {location: HyperLogLog.from_dict(sketch)
+                                       for location, sketch in data.get("companies_by_location", {}).items()}
+        state.latest_scraped_at = data.get("latest_scraped_at")
+        return state
+
+    def save(self, path: str):
+        """Writes the sketches to a JSON file (atomically, via a temporary file)."""
+        output_dir = os.path.dirname(path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        logger.info(f"Sketch state with {self.posting_count} postings saved to {path}")
+
+    @classmethod
+    def load(cls, path: str) -> "SketchState":
+        """Reads a state saved by `save`; returns an empty state if the file does not exist."""
+        if not os.path.exists(path):
+            logger.info(f"No sketch state at {path}. Starting from an empty state.")
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
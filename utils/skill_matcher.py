@@ -0,0 +1,67 @@
+import re
+from typing import Dict, List, Tuple
+
+
+class SkillMatcher:
+    """
+    Keyword matcher compiled once from a categorised keyword dictionary.
+
+    The keywords are loaded into a character trie, and the trie is rendered as a single
+    regular expression (shared prefixes become one branch, e.g. "data warehousing" and
+    "data lakes" share "data "). The regex engine then walks the trie in C, so each
+    description is scanned in one pass instead of trying every keyword at every word start.
+
+    Matching is case-insensitive and uses `\\b` word boundaries, exactly like the
+    `\\b(?:kw1|kw2|...)\\b` alternation it replaces. When several keywords match at the
+    same position the longest one wins (the alternation picked the first listed one; the
+    two only differ when a keyword is a whole-word prefix of another, e.g. "data" and
+    "data lakes", which the default keyword list does not contain).
+    """
+
+    def __init__(self, skill_keywords: Dict[str, List[str]]):
+        """
+        Args:
+            skill_keywords (Dict[str, List[str]]): Mapping of category name -> list of keywords.
+                                                   A keyword listed in several categories keeps the first one.
+        """
+        self.skill_categories: Dict[str, str] = {}
+        for category, keywords in skill_keywords.items():
+            for keyword in keywords:
+                self.skill_categories.setdefault(keyword.lower(), category)
+
+        trie: Dict = {}
+        for keyword in self.skill_categories:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = True # End-of-keyword marker
+        self.pattern = re.compile(r'\b(?:' + self._trie_to_regex(trie) + r')\b', re.IGNORECASE)
+
+    @classmethod
+    def _trie_to_regex(cls, node: Dict) -> str:
+        """
+        Renders a trie node as a regex fragment. Children are tried before the end
+        marker, so longer keywords are preferred when both could match.
+        """
+        branches = [re.escape(char) + cls._trie_to_regex(child)
+                    for char, child in sorted(node.items()) if char]
+        ends_here = '' in node
+        if not branches:
+            return ''
+        if len(branches) == 1 and not ends_here:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ('|' if ends_here else '') + ')'
+
+    def match(self, text: str) -> List[str]:
+        """
+        Returns the sorted unique keywords found in the text (lowercased).
+        """
+        if not text:
+            return []
+        return sorted({match.lower() for match in self.pattern.findall(text)})
+
+    def match_with_categories(self, text: str) -> List[Tuple[str, str]]:
+        """
+        Returns (keyword, category) pairs for the keywords found in the text, sorted by keyword.
+        """
+        return [(skill, self.skill_categories.get(skill)) for skill in self.match(text)]
@@ -0,0 +1,272 @@
+import json
+import logging
+import os
+from collections import Counter
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("SkillMatrix")
+
+
+class SkillMatrix:
+    """
+    Encodes each posting's skill list as one row of a packed bit matrix over the keyword
+    vocabulary (bit j set = skill j mentioned; ceil(V / 8) bytes per posting instead of a
+    list of strings), and computes skill statistics from it with vectorized NumPy:
+    per-skill counts, the skill co-occurrence matrix, lift, and category roll-ups.
+    """
+
+    def __init__(self, skill_keywords: Dict[str, List[str]]):
+        """
+        Args:
+            skill_keywords (Dict[str, List[str]]): Category -> skill keywords
+                                                   (e.g. `DataExtractionAgent.skill_keywords`).
+        """
+        self.categories = list(skill_keywords)
+        self.vocabulary: List[str] = list(dict.fromkeys(
+            skill for skills in skill_keywords.values() for skill in skills))
+        self.index = {skill: i for i, skill in enumerate(self.vocabulary)}
+        # (V, K) membership of each skill in each category
+        self.category_matrix = np.zeros((len(self.vocabulary), len(self.categories)), dtype=bool)
+        for k, skills in enumerate(skill_keywords.values()):
+            self.category_matrix[[self.index[skill] for skill in skills], k] = True
+
+    @property
+    def size(self) -> int:
+        return len(self.vocabulary)
+
+    def encode(self, postings: Iterable[Dict], chunk_size: int = 100_000) -> np.ndarray:
+        """
+        Encodes the 'skills' lists of postings. Skills outside the vocabulary are ignored.
+
+        Args:
+            postings (Iterable[Dict]): Structured job entries.
+            chunk_size (int): Postings encoded per batch (bounds the temporary bool matrix).
+
+        Returns:
+            np.ndarray: uint8 array of shape (n_postings, ceil(V / 8)), one packed row per posting.
+        """
+        index = self.index
+        chunks = []
+        postings = iter(postings)
+        while True:
+            chunk = list(islice(postings, chunk_size))
+            if not chunk:
+                break
+            rows, cols = [], []
+            for row, post in enumerate(chunk):
+                for skill in post.get("skills") or ():
+                    col = index.get(skill)
+                    if col is not None:
+                        rows.append(row)
+                        cols.append(col)
+            dense = np.zeros((len(chunk), self.size), dtype=bool)
+            dense[rows, cols] = True
+            chunks.append(np.packbits(dense, axis=1))
+        if not chunks:
+            return np.zeros((0, (self.size + 7) // 8), dtype=np.uint8)
+        return np.concatenate(chunks)
+
+    def unpack(self, packed: np.ndarray) -> np.ndarray:
+        """(n, V) bool matrix of packed rows."""
+        return np.unpackbits(packed, axis=1, count=self.size).astype(bool)
+
+    def _dense_chunks(self, packed: np.ndarray, chunk_size: int):
+        for start in range(0, len(packed), chunk_size):
+            yield np.unpackbits(packed[start:start + chunk_size], axis=1, count=self.size)
+
+    def cooccurrence(self, packed: np.ndarray, chunk_size: int = 100_000) -> np.ndarray:
+        """
+        Skill co-occurrence matrix: entry (i, j) is the number of postings mentioning both
+        skills i and j; the diagonal holds the per-skill posting counts. Computed as X^T X
+        over chunks of unpacked rows (float32 products are exact for chunk counts < 2**24).
+
+        Returns:
+            np.ndarray: int64 array of shape (V, V).
+        """
+        counts = np.zeros((self.size, self.size), dtype=np.int64)
+        for dense in self._dense_chunks(packed, chunk_size):
+            dense = dense.astype(np.float32)
+            counts += (dense.T @ dense).astype(np.int64)
+        return counts
+
+    def skill_counts(self, packed: np.ndarray, chunk_size: int = 100_000) -> np.ndarray:
+        """Number of postings mentioning each skill (same as the co-occurrence diagonal)."""
+        counts = np.zeros(self.size, dtype=np.int64)
+        for dense in self._dense_chunks(packed, chunk_size):
+            counts += dense.sum(axis=0, dtype=np.int64)
+        return counts
+
+    @staticmethod
+    def lift(cooccurrence: np.ndarray, n_postings: int) -> np.ndarray:
+        """
+        Lift of each skill pair: P(i and j) / (P(i) * P(j)). Above 1 means the skills appear
+        together more often than if they were independent. Pairs involving an unseen skill get 0.
+        """
+        counts = np.diag(cooccurrence).astype(np.float64)
+        expected = np.outer(counts, counts)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            lift = np.where(expected > 0, cooccurrence * float(n_postings) / expected, 0.0)
+        return lift
+
+    def category_counts(self, packed: np.ndarray, chunk_size: int = 100_000) -> Dict[str, int]:
+        """Number of postings mentioning at least one skill of each category."""
+        counts = np.zeros(len(self.categories), dtype=np.int64)
+        membership = self.category_matrix.astype(np.float32)
+        for dense in self._dense_chunks(packed, chunk_size):
+            counts += ((dense.astype(np.float32) @ membership) > 0).sum(axis=0)
+        return {category: int(count) for category, count in zip(self.categories, counts)}
+
+    def top_pairs(self, cooccurrence: np.ndarray, n_postings: int, k: int = 10,
+                  min_count: int = 1, by: str = "count") -> List[Dict]:
+        """
+        Ranks skill pairs (i < j) by co-occurrence count or by lift.
+
+        Args:
+            cooccurrence (np.ndarray): Output of `cooccurrence`.
+            n_postings (int): Number of encoded postings.
+            k (int): Number of pairs to return.
+            min_count (int): Pairs seen together fewer times are ignored (lift is noisy on rare pairs).
+            by (str): "count" or "lift".
+
+        Returns:
+            List[Dict]: {"skills": (a, b), "count", "lift"} entries, best first.
+        """
+        if by not in ("count", "lift"):
+            raise ValueError("top_pairs can rank by 'count' or 'lift'.")
+        lift = self.lift(cooccurrence, n_postings)
+        i, j = np.triu_indices(self.size, k=1)
+        pair_counts = cooccurrence[i, j]
+        keep = pair_counts >= max(min_count, 1)
+        i, j, pair_counts = i[keep], j[keep], pair_counts[keep]
+        scores = pair_counts if by == "count" else lift[i, j]
+        order = np.argsort(-scores, kind="stable")[:k]
+        return [{"skills": (self.vocabulary[i[o]], self.vocabulary[j[o]]),
+                 "count": int(pair_counts[o]), "lift": round(float(lift[i[o], j[o]]), 3)}
+                for o in order]
+
+
+class SkillStats:
+    """
+    Persistent, mergeable skill co-occurrence matrix and category counts over the posting
+    history: the counterpart of AnalysisState for skill pairs. Each batch of new postings is
+    bitmask-encoded with a `SkillMatrix` and added with one matrix product, so refreshing the
+    associations costs O(new postings). Postings added one at a time (`add`, e.g. from a
+    stream) are buffered and encoded in chunks.
+    """
+
+    VERSION = 1
+
+    def __init__(self, skill_keywords: Dict[str, List[str]], chunk_size: int = 10_000):
+        """
+        Args:
+            skill_keywords (Dict[str, List[str]]): Category -> skill keywords.
+            chunk_size (int): Postings buffered by `add` before they are encoded.
+        """
+        self.matrix = SkillMatrix(skill_keywords)
+        self.chunk_size = chunk_size
+        self.posting_count = 0
+        self.cooccurrence = np.zeros((self.matrix.size, self.matrix.size), dtype=np.int64)
+        self.category_counts = Counter()
+        self._pending: List[Dict] = []
+
+    def update(self, new_postings: Iterable[Dict]) -> "SkillStats":
+        """
+        Adds structured postings not yet counted (all skills outside the vocabulary are ignored).
+
+        Returns:
+            SkillStats: self, to allow chaining.
+        """
+        packed = self.matrix.encode(new_postings)
+        self.posting_count += len(packed)
+        self.cooccurrence += self.matrix.cooccurrence(packed)
+        self.category_counts.update(self.matrix.category_counts(packed))
+        return self
+
+    def add(self, post: Dict):
+        """Buffers one structured posting; the buffer is encoded every `chunk_size` postings (see `flush`)."""
+        self._pending.append(post)
+        if len(self._pending) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> "SkillStats":
+        """Encodes the postings buffered by `add`."""
+        pending, self._pending = self._pending, []
+        return self.update(pending) if pending else self
+
+    def merge(self, other: "SkillStats") -> "SkillStats":
+        """Adds the counts of another SkillStats over the same keywords (e.g. another shard or day)."""
+        self.flush()
+        other.flush()
+        self.posting_count += other.posting_count
+        self.cooccurrence += other.cooccurrence
+        self.category_counts.update(other.category_counts)
+        return self
+
+    def top_pairs(self, k: int = 10, min_count: int = 2, by: str = "count") -> List[Dict]:
+        """Skill pairs ranked by co-occurrence count or lift (see `SkillMatrix.top_pairs`)."""
+        self.flush()
+        return self.matrix.top_pairs(self.cooccurrence, self.posting_count, k, min_count, by)
+
+    def category_distribution(self) -> List[Tuple[str, int]]:
+        """(category, postings mentioning at least one of its skills), most frequent first."""
+        self.flush()
+        return [(category, count) for category, count in self.category_counts.most_common() if count]
+
+    def heatmap_data(self, n: int = 15) -> Tuple[List[str], List[List[int]]]:
+        """
+        The `n` most frequent skills and their co-occurrence sub-matrix (diagonal: postings per
+        skill), as JSON-friendly lists for `generate_heatmap`.
+        """
+        self.flush()
+        counts = np.diag(self.cooccurrence)
+        keep = np.argsort(-counts, kind="stable")[:n]
+        keep = keep[counts[keep] > 0]
+        return [self.matrix.vocabulary[i] for i in keep], self.cooccurrence[np.ix_(keep, keep)].tolist()
+
+    def to_dict(self) -> Dict:
+        self.flush()
+        i, j = np.nonzero(np.triu(self.cooccurrence))
+        vocabulary = self.matrix.vocabulary
+        return {
+            "version": self.VERSION,
+            "posting_count": self.posting_count,
+            # Sparse upper triangle (with the diagonal) by skill name, so the keywords can change between runs
+            "pairs": [[vocabulary[a], vocabulary[b], int(self.cooccurrence[a, b])] for a, b in zip(i, j)],
+            "category_counts": dict(self.category_counts),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, skill_keywords: Dict[str, List[str]]) -> "SkillStats":
+        stats = cls(skill_keywords)
+        if data.get("version") != cls.VERSION:
+            return stats
+        stats.posting_count = data.get("posting_count", 0)
+        index = stats.matrix.index
+        for a, b, count in data.get("pairs", []):
+            if a in index and b in index:
+                stats.cooccurrence[index[a], index[b]] = stats.cooccurrence[index[b], index[a]] = count
+        stats.category_counts = Counter({category: count for category, count in data.get("category_counts", {}).items()
+                                         if category in stats.matrix.categories})
+        return stats
+
+    def save(self, path: str):
+        """Writes the counts to a JSON file (atomically, via a temporary file)."""
+        output_dir = os.path.dirname(path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        logger.info(f"Skill statistics over {self.posting_count} postings saved to {path}")
+
+    @classmethod
+    def load(cls, path: str, skill_keywords: Dict[str, List[str]]) -> "SkillStats":
+        """Reads counts saved by `save`; returns empty counts if the file does not exist."""
+        if not os.path.exists(path):
+            return cls(skill_keywords)
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f), skill_keywords)
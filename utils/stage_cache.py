@@ -0,0 +1,194 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger("StageCache")
+
+
+def fingerprint(*parts) -> str:
+    """SHA-256 of the JSON form of `parts` (stage inputs and configuration), key order independent."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> Optional[str]:
+    """SHA-256 of a file's content (None if it does not exist)."""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class StageCache:
+    """
+    Manifest of the pipeline run in progress: for each finished stage, the fingerprint of its
+    inputs and configuration and the path and digest of the artifact it wrote. When a run fails
+    half-way (e.g. during the report), the next run skips every stage whose fingerprint still
+    matches and loads its artifact instead: LinkedIn is not scraped again and the postings are
+    not appended to the histories twice. Fingerprints are chained (each stage's fingerprint
+    includes the digest of the previous stage's artifact), so re-running a stage invalidates
+    the stages after it. Once a run has finished all its stages, the next run starts fresh.
+
+    Stages that add to persistent files (histories, analysis state) are made repeatable with
+    `protect`: the manifest journals what those files looked like before the stage first ran
+    on a batch, and a stage re-run on the same batch (forced, or after a crash before `record`)
+    rolls them back first, so the batch is never counted twice.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path (Optional[str]): JSON manifest file; None keeps the manifest in memory only.
+        """
+        self.path = path
+        self.stages: Dict[str, Dict] = {}
+        # stage -> {"batch", "sizes": {appended file: size}, "snapshots": {replaced file: copy or None}}
+        self.journal: Dict[str, Dict] = {}
+        self.complete = False
+
+    def start_run(self, force: Iterable[str] = ()) -> "StageCache":
+        """
+        Starts a run: forgets the stages of a completed run and the stages in `force`.
+
+        Returns:
+            StageCache: self, to allow chaining.
+        """
+        if self.complete:
+            self.stages.clear()
+            self.complete = False
+        for stage in force:
+            if self.stages.pop(stage, None) is not None:
+                logger.info(f"Stage '{stage}' forced to run again.")
+        return self
+
+    def hit(self, stage: str, stage_fingerprint: str) -> bool:
+        """True if `stage` finished with the same fingerprint and its artifact is unchanged on disk."""
+        entry = self.stages.get(stage)
+        if entry is None or entry["fingerprint"] != stage_fingerprint:
+            return False
+        if file_digest(entry["artifact"]) != entry["artifact_sha256"]:
+            logger.info(f"Artifact of stage '{stage}' ({entry['artifact']}) changed or is missing. Re-running it.")
+            return False
+        logger.info(f"Stage '{stage}' is up to date; loading {entry['artifact']} instead of re-running it.")
+        return True
+
+    def record(self, stage: str, stage_fingerprint: str, artifact: str):
+        """Records that `stage` finished and wrote `artifact`; saves the manifest."""
+        self.stages[stage] = {
+            "fingerprint": stage_fingerprint,
+            "artifact": artifact,
+            "artifact_sha256": file_digest(artifact),
+            "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        self.save()
+
+    def protect(self, stage: str, batch: Optional[str], appended: Iterable[str] = (),
+                replaced: Iterable[str] = ()):
+        """
+        Call before `stage` writes to persistent files. The first time the stage runs on `batch`,
+        the size of each `appended` file and a copy of each `replaced` file are journaled (and
+        the manifest saved) before anything is written. If the stage already ran on the same
+        batch, those files are rolled back to the journaled state instead, so that redoing the
+        stage does not add the batch a second time.
+
+        Args:
+            stage (str): Stage name.
+            batch (Optional[str]): Identity of the stage's input batch (e.g. the scrape artifact
+                                   digest). None (nothing to write) journals nothing.
+            appended (Iterable[str]): Files the stage appends to (e.g. a JSON Lines history).
+            replaced (Iterable[str]): Files the stage rewrites (e.g. the analysis state).
+        """
+        if batch is None:
+            return
+        entry = self.journal.get(stage)
+        if entry is not None and entry["batch"] == batch:
+            self._roll_back(stage, entry)
+            return
+        self._discard(entry)
+        entry = {"batch": batch, "sizes": {}, "snapshots": {}}
+        for path in appended:
+            entry["sizes"][path] = os.path.getsize(path) if os.path.exists(path) else 0
+        for path in replaced:
+            snapshot = None
+            if os.path.exists(path):
+                snapshot = f"{path}.{stage}.bak"
+                shutil.copyfile(path, snapshot + ".tmp")
+                os.replace(snapshot + ".tmp", snapshot)
+            entry["snapshots"][path] = snapshot
+        self.journal[stage] = entry
+        self.save()
+
+    @staticmethod
+    def _roll_back(stage: str, entry: Dict):
+        for path, size in entry["sizes"].items():
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+        for path, snapshot in entry["snapshots"].items():
+            if snapshot is None:
+                if os.path.exists(path):
+                    os.remove(path)
+            else:
+                shutil.copyfile(snapshot, path + ".tmp")
+                os.replace(path + ".tmp", path)
+        logger.info(f"Stage '{stage}' already ran on this batch; rolled back its writes before re-running it.")
+
+    @staticmethod
+    def _discard(entry: Optional[Dict]):
+        for snapshot in (entry or {}).get("snapshots", {}).values():
+            if snapshot and os.path.exists(snapshot):
+                os.remove(snapshot)
+
+    def artifact_digest(self, stage: str) -> Optional[str]:
+        """Digest of the artifact recorded for `stage` (the input of the next stage's fingerprint)."""
+        entry = self.stages.get(stage)
+        return entry["artifact_sha256"] if entry else None
+
+    def finish_run(self):
+        """Marks the run as complete, so the next run starts fresh; saves the manifest."""
+        self.complete = True
+        for entry in self.journal.values():
+            self._discard(entry)
+        self.journal.clear()
+        self.save()
+
+    def to_dict(self) -> Dict:
+        return {"version": self.VERSION, "complete": self.complete, "stages": self.stages, "journal": self.journal}
+
+    @classmethod
+    def from_dict(cls, data: Dict, path: Optional[str] = None) -> "StageCache":
+        cache = cls(path)
+        if data.get("version") == cls.VERSION:
+            cache.complete = data.get("complete", False)
+            cache.stages = data.get("stages", {})
+            cache.journal = data.get("journal", {})
+        return cache
+
+    def save(self):
+        """Writes the manifest to `self.path` (atomically, via a temporary file)."""
+        if not self.path:
+            return
+        output_dir = os.path.dirname(self.path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    @classmethod
+    def load(cls, path: str) -> "StageCache":
+        """Reads a manifest saved by `save`; returns an empty one if the file does not exist."""
+        if not os.path.exists(path):
+            return cls(path)
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f), path)
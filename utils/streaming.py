@@ -0,0 +1,69 @@
+import queue
+import threading
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+_END = object()
+
+
+def threaded(iterable: Iterable[T], maxsize: int = 100, name: Optional[str] = None) -> Iterator[T]:
+    """
+    Runs `iterable` in a background thread and yields its items through a bounded queue.
+
+    This lets a producer stage (e.g. scraping) keep working while the consumer stage
+    (e.g. extraction) processes earlier items. The producer blocks once `maxsize` items
+    are waiting, so the memory held between two stages is capped by the queue size.
+    An exception raised by the producer is re-raised in the consumer.
+
+    Args:
+        iterable (Iterable[T]): The producer stage, typically a generator.
+        maxsize (int): Maximum number of items buffered between the two stages.
+        name (Optional[str]): Name of the background thread (shows up in logs).
+
+    Yields:
+        T: The producer's items, in order.
+    """
+    buffer = queue.Queue(maxsize=max(1, maxsize))
+    error = []
+    stopped = threading.Event()
+
+    def produce():
+        try:
+            for item in iterable:
+                if stopped.is_set():
+                    return
+                buffer.put(item)
+        except BaseException as e: # Forwarded to the consumer thread
+            error.append(e)
+        finally:
+            buffer.put(_END)
+
+    thread = threading.Thread(target=produce, name=name, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _END:
+                break
+            yield item
+    finally:
+        # If the consumer stops early, unblock the producer so the thread can exit
+        stopped.set()
+        while thread.is_alive():
+            try:
+                buffer.get(timeout=0.1)
+            except queue.Empty:
+                pass
+    if error:
+        raise error[0]
+
+
+def tap(iterable: Iterable[T], callback: Callable[[T], None]) -> Iterator[T]:
+    """
+    Passes items through unchanged, calling `callback` on each one first
+    (e.g. to persist records as they flow between stages).
+    """
+    for item in iterable:
+        callback(item)
+        yield item
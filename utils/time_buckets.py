@@ -0,0 +1,232 @@
+import json
+import logging
+import os
+from collections import Counter
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("TimeBuckets")
+
+DIMENSIONS = ("title", "skill", "location")
+GRANULARITIES = ("day", "week")
+
+
+def week_start(day: date) -> date:
+    """Monday of the ISO week containing `day` (the key of its weekly bucket)."""
+    return day - timedelta(days=day.weekday())
+
+
+def posting_date(posting: Dict, default: Optional[date] = None) -> Optional[date]:
+    """Scrape date of a posting ('scraped_at' ISO date or timestamp), else `default` (None: undated)."""
+    scraped_at = posting.get("scraped_at")
+    if scraped_at:
+        return date.fromisoformat(str(scraped_at)[:10])
+    return default
+
+
+class TimeBuckets:
+    """
+    Daily and weekly pre-aggregations of the posting history: for each bucket, the number
+    of postings and the counts per title, skill and location. Trend questions (a series,
+    window totals, week-over-week growth) read a handful of buckets instead of re-analysing
+    raw postings, so their cost depends on the length of the period, not on the number of
+    postings. Buckets are updated with new postings only and can be merged across shards.
+    Undated postings (records that predate scrape-date stamping) are only counted in
+    `undated`: bucketing them on the day they are processed would show up as growth.
+    """
+
+    VERSION = 1
+
+    def __init__(self, title_transform: Optional[Callable] = None):
+        """
+        Args:
+            title_transform (Optional[Callable]): Maps raw titles to the counted label (e.g. a TitleNormalizer).
+        """
+        self.title_transform = title_transform
+        # granularity -> bucket start (ISO date) -> {"postings": n, "title": Counter, ...}
+        self.buckets: Dict[str, Dict[str, Dict]] = {granularity: {} for granularity in GRANULARITIES}
+        # Postings without a scrape date, left out of the buckets
+        self.undated = 0
+
+    @staticmethod
+    def _empty_bucket() -> Dict:
+        bucket = {dimension: Counter() for dimension in DIMENSIONS}
+        bucket["postings"] = 0
+        return bucket
+
+    def _bucket(self, granularity: str, start: date) -> Dict:
+        buckets = self.buckets[granularity]
+        key = start.isoformat()
+        if key not in buckets:
+            buckets[key] = self._empty_bucket()
+        return buckets[key]
+
+    def update(self, new_postings: Iterable[Dict], default_date: Optional[date] = None) -> "TimeBuckets":
+        """
+        Adds structured postings to the bucket of their scrape date.
+
+        Args:
+            new_postings (Iterable[Dict]): Postings not yet counted in these buckets.
+            default_date (Optional[date]): Date of postings without 'scraped_at'. If None, they are
+                                           not bucketed and only counted in `undated`.
+
+        Returns:
+            TimeBuckets: self, to allow chaining.
+        """
+        for post in new_postings:
+            self.add(post, default_date)
+        return self
+
+    def add(self, post: Dict, default_date: Optional[date] = None):
+        """Adds one structured posting (e.g. as a `utils.streaming.tap` callback)."""
+        day = posting_date(post, default_date)
+        if day is None:
+            self.undated += 1
+            return
+        title = post.get("title")
+        if title is not None and self.title_transform is not None:
+            title = self.title_transform(title)
+        for bucket in (self._bucket("day", day), self._bucket("week", week_start(day))):
+            bucket["postings"] += 1
+            if title is not None:
+                bucket["title"][title] += 1
+            if post.get("location") is not None:
+                bucket["location"][post["location"]] += 1
+            bucket["skill"].update(post.get("skills") or ())
+
+    def merge(self, other: "TimeBuckets") -> "TimeBuckets":
+        """Adds the buckets of another instance (e.g. another shard) to this one."""
+        self.undated += other.undated
+        for granularity, buckets in other.buckets.items():
+            for key, other_bucket in buckets.items():
+                bucket = self._bucket(granularity, date.fromisoformat(key))
+                bucket["postings"] += other_bucket["postings"]
+                for dimension in DIMENSIONS:
+                    bucket[dimension].update(other_bucket[dimension])
+        return self
+
+    def latest_date(self) -> Optional[date]:
+        """Most recent day with postings, or None if there are none."""
+        return date.fromisoformat(max(self.buckets["day"])) if self.buckets["day"] else None
+
+    def _check(self, dimension: str, granularity: str):
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension '{dimension}'. Expected one of {DIMENSIONS}.")
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity '{granularity}'. Expected one of {GRANULARITIES}.")
+
+    def series(self, dimension: str, value: str, granularity: str = "week") -> List[Tuple[str, int]]:
+        """
+        Count of one title/skill/location per bucket, oldest first (buckets without it count 0).
+
+        Returns:
+            List[Tuple[str, int]]: (bucket start date, count) pairs.
+        """
+        self._check(dimension, granularity)
+        buckets = self.buckets[granularity]
+        return [(key, buckets[key][dimension][value]) for key in sorted(buckets)]
+
+    def window_totals(self, dimension: str, end: date, periods: int,
+                      granularity: str = "day") -> Tuple[int, Counter]:
+        """
+        Sums the `periods` buckets ending with the bucket that contains `end`.
+
+        Returns:
+            Tuple[int, Counter]: Number of postings and counts per value in the window.
+        """
+        self._check(dimension, granularity)
+        step = timedelta(days=1 if granularity == "day" else 7)
+        start = end if granularity == "day" else week_start(end)
+        buckets = self.buckets[granularity]
+        postings, totals = 0, Counter()
+        for i in range(periods):
+            bucket = buckets.get((start - i * step).isoformat())
+            if bucket:
+                postings += bucket["postings"]
+                totals.update(bucket[dimension])
+        return postings, totals
+
+    def growth(self, dimension: str = "skill", periods: int = 1, granularity: str = "week",
+               end: Optional[date] = None, min_count: int = 5, top: Optional[int] = 10) -> List[Dict]:
+        """
+        Rolling-window growth: compares the last `periods` buckets up to `end` with the
+        `periods` buckets before them, e.g. week over week (periods=1) or the last 4 weeks
+        against the 4 weeks before. Shares of postings are compared rather than raw counts,
+        so a week with more scraped postings does not make everything "grow".
+
+        Args:
+            dimension (str): "skill", "title" or "location".
+            periods (int): Window length in buckets.
+            granularity (str): "day" or "week".
+            end (Optional[date]): Last day of the current window. Defaults to the latest day with data.
+            min_count (int): Values seen fewer times in both windows together are ignored.
+            top (Optional[int]): Number of entries to return (None for all).
+
+        Returns:
+            List[Dict]: {"value", "current", "previous", "growth"} entries, fastest growing first,
+                        then the values new in the current window ("growth" None), most frequent
+                        first. "growth" is the relative change of the share of postings. Ties are
+                        broken by current count, then by value.
+        """
+        end = end or self.latest_date()
+        if end is None:
+            return []
+        step = timedelta(days=periods * (1 if granularity == "day" else 7))
+        current_postings, current = self.window_totals(dimension, end, periods, granularity)
+        previous_postings, previous = self.window_totals(dimension, end - step, periods, granularity)
+
+        rows = []
+        for value in current.keys() | previous.keys():
+            if current[value] + previous[value] < min_count:
+                continue
+            if previous[value] and current_postings and previous_postings:
+                change = (current[value] / current_postings) / (previous[value] / previous_postings) - 1
+            else:
+                change = None
+            rows.append({"value": value, "current": current[value], "previous": previous[value],
+                         "growth": change})
+        # Measured growth first, then new values (no previous count); ties by current count, then value
+        rows.sort(key=lambda row: (row["growth"] is None, -(row["growth"] or 0), -row["current"], row["value"]))
+        return rows if top is None else rows[:top]
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": self.VERSION,
+            "buckets": {granularity: {key: {"postings": bucket["postings"],
+                                            **{dimension: dict(bucket[dimension]) for dimension in DIMENSIONS}}
+                                      for key, bucket in buckets.items()}
+                        for granularity, buckets in self.buckets.items()},
+            "undated": self.undated,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, title_transform: Optional[Callable] = None) -> "TimeBuckets":
+        instance = cls(title_transform)
+        for granularity, buckets in data.get("buckets", {}).items():
+            for key, bucket in buckets.items():
+                instance.buckets[granularity][key] = {
+                    "postings": bucket.get("postings", 0),
+                    **{dimension: Counter(bucket.get(dimension, {})) for dimension in DIMENSIONS},
+                }
+        instance.undated = data.get("undated", 0)
+        return instance
+
+    def save(self, path: str):
+        """Writes the buckets to a JSON file (atomically, via a temporary file)."""
+        output_dir = os.path.dirname(path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        logger.info(f"Time buckets ({len(self.buckets['day'])} days) saved to {path}")
+
+    @classmethod
+    def load(cls, path: str, title_transform: Optional[Callable] = None) -> "TimeBuckets":
+        """Reads buckets saved by `save`; returns empty buckets if the file does not exist."""
+        if not os.path.exists(path):
+            logger.info(f"No time buckets at {path}. Starting from empty buckets.")
+            return cls(title_transform)
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f), title_transform)
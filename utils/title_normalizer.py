@@ -0,0 +1,244 @@
+import json
+import logging
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Optional
+
+from utils.gazetteer import resolve_location
+
+logger = logging.getLogger("TitleNormalizer")
+
+# Abbreviations expanded token by token (after lowercasing and punctuation removal)
+ABBREVIATIONS = {
+    "ml": "machine learning", "mle": "machine learning engineer", "dl": "deep learning",
+    "cv": "computer vision", "ds": "data scientist", "swe": "software engineer",
+    "sde": "software development engineer", "eng": "engineer", "engr": "engineer",
+    "dev": "developer", "mgr": "manager", "mgmt": "management", "assoc": "associate",
+    "sr": "senior", "snr": "senior", "jr": "junior", "ops": "operations",
+    "genai": "generative ai", "gen": "generative",
+}
+
+# Seniority and level markers removed from the canonical title
+SENIORITY = {
+    "senior", "junior", "lead", "principal", "staff", "associate", "intern", "internship", "trainee",
+    "graduate", "entry", "level", "mid", "experienced", "expert", "i", "ii", "iii", "iv", "1", "2", "3",
+}
+
+# Tokens kept upper-case (or in a fixed casing) in the canonical title
+CASING = {
+    "ai": "AI", "nlp": "NLP", "mlops": "MLOps", "llm": "LLM", "bi": "BI", "iot": "IoT", "qa": "QA",
+    "ui": "UI", "ux": "UX", "sql": "SQL", "aws": "AWS", "devops": "DevOps", "r&d": "R&D", "it": "IT",
+    "of": "of", "and": "and", "for": "for", "in": "in", "the": "the", "&": "&",
+}
+
+# Role families of canonical titles, first match wins: family -> phrases looked up in the lowercased title
+ROLE_FAMILIES = {
+    "MLOps & ML Platform": ["mlops", "ml platform", "machine learning platform", "ml infrastructure",
+                            "machine learning operations"],
+    "Computer Vision": ["computer vision", "vision", "image", "perception"],
+    "NLP & LLM": ["nlp", "natural language", "llm", "language model", "conversational", "speech"],
+    "Data Engineering": ["data engineer", "etl", "big data", "data platform", "data architect"],
+    "Data Science": ["data scientist", "data science"],
+    "Data Analytics & BI": ["analyst", "analytics", "bi", "business intelligence"],
+    "AI Research": ["research", "researcher", "scientist"],
+    "AI Leadership & Product": ["head", "director", "manager", "product", "consultant", "chief", "vp"],
+    "Machine Learning Engineering": ["machine learning", "deep learning", "ai", "ml", "artificial intelligence",
+                                     "generative"],
+}
+OTHER_ROLE_FAMILY = "Other"
+
+# Work-arrangement qualifiers dropped when they follow a title (" - Remote", " | Full Time")
+QUALIFIERS = {
+    "remote", "hybrid", "onsite", "on site", "in office", "work from home", "wfh", "full time", "part time",
+    "contract", "temporary", "permanent", "freelance", "urgent", "urgently hiring", "immediate joiner",
+}
+
+# Segments after the title (" - Dubai", " | Remote", ", Data Science"), a company after " @ "; parentheses anywhere
+_SUFFIX_SEPARATORS = re.compile(r"\s+[-–—|:]\s+|\s*\|\s*|,\s+")
+_COMPANY_SEPARATOR = re.compile(r"\s+@\s+")
+_PARENTHESES = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+_TOKEN = re.compile(r"[a-z0-9&+#]+")
+
+
+def _is_qualifier(segment: str) -> bool:
+    """True if a title segment only names a place (known to the gazetteer) or a work arrangement."""
+    return " ".join(_TOKEN.findall(segment.lower())) in QUALIFIERS or resolve_location(segment) is not None
+
+
+def canonicalize_title(title: str) -> str:
+    """
+    Rule-based canonical form of a job title:
+    parentheses, a trailing " @ Company" and segments that only name a place or a work
+    arrangement (" - Dubai", " | Remote", ", UAE") are dropped, while other segments are kept
+    ("Software Engineer - Machine Learning"); abbreviations are expanded, seniority/level markers
+    are removed and the result is title-cased ("Sr. ML Engineer - Dubai" -> "Machine Learning Engineer").
+
+    Args:
+        title (str): Raw job title.
+
+    Returns:
+        str: Canonical title ("" if nothing is left).
+    """
+    title = _COMPANY_SEPARATOR.split(_PARENTHESES.sub(" ", title), maxsplit=1)[0]
+    first, *rest = _SUFFIX_SEPARATORS.split(title)
+    head = " ".join([first] + [segment for segment in rest if not _is_qualifier(segment)])
+    tokens = []
+    for token in _TOKEN.findall(head.lower()):
+        tokens.extend(ABBREVIATIONS.get(token, token).split())
+    tokens = [token for token in tokens if token not in SENIORITY]
+    # Collapse repeats created by expansions, e.g. "MLE Engineer"
+    deduped = [token for i, token in enumerate(tokens) if i == 0 or token != tokens[i - 1]]
+    return " ".join(CASING.get(token, token.capitalize()) for token in deduped)
+
+
+@lru_cache(maxsize=65536)
+def role_family(title: Optional[str]) -> str:
+    """
+    Role family of a title ("Senior NLP Engineer" -> "NLP & LLM"), matched on whole words
+    of its canonical form; `OTHER_ROLE_FAMILY` if no family matches.
+    """
+    if not title:
+        return OTHER_ROLE_FAMILY
+    padded = f" {(canonicalize_title(title) or title).lower()} "
+    for family, phrases in ROLE_FAMILIES.items():
+        if any(f" {phrase} " in padded for phrase in phrases):
+            return family
+    return OTHER_ROLE_FAMILY
+
+
+class TitleNormalizer:
+    """
+    Maps raw job titles to canonical titles (see `canonicalize_title`), optionally merging
+    near-identical canonical titles into clusters by TF-IDF cosine similarity.
+
+    Manual `overrides` (raw title -> canonical title) take precedence over the rules, whose
+    results are memoized in a bounded LRU cache, so the repeated titles that make up most
+    postings cost one dictionary lookup. Only the overrides and clusters are persisted: rule
+    results are recomputed, so memory stays bounded by `cache_size`.
+    """
+
+    def __init__(self, overrides: Optional[Dict[str, str]] = None, clusters: Optional[Dict[str, str]] = None,
+                 cache_size: int = 65536, path: Optional[str] = None):
+        """
+        Args:
+            overrides (Optional[Dict[str, str]]): Manual raw title -> canonical title entries.
+            clusters (Optional[Dict[str, str]]): Canonical title -> cluster representative (see `fit_clusters`).
+            cache_size (int): Maximum number of entries of the LRU cache.
+            path (Optional[str]): JSON file used by `save` (set by `load`).
+        """
+        self.overrides: Dict[str, str] = dict(overrides or {})
+        self.clusters: Dict[str, str] = dict(clusters or {})
+        self.path = path
+        self._canonical = lru_cache(maxsize=cache_size)(self._compute)
+
+    def _compute(self, title: str) -> str:
+        canonical = canonicalize_title(title) or title.strip()
+        return self.clusters.get(canonical, canonical)
+
+    def normalize(self, title: Optional[str]) -> Optional[str]:
+        """Canonical title of a raw title (None stays None)."""
+        if title is None:
+            return None
+        canonical = self.overrides.get(title)
+        return canonical if canonical is not None else self._canonical(title)
+
+    __call__ = normalize
+
+    def cache_info(self):
+        return self._canonical.cache_info()
+
+    def fit_clusters(self, title_counts: Dict[str, int], threshold: float = 0.8) -> Dict[str, str]:
+        """
+        Clusters canonical titles whose word TF-IDF vectors have a cosine similarity of at least
+        `threshold`. Each title joins the cluster of its most frequent similar title, so the
+        representative of a cluster is its most common member. Similarities are computed as
+        blocked matrix products over the distinct canonical titles.
+
+        Args:
+            title_counts (Dict[str, int]): Raw (or canonical) title -> number of postings.
+            threshold (float): Minimum cosine similarity for two titles to be merged.
+
+        Returns:
+            Dict[str, str]: Canonical title -> representative, for titles that were merged.
+        """
+        import numpy as np  # Imported on use: only clustering needs it
+
+        canonical_counts = Counter()
+        for title, count in title_counts.items():
+            canonical_counts[canonicalize_title(title) or title.strip()] += count
+        titles = [title for title, _ in canonical_counts.most_common()]
+        if len(titles) < 2:
+            return {}
+
+        vocabulary = {}
+        rows = [[vocabulary.setdefault(token, len(vocabulary)) for token in set(title.lower().split())]
+                for title in titles]
+        document_frequency = np.zeros(len(vocabulary))
+        for row in rows:
+            document_frequency[row] += 1
+        idf = np.log((1 + len(titles)) / (1 + document_frequency)) + 1
+        vectors = np.zeros((len(titles), len(vocabulary)), dtype=np.float32)
+        for i, row in enumerate(rows):
+            vectors[i, row] = idf[row]
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+        representative = list(range(len(titles)))
+        block = 1024
+        for start in range(0, len(titles), block):
+            similarity = vectors[start:start + block] @ vectors.T
+            for offset, sims in enumerate(similarity):
+                i = start + offset
+                # Titles are ordered by frequency, so the first similar earlier title is the most frequent one
+                similar = np.flatnonzero(sims[:i] >= threshold)
+                if len(similar):
+                    representative[i] = representative[similar[0]]
+
+        self.clusters = {titles[i]: titles[rep] for i, rep in enumerate(representative) if rep != i}
+        # Cached values may predate the clusters
+        self._canonical.cache_clear()
+        logger.info(f"Merged {len(self.clusters)} of {len(titles)} canonical titles into clusters.")
+        return self.clusters
+
+    def to_dict(self) -> Dict:
+        return {"overrides": self.overrides, "clusters": self.clusters}
+
+    def save(self, path: Optional[str] = None):
+        """Writes the overrides and clusters to a JSON file (atomically, via a temporary file)."""
+        path = path or self.path
+        if not path:
+            return
+        output_dir = os.path.dirname(path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        logger.info(f"Title mapping ({len(self.overrides)} overrides, {len(self.clusters)} clustered titles) "
+                    f"saved to {path}")
+
+    @classmethod
+    def load(cls, path: str, cache_size: int = 65536) -> "TitleNormalizer":
+        """
+        Reads a mapping saved by `save`; returns an empty normalizer bound to `path` if it does not exist.
+        The memoized "mapping" of older files is not loaded: it is recomputed from the rules.
+        """
+        if not os.path.exists(path):
+            return cls(cache_size=cache_size, path=path)
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("overrides"), data.get("clusters"), cache_size=cache_size, path=path)
+
+
+if __name__ == "__main__":
+    normalizer = TitleNormalizer()
+    for raw_title in ["Sr. ML Engineer", "Senior Machine Learning Engineer", "Machine Learning Engineer - Dubai",
+                      "Lead Data Scientist (Remote)", "Data Scientist II | Riyadh", "MLOps Eng., UAE",
+                      "Jr Computer Vision Dev", "Head of AI", "Software Engineer - Machine Learning",
+                      "Senior Manager, Data Science", "AI Engineer @ Careem"]:
+        print(f"{raw_title!r:40} -> {normalizer.normalize(raw_title)!r}")
+    print(role_family("Senior NLP Engineer"), "|", role_family("Lead Data Scientist"), "|", role_family("Head of AI"))
+    normalizer.fit_clusters({"Machine Learning Engineer": 10, "Engineer Machine Learning": 2, "Data Scientist": 5})
+    print(normalizer.clusters)
@@ -1,18 +1,64 @@
-import matplotlib.pyplot as plt
+import matplotlib
 import matplotlib.ticker as mticker
-from typing import List, Tuple
+from matplotlib.figure import Figure
+from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import hashlib
+import io
+import json
 import logging
 import os
+import shutil
+import threading
+import time
 import numpy as np # For potential future complex calculations
 
-# Configure logging for the Visualizations module
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+from utils.metrics import METRICS
+
+# Logging is configured by the entry point (main.py or the demo below), not on import
 logger = logging.getLogger("Visualizations")
 
+# Charts are drawn on standalone Figure objects (no pyplot, no global style or rcParams changes),
+# so several threads can render charts at the same time. The 'seaborn-v0_8-darkgrid' look is
+# applied to each Axes instead of through plt.style.use.
+_DARKGRID_FACE = "#EAEAF2"
+_TEXT_COLOR = "0.15"
+
+
+def _apply_darkgrid(ax):
+    ax.set_facecolor(_DARKGRID_FACE)
+    ax.set_axisbelow(True)
+    ax.grid(True, color="white", linestyle="-")
+    for spine in ax.spines.values():
+        spine.set_edgecolor("white")
+        spine.set_linewidth(0)
+    ax.tick_params(length=0, colors=_TEXT_COLOR)
+
+
+def _save_figure(fig: Figure, filename: str, kind: str) -> bool:
+    """Saves a figure as an RGB PNG; returns whether it was written (errors are logged, not raised)."""
+    output_dir = os.path.dirname(filename)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    try:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=300, bbox_inches='tight', transparent=False, facecolor='white')
+        # Saved as RGB: the background is opaque anyway, and FPDF embeds RGB PNGs as they are,
+        # while it splits the alpha channel of RGBA PNGs pixel by pixel in Python (about a minute per chart)
+        buffer.seek(0)
+        Image.open(buffer).convert('RGB').save(filename, format='PNG')
+        logger.info(f"{kind} saved successfully: {filename}")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to save {kind.lower()} '{filename}': {e}", exc_info=True)
+        return False
+
+@METRICS.timed("chart_render", kind="bar")
 def generate_bar_chart(data: List[Tuple[str, int]], title: str, filename: str,
                        x_label: str = "Frequency", y_label: str = "Category",
                        top_n: int = 10, bar_color_map: str = 'viridis',
-                       font_name: str = 'Arial'):
+                       font_name: str = 'Arial') -> bool:
     """
     Generates a professional and highly customizable horizontal bar chart and saves it as an image.
     This function incorporates advanced aesthetic and readability enhancements.
@@ -26,28 +72,30 @@ def generate_bar_chart(data: List[Tuple[str, int]], title: str, filename: str,
         top_n (int): The number of top elements to display in the chart.
         bar_color_map (str): Matplotlib colormap name for bar colors (e.g., 'viridis', 'plasma', 'cividis').
         font_name (str): Font family to use for all text in the chart.
+
+    Returns:
+        bool: True if the chart was written to `filename` (False without data or if saving failed).
     """
     if not data:
         logger.warning(f"No data provided for generating the chart for: '{title}'. Skipping chart generation.")
-        return
+        return False
 
     # Sort data in descending order by value and select the top N elements
     sorted_data = sorted(data, key=lambda item: item[1], reverse=True)[:top_n]
     if not sorted_data: # Check again after slicing
         logger.warning(f"No valid data points after sorting/slicing for: '{title}'. Skipping chart generation.")
-        return
+        return False
 
     labels = [item[0] for item in sorted_data]
     values = [item[1] for item in sorted_data]
 
-    # Apply a professional Matplotlib style for better aesthetics
-    plt.style.use('seaborn-v0_8-darkgrid') # Provides a dark grid background for better contrast
-
     # Create the figure and axes with a larger, more appropriate size
-    fig, ax = plt.subplots(figsize=(12, 8)) # Width, Height in inches
+    fig = Figure(figsize=(12, 8)) # Width, Height in inches
+    ax = fig.add_subplot()
+    _apply_darkgrid(ax) # Dark grid background for better contrast
 
     # Generate colors from the specified colormap
-    colors = plt.cm.get_cmap(bar_color_map, len(labels))
+    colors = matplotlib.colormaps[bar_color_map].resampled(len(labels))
     bar_colors = [colors(i) for i in np.linspace(0, 1, len(labels))]
 
     # Create horizontal bars with specified height and colors
@@ -85,24 +133,232 @@ def generate_bar_chart(data: List[Tuple[str, int]], title: str, filename: str,
     ax.spines['left'].set_linewidth(0.5)
     ax.spines['bottom'].set_linewidth(0.5)
 
-    plt.tight_layout() # Adjust layout to prevent labels from overlapping
+    fig.tight_layout() # Adjust layout to prevent labels from overlapping
 
-    # Ensure the output directory exists
-    output_dir = os.path.dirname(filename)
-    if output_dir and not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    # Save the chart with high resolution and tight bounding box (the figure is freed with `fig`)
+    return _save_figure(fig, filename, "Chart")
+
+
+@METRICS.timed("chart_render", kind="heatmap")
+def generate_heatmap(matrix: np.ndarray, labels: List[str], title: str, filename: str,
+                     top_n: int = 20, color_map: str = 'viridis', font_name: str = 'Arial') -> bool:
+    """
+    Generates a heatmap of a square skill matrix (e.g. `SkillMatrix.cooccurrence`) and saves it as an image.
+    Only the `top_n` labels with the largest diagonal values (most frequent skills) are shown.
+
+    Args:
+        matrix (np.ndarray): Square (V, V) matrix of counts or scores (or the same as nested lists,
+                             e.g. read back from insights JSON).
+        labels (List[str]): Label of each row/column.
+        title (str): The main title of the chart.
+        filename (str): The full path for the output image file.
+        top_n (int): Number of rows/columns to display.
+        color_map (str): Matplotlib colormap name.
+        font_name (str): Font family to use for all text in the chart.
+
+    Returns:
+        bool: True if the heatmap was written to `filename` (False without data or if saving failed).
+    """
+    if matrix is None or not len(labels) or not np.any(matrix):
+        logger.warning(f"No data provided for generating the heatmap for: '{title}'. Skipping chart generation.")
+        return False
+
+    matrix = np.asarray(matrix)
+    keep = np.argsort(-np.diag(matrix), kind="stable")[:top_n]
+    keep = keep[np.diag(matrix)[keep] > 0]
+    data = matrix[np.ix_(keep, keep)]
+    names = [labels[i] for i in keep]
+
+    fig = Figure(figsize=(12, 10))
+    ax = fig.add_subplot()
+    image = ax.imshow(data, cmap=color_map)
+    fig.colorbar(image, ax=ax, fraction=0.046, pad=0.04)
+    ax.set_xticks(range(len(names)))
+    ax.set_yticks(range(len(names)))
+    ax.set_xticklabels(names, rotation=60, ha='right', fontsize=10)
+    ax.set_yticklabels(names, fontsize=10)
+    ax.set_title(title, fontsize=18, pad=25, fontname=font_name, fontweight='bold')
+    fig.tight_layout()
+    return _save_figure(fig, filename, "Heatmap")
+
+
+# Renderers usable in a ChartJob; each returns whether it wrote its output file
+CHART_RENDERERS = {"bar": generate_bar_chart, "heatmap": generate_heatmap}
+# Bump when the look of the charts changes, so cached PNGs are re-rendered
+CHART_STYLE_VERSION = 4
+
+
+class ChartJob(NamedTuple):
+    """One chart to render: a CHART_RENDERERS name and the keyword arguments of its function."""
+    kind: str
+    kwargs: Dict[str, Any]
+
+    @property
+    def filename(self) -> str:
+        return self.kwargs["filename"]
 
-    # Save the chart with high resolution and tight bounding box
-    try:
-        plt.savefig(filename, dpi=300, bbox_inches='tight', transparent=False, facecolor='white')
-        logger.info(f"Chart saved successfully: {filename}")
-    except Exception as e:
-        logger.error(f"Failed to save chart '{filename}': {e}", exc_info=True)
-    finally:
-        plt.close(fig) # Close the figure to free up memory
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return {"dtype": str(value.dtype), "shape": value.shape,
+                "sha256": hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest()}
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot hash chart argument of type {type(value).__name__}")
+
+
+def chart_key(job: ChartJob) -> str:
+    """
+    Content hash of a chart: renderer, data, title, labels and style parameters (everything
+    but the output filename), plus the Matplotlib and chart style versions.
+    """
+    params = {name: value for name, value in job.kwargs.items() if name != "filename"}
+    payload = json.dumps([job.kind, params, matplotlib.__version__, CHART_STYLE_VERSION],
+                         sort_keys=True, default=_json_default, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ChartCache:
+    """
+    Directory of rendered charts named by their content hash (`chart_key`), with an index of
+    how long each one took to render. A chart whose key is cached is copied to its output
+    path instead of being rendered again, and its recorded render time counts as time saved.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir: str = os.path.join("reports", ".chart_cache")):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, self.INDEX_FILE)
+        self.render_seconds: Dict[str, float] = self._read_index()
+        # Several report jobs (threads) may share one cache
+        self._lock = threading.Lock()
+
+    def _read_index(self) -> Dict[str, float]:
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Unreadable chart cache index {self.index_path}: {e}. Starting from an empty index.")
+            return {}
+
+    def _tmp_path(self, path: str) -> str:
+        # Unique per process and thread, so concurrent writers never share a temporary file
+        return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ".png")
+
+    def fetch(self, key: str, filename: str) -> Optional[float]:
+        """Copies a cached chart to `filename`; returns its recorded render time, or None on a miss."""
+        cached_path = self.path(key)
+        with self._lock:
+            seconds = self.render_seconds.get(key)
+        if seconds is None or not os.path.exists(cached_path):
+            return None
+        output_dir = os.path.dirname(filename)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        if os.path.abspath(cached_path) != os.path.abspath(filename):
+            tmp_path = self._tmp_path(filename)
+            shutil.copyfile(cached_path, tmp_path)
+            os.replace(tmp_path, filename)
+        return seconds
+
+    def store(self, key: str, filename: str, seconds: float):
+        """Adds a freshly rendered chart to the cache."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self._tmp_path(self.path(key))
+        shutil.copyfile(filename, tmp_path)
+        os.replace(tmp_path, self.path(key))
+        with self._lock:
+            self.render_seconds[key] = round(seconds, 4)
+
+    def save(self):
+        """
+        Writes the index (atomically, via a temporary file), merged with entries that other
+        processes added to the index file since it was read.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with self._lock:
+            self.render_seconds = {**self._read_index(), **self.render_seconds}
+            tmp_path = self._tmp_path(self.index_path)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.render_seconds, f)
+            os.replace(tmp_path, self.index_path)
+
+
+def _render(job: ChartJob) -> Tuple[str, float, bool]:
+    # A chart left by an earlier run must not pass for this one if the renderer writes nothing
+    if os.path.isfile(job.filename):
+        os.remove(job.filename)
+    start = time.perf_counter()
+    written = bool(CHART_RENDERERS[job.kind](**job.kwargs))
+    return job.filename, time.perf_counter() - start, written
+
+
+def render_charts(jobs: List[ChartJob], cache: Optional[ChartCache] = None,
+                  max_workers: Optional[int] = None) -> Dict[str, float]:
+    """
+    Renders a batch of charts. Charts found in `cache` are copied instead of rendered; the
+    others are rendered in parallel worker processes, or in this process when only one worker
+    would be used. Figures are saved through the Agg canvas, without any GUI backend. Safe to
+    call from several threads at once.
+
+    Args:
+        jobs (List[ChartJob]): Charts to produce.
+        cache (Optional[ChartCache]): Cache of rendered charts. None renders everything.
+        max_workers (Optional[int]): Worker processes for cache misses. Defaults to the number of CPUs.
+
+    Returns:
+        Dict[str, float]: "rendered" and "cached" chart counts, "render_seconds" (summed render
+                          time of the misses), "wall_seconds" (elapsed time of the batch) and
+                          "saved_seconds" (recorded render time of the cache hits).
+    """
+    start = time.perf_counter()
+    stats = {"rendered": 0, "cached": 0, "render_seconds": 0.0, "wall_seconds": 0.0, "saved_seconds": 0.0}
+    misses = []
+    for job in jobs:
+        key = chart_key(job) if cache is not None else None
+        saved = cache.fetch(key, job.filename) if cache is not None else None
+        if saved is None:
+            misses.append((key, job))
+        else:
+            stats["cached"] += 1
+            stats["saved_seconds"] += saved
+
+    workers = min(len(misses), max_workers or os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_render, [job for _, job in misses]))
+        # Worker processes have their own metrics registry: record their render times here
+        for (_, job), (_, seconds, _) in zip(misses, results):
+            METRICS.observe("chart_render", seconds, kind=job.kind)
+    else:
+        results = [_render(job) for _, job in misses]
+
+    for (key, _), (filename, seconds, written) in zip(misses, results):
+        stats["render_seconds"] += seconds
+        if written:
+            stats["rendered"] += 1
+            if cache is not None:
+                cache.store(key, filename, seconds)
+    if cache is not None and misses:
+        cache.save()
+
+    stats["wall_seconds"] = time.perf_counter() - start
+    METRICS.count("charts_rendered", stats["rendered"])
+    METRICS.count("charts_cached", stats["cached"])
+    logger.info(f"Charts: {stats['rendered']} rendered in {stats['wall_seconds']:.2f}s "
+                f"({stats['render_seconds']:.2f}s of rendering, {workers or 1} worker(s)), "
+                f"{stats['cached']} from cache (saved ~{stats['saved_seconds']:.2f}s).")
+    return stats
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     # Example usage for demonstration of the professional visualization module
     # Ensure 'reports' directory exists for saving output
     output_directory = "reports"
@@ -141,3 +397,12 @@ if __name__ == "__main__":
     )
 
     logger.info(f"Professional demo charts generated in '{output_directory}/'.")
+
+    # The same charts through the cache: the second batch is copied, not rendered
+    demo_jobs = [ChartJob("bar", {"data": dummy_titles_data, "title": "Top 10 AI/ML Job Titles in MENA (Demo)",
+                                  "filename": os.path.join(output_directory, "top_titles_cached_demo.png")}),
+                 ChartJob("bar", {"data": dummy_skills_data, "title": "Top 10 AI/ML Skills in MENA (Demo)",
+                                  "filename": os.path.join(output_directory, "top_skills_cached_demo.png")})]
+    demo_cache = ChartCache(os.path.join(output_directory, ".chart_cache"))
+    render_charts(demo_jobs, demo_cache)
+    render_charts(demo_jobs, demo_cache)